@@ -0,0 +1,342 @@
+"""Conversion throughput benchmark for csvconv.
+
+Runs each scenario through the real CLI in a fresh interpreter, reading the
+results from its --summary-json report, and prints JSON with MB/s (input
+bytes on disk), rows/s, files/s (tar members count one each), peak RSS,
+output size and close time (closing, fsyncing and publishing the outputs,
+compare csv_to_parquet_large with and without write-behind) per scenario.
+Inputs are generated by benchmarks/datagen.py and cached in --data-dir.
+
+With --compare BASELINE, every scenario present in both runs is checked
+against the stored results: a drop in MB/s or a rise in peak RSS or output
+size beyond --threshold is reported as a regression and the exit code is 1.
+
+Usage:
+    python benchmarks/bench_convert.py [--scenario NAME ...] [--scale F]
+        [--runs N] [--save results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIR = os.path.join(ROOT, "benchmarks", ".data")
+
+_MB = 1024.0 * 1024.0
+
+# name -> input description and extra CLI arguments
+SCENARIOS = {
+    "csv_to_parquet": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": [],
+    },
+    "csv_to_parquet_auto_encoding": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--encoding", "auto"],
+    },
+    "csv_to_parquet_wide_strings": {
+        "kind": "csv",
+        "rows": 100000,
+        "columns": 4,
+        "types": ("string",),
+        "string_width": 200,
+        "args": [],
+    },
+    "csv_to_parquet_mixed_types": {
+        "kind": "csv",
+        "rows": 200000,
+        "columns": 12,
+        "types": ("int", "float", "string", "bool", "timestamp"),
+        "string_width": 24,
+        "args": [],
+    },
+    "csv_to_parquet_categorical": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "category"),
+        "string_width": 16,
+        "args": [],
+    },
+    "csv_to_parquet_categorical_dict": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "category"),
+        "string_width": 16,
+        "args": ["--dict-encode"],
+    },
+    "csv_to_parquet_large": {
+        "kind": "csv",
+        "rows": 4000000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--compression", "none"],
+    },
+    "csv_to_parquet_large_write_behind": {
+        "kind": "csv",
+        "rows": 4000000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--compression", "none", "--write-behind"],
+    },
+    "csv_to_arrow": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--output-type", "arrow"],
+    },
+    "csv_to_arrow_lz4": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--output-type", "arrow", "--compression", "lz4"],
+    },
+    "csv_to_orc": {
+        "kind": "csv",
+        "rows": 400000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--output-type", "orc"],
+    },
+    "targz_to_parquet": {
+        "kind": "targz",
+        "members": 20,
+        "rows": 20000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": [],
+    },
+    "targz_to_parquet_small_members": {
+        "kind": "targz",
+        "members": 400,
+        "rows": 200,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": [],
+    },
+    "targz_to_parquet_tiny_members": {
+        "kind": "targz",
+        "members": 5000,
+        "rows": 20,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": [],
+    },
+    "targz_to_parquet_tiny_members_merge": {
+        "kind": "targz",
+        "members": 5000,
+        "rows": 20,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--merge"],
+    },
+    "targz_to_csv": {
+        "kind": "targz",
+        "members": 20,
+        "rows": 20000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--output-type", "csv"],
+    },
+    "targz_to_csv_gz": {
+        "kind": "targz",
+        "members": 20,
+        "rows": 20000,
+        "columns": 8,
+        "types": ("int", "float", "string"),
+        "string_width": 16,
+        "args": ["--output-type", "csv", "--gzip"],
+    },
+}
+
+# metric -> direction in which a change is a regression
+_COMPARED = {
+    "mb_per_s": "lower",
+    "files_per_s": "lower",
+    "peak_rss_mb": "higher",
+    "output_mb": "higher",
+}
+
+
+def _env():
+    env = dict(os.environ)
+    paths = [os.path.join(ROOT, "src")]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def prepare_input(name, spec, data_dir, scale=1.0):
+    """Generate (or reuse) the input for a scenario and return its path."""
+    rows = max(1, int(spec["rows"] * scale))
+    columns = datagen.make_columns(spec["columns"], spec["types"], spec["string_width"])
+    if spec["kind"] == "csv":
+        key = "csv-{}-{}-{}-{}".format(rows, spec["columns"], "_".join(spec["types"]), spec["string_width"])
+        path = os.path.join(data_dir, key + ".csv")
+        if not os.path.exists(path):
+            datagen.generate_csv(path + ".tmp", rows, columns)
+            os.replace(path + ".tmp", path)
+    else:
+        key = "targz-{}x{}-{}-{}-{}".format(
+            spec["members"], rows, spec["columns"], "_".join(spec["types"]), spec["string_width"]
+        )
+        path = os.path.join(data_dir, key + ".tar.gz")
+        if not os.path.exists(path):
+            datagen.generate_targz(path + ".tmp", spec["members"], rows, columns)
+            os.replace(path + ".tmp", path)
+    return path
+
+
+def run_once(input_path, extra_args, work_dir):
+    """Convert input_path with the CLI in a fresh interpreter; return its JSON report."""
+    output = os.path.join(work_dir, "out")
+    if input_path.endswith(".csv"):
+        args = list(extra_args)
+        output_type = args[args.index("--output-type") + 1] if "--output-type" in args else "parquet"
+        output += "." + output_type
+    report_path = os.path.join(work_dir, "report.json")
+    cmd = [
+        sys.executable,
+        "-m",
+        "csvconv",
+        "--input",
+        input_path,
+        "--output",
+        output,
+        "--summary-json",
+        report_path,
+        "--log-level",
+        "WARNING",
+    ] + list(extra_args)
+    result = subprocess.run(cmd, capture_output=True, text=True, env=_env())
+    if result.returncode != 0:
+        raise RuntimeError("{} failed: {}".format(" ".join(cmd), result.stderr.strip()))
+    with open(report_path) as f:
+        return json.load(f)
+
+
+def run_scenario(name, spec, data_dir, runs=3, scale=1.0):
+    """Run a scenario runs times and summarize (median throughput, max RSS)."""
+    input_path = prepare_input(name, spec, data_dir, scale)
+    input_bytes = os.path.getsize(input_path)
+    reports = []
+    for _ in range(runs):
+        work_dir = tempfile.mkdtemp(prefix="csvconv-bench-")
+        try:
+            reports.append(run_once(input_path, spec["args"], work_dir))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    seconds = statistics.median(r["duration_s"] for r in reports)
+    close_seconds = statistics.median(r["totals"]["stages"].get("close", 0.0) for r in reports)
+    rows = reports[0]["totals"]["rows"]
+    return {
+        "input_mb": round(input_bytes / _MB, 3),
+        "rows": rows,
+        "runs": runs,
+        "seconds": round(seconds, 4),
+        "mb_per_s": round(input_bytes / _MB / seconds, 2),
+        "rows_per_s": round(rows / seconds, 1) if rows else None,
+        "files_per_s": round(len(reports[0]["files"]) / seconds, 1),
+        "peak_rss_mb": round(max(r["peak_rss_bytes"] for r in reports) / _MB, 1),
+        "output_mb": round(reports[0]["totals"]["output_bytes"] / _MB, 3),
+        "close_s": round(close_seconds, 4),
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """Return a list of regression messages for results against baseline."""
+    regressions = []
+    for name, current in sorted(results["scenarios"].items()):
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, bad in sorted(_COMPARED.items()):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (bad == "lower" and change < -threshold) or (bad == "higher" and change > threshold):
+                regressions.append("{}: {} {} -> {} ({:+.1%})".format(name, metric, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run (repeatable; default: all)"
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply row counts by F")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per scenario")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Generated input cache")
+    parser.add_argument("--save", help="Also write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Relative change counted as a regression (default: 0.10)"
+    )
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    import pyarrow
+
+    results = {
+        "python": sys.version.split()[0],
+        "pyarrow": pyarrow.__version__,
+        "scale": args.scale,
+        "scenarios": {},
+    }
+    for name in args.scenario or sorted(SCENARIOS):
+        results["scenarios"][name] = run_scenario(
+            name, SCENARIOS[name], args.data_dir, runs=args.runs, scale=args.scale
+        )
+
+    print(json.dumps(results, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print("REGRESSION " + message, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Startup latency benchmark for csvconv.
+
+Measures three things and prints them as JSON:
+
+  - import_time: `python -X importtime -c "import csvconv.cli"`, reporting
+    the cumulative import time and the slowest top-level imports, and
+    whether PyArrow was (wrongly) pulled in at CLI import time.
+  - version_latency: wall-clock time of `python -m csvconv --version`.
+  - pex_cold_start: wall-clock time of `dist/csvconv.pex --version` (built by
+    scripts/build_pex.sh; skipped unless the PEX exists or --build-pex).
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--pex PATH] [--build-pex]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PEX = os.path.join(ROOT, "dist", "csvconv.pex")
+
+
+def _env():
+    env = dict(os.environ)
+    paths = [os.path.join(ROOT, "src")]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def measure_import_time(top=10):
+    """Run -X importtime on the CLI module and summarize the result."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import csvconv.cli"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError("import failed: {}".format(result.stderr.strip()))
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append({"module": name.strip(), "cumulative_us": cumulative, "depth": depth})
+
+    cli = [m for m in modules if m["module"] == "csvconv.cli"]
+    top_level = sorted((m for m in modules if m["depth"] <= 1), key=lambda m: -m["cumulative_us"])
+    return {
+        "cli_cumulative_ms": cli[0]["cumulative_us"] / 1000.0 if cli else None,
+        "imports_pyarrow": any(m["module"].split(".")[0] == "pyarrow" for m in modules),
+        "slowest": [{"module": m["module"], "cumulative_ms": m["cumulative_us"] / 1000.0} for m in top_level[:top]],
+    }
+
+
+def time_command(cmd, runs):
+    """Return wall-clock statistics (ms) for running cmd runs times."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, env=_env())
+        samples.append((time.perf_counter() - start) * 1000.0)
+        if result.returncode != 0:
+            raise RuntimeError("{} exited with {}".format(" ".join(cmd), result.returncode))
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Repetitions per latency measurement")
+    parser.add_argument("--pex", default=DEFAULT_PEX, help="PEX to time (default: dist/csvconv.pex)")
+    parser.add_argument("--build-pex", action="store_true", help="Run scripts/build_pex.sh first")
+    args = parser.parse_args(argv)
+
+    if args.build_pex:
+        subprocess.run(["bash", os.path.join(ROOT, "scripts", "build_pex.sh")], check=True)
+
+    results = {
+        "python": sys.version.split()[0],
+        "import_time": measure_import_time(),
+        "version_latency": time_command([sys.executable, "-m", "csvconv", "--version"], args.runs),
+    }
+    if os.path.exists(args.pex):
+        results["pex_cold_start"] = time_command([sys.executable, args.pex, "--version"], args.runs)
+    else:
+        results["pex_cold_start"] = None
+
+    print(json.dumps(results, indent=2))
+    return 1 if results["import_time"]["imports_pyarrow"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
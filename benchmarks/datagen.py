@@ -0,0 +1,159 @@
+"""Deterministic synthetic data generator for csvconv benchmarks.
+
+Produces CSV files and tar.gz archives of CSV members with a configurable
+number of columns, column types, string widths, member count and member
+size. Output is a pure function of the arguments and seed.
+
+To stay fast at benchmark sizes, rows come from a small set of distinct
+blocks generated with random.Random and then cycled, with the id column kept
+unique. Each block is far larger than gzip's 32 KB window, so compression
+ratios stay realistic.
+
+Usage:
+    python benchmarks/datagen.py csv OUT.csv --rows 1000000 [--columns 8]
+        [--types int,float,string] [--string-width 16] [--seed 0]
+    python benchmarks/datagen.py targz OUT.tar.gz --members 20 --rows 50000 [...]
+"""
+
+import argparse
+import io
+import random
+import sys
+import tarfile
+
+COLUMN_TYPES = ("int", "float", "string", "bool", "timestamp", "category")
+
+_BLOCK_ROWS = 4096
+_DISTINCT_BLOCKS = 8
+_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+_CATEGORIES = 20
+
+
+def make_columns(num_columns=8, types=("int", "float", "string"), string_width=16):
+    # type: (int, tuple, int) -> list
+    """Build a column spec list: column 0 is a unique int64 id, the rest cycle types."""
+    for type_ in types:
+        if type_ not in COLUMN_TYPES:
+            raise ValueError("unknown column type: {}".format(type_))
+    columns = [("id", "int", 0)]
+    for i in range(1, num_columns):
+        type_ = types[(i - 1) % len(types)]
+        width = string_width if type_ in ("string", "category") else 0
+        columns.append(("{}_{}".format(type_, i), type_, width))
+    return columns
+
+
+def _value(rng, type_, width):
+    if type_ == "int":
+        return str(rng.randint(-(10**9), 10**9))
+    if type_ == "float":
+        return repr(round(rng.uniform(-1e6, 1e6), 4))
+    if type_ == "string":
+        return "".join(rng.choices(_ALPHABET, k=width))
+    if type_ == "category":
+        # low-cardinality strings such as status codes or region names
+        return "category_{:0{}d}".format(rng.randrange(_CATEGORIES), max(1, width - 9))
+    if type_ == "bool":
+        return "true" if rng.random() < 0.5 else "false"
+    # timestamp: seconds within 2024
+    seconds = rng.randrange(366 * 86400)
+    day, rem = divmod(seconds, 86400)
+    month, mday = divmod(day, 31)
+    return "2024-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+        min(month + 1, 12), min(mday + 1, 28), rem // 3600, rem // 60 % 60, rem % 60
+    )
+
+
+class _RowSource:
+    """Cyclic stream of row suffixes (everything after the id), built lazily."""
+
+    def __init__(self, columns, seed):
+        self._columns = columns[1:]
+        self._seed = seed
+        self._blocks = {}
+
+    def _block(self, index):
+        block = self._blocks.get(index)
+        if block is None:
+            rng = random.Random("{}:{}".format(self._seed, index))
+            block = [
+                ",".join(_value(rng, type_, width) for _, type_, width in self._columns) for _ in range(_BLOCK_ROWS)
+            ]
+            self._blocks[index] = block
+        return block
+
+    def rows(self, offset, count):
+        """Yield count row suffixes starting at stream position offset."""
+        while count > 0:
+            index, start = divmod(offset, _BLOCK_ROWS)
+            chunk = self._block(index % _DISTINCT_BLOCKS)[start : start + count]
+            for row in chunk:
+                yield row
+            offset += len(chunk)
+            count -= len(chunk)
+
+
+def write_rows(out, rows, columns, seed=0, first_id=0, source=None):
+    # type: (io.TextIOBase, int, list, int, int, _RowSource) -> None
+    """Write a header and rows data rows, ids starting at first_id."""
+    if source is None:
+        source = _RowSource(columns, seed)
+    out.write(",".join(name for name, _, _ in columns) + "\n")
+    sep = "," if len(columns) > 1 else ""
+    for offset in range(first_id, first_id + rows, _BLOCK_ROWS):
+        count = min(_BLOCK_ROWS, first_id + rows - offset)
+        out.write(
+            "".join("{}{}{}\n".format(offset + i, sep, suffix) for i, suffix in enumerate(source.rows(offset, count)))
+        )
+
+
+def generate_csv(path, rows, columns, seed=0):
+    # type: (str, int, list, int) -> None
+    """Write a CSV file with rows data rows."""
+    with open(path, "w", newline="") as f:
+        write_rows(f, rows, columns, seed=seed)
+
+
+def generate_targz(path, members, rows_per_member, columns, seed=0, compresslevel=6):
+    # type: (str, int, int, list, int, int) -> None
+    """Write a tar.gz archive of members CSV files named data/part-NNNNN.csv.
+
+    Members are consecutive slices of one row stream, as if a single large
+    CSV had been split.
+    """
+    source = _RowSource(columns, seed)
+    with tarfile.open(path, "w:gz", compresslevel=compresslevel) as tar:
+        for m in range(members):
+            text = io.StringIO()
+            write_rows(text, rows_per_member, columns, first_id=m * rows_per_member, source=source)
+            data = text.getvalue().encode("utf-8")
+            info = tarfile.TarInfo("data/part-{:05d}.csv".format(m))
+            info.size = len(data)
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=["csv", "targz"])
+    parser.add_argument("output")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows per file or member")
+    parser.add_argument("--members", type=int, default=10, help="tar.gz members")
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument(
+        "--types", default="int,float,string", help="Comma-separated column types: " + ",".join(COLUMN_TYPES)
+    )
+    parser.add_argument("--string-width", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    columns = make_columns(args.columns, tuple(args.types.split(",")), args.string_width)
+    if args.kind == "csv":
+        generate_csv(args.output, args.rows, columns, seed=args.seed)
+    else:
+        generate_targz(args.output, args.members, args.rows, columns, seed=args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
 """CLI argument parsing and entry point for csvconv."""
 
 import argparse
+import contextlib
 import logging
+import os
 import sys
+import time
+from typing import ContextManager, Optional  # noqa: F401
 
 import csvconv
-from csvconv import logging_config
-from csvconv.converter import convert
+from csvconv import jobs, logging_config, parallel, tracing
+from csvconv.summary import ConversionSummary
 
 logger = logging.getLogger("csvconv")
 
@@ -37,6 +41,32 @@ def _positive_int(value):
     return ivalue
 
 
+def _non_negative_int(value):
+    # type: (str) -> int
+    """Validate that a string represents an integer >= 0.
+
+    Args:
+        value: String value from argparse.
+
+    Returns:
+        Parsed integer if not negative.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a non-negative integer.
+    """
+    try:
+        ivalue = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "invalid int value: '{}'".format(value)
+        )
+    if ivalue < 0:
+        raise argparse.ArgumentTypeError(
+            "value must be >= 0, got {}".format(ivalue)
+        )
+    return ivalue
+
+
 def _positive_float(value):
     # type: (str) -> float
     """Validate that a string represents a positive float.
@@ -63,8 +93,406 @@ def _positive_float(value):
     return fvalue
 
 
+def _column_type(value):
+    # type: (str) -> tuple
+    """Parse a NAME=TYPE column type override.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not of the form NAME=TYPE.
+    """
+    name, sep, type_ = value.partition("=")
+    if not sep or not name or not type_:
+        raise argparse.ArgumentTypeError(
+            "expected NAME=TYPE, got '{}'".format(value)
+        )
+    return name, type_
+
+
+def _byte_size(value):
+    # type: (str) -> int
+    """Parse a positive byte count with an optional K, M or G suffix (powers of 1024).
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive size.
+    """
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = value.strip().upper().rstrip("B")
+    multiplier = 1
+    if text and text[-1] in multipliers:
+        multiplier = multipliers[text[-1]]
+        text = text[:-1]
+    try:
+        size = int(float(text) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid size: '{}'".format(value))
+    if size <= 0:
+        raise argparse.ArgumentTypeError("size must be > 0, got '{}'".format(value))
+    return size
+
+
+def _column_list(value):
+    # type: (str) -> list
+    """Parse a comma-separated list of column names.
+
+    Raises:
+        argparse.ArgumentTypeError: If the list has an empty entry.
+    """
+    names = [name.strip() for name in value.split(",")]
+    if not all(names):
+        raise argparse.ArgumentTypeError("expected COL[,COL...], got '{}'".format(value))
+    return names
+
+
+def _add_conversion_options(parser):
+    # type: (argparse.ArgumentParser) -> None
+    """Add the options shared by every command that runs conversions."""
+    parser.add_argument(
+        "--input-type",
+        choices=["csv", "tar.gz"],
+        default=None,
+        dest="input_type",
+        help='Input type: "csv" or "tar.gz" (auto-detected from extension if not given)',
+    )
+    parser.add_argument(
+        "--output-type",
+        choices=["parquet", "arrow", "orc", "csv"],
+        default="parquet",
+        dest="output_type",
+        help='Output type: "parquet", "arrow" (Arrow IPC file), "orc" or "csv" '
+             '(default: parquet)',
+    )
+    parser.add_argument(
+        "--block-size-mb",
+        type=_positive_float,
+        default=1,
+        dest="block_size_mb",
+        help="Block size in MB for CSV reading (default: 1, must be > 0)",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=_positive_int,
+        default=None,
+        dest="row_group_size",
+        help="Parquet row group size (default: None, must be > 0 if given)",
+    )
+    parser.add_argument(
+        "--schema-sample-rows",
+        type=_positive_int,
+        default=1000,
+        dest="schema_sample_rows",
+        help="Number of rows to sample for schema inference (default: 1000, must be > 0)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["snappy", "gzip", "brotli", "zstd", "lz4", "none", "auto"],
+        default=None,
+        dest="compression",
+        help="Parquet compression codec, or auto to trial codecs on the first blocks "
+             "(default: PyArrow default, snappy). Arrow output takes lz4 or zstd, "
+             "ORC output snappy, gzip, zstd or lz4",
+    )
+    parser.add_argument(
+        "--optimize",
+        choices=["speed", "size", "balanced"],
+        default="balanced",
+        dest="optimize",
+        help="Objective for --compression auto (default: balanced)",
+    )
+    parser.add_argument(
+        "--min-throughput-mbps",
+        type=_positive_float,
+        default=None,
+        dest="min_throughput_mbps",
+        metavar="MBPS",
+        help="Skip --compression auto candidates that encode slower than this",
+    )
+    parser.add_argument(
+        "--encoding",
+        choices=["default", "auto"],
+        default="default",
+        dest="encoding",
+        help="Parquet column encodings: PyArrow defaults, or auto-selected per column "
+             "from a profile of the first row group (default: default)",
+    )
+    parser.add_argument(
+        "--column-type",
+        type=_column_type,
+        action="append",
+        default=None,
+        dest="column_types",
+        metavar="NAME=TYPE",
+        help="Pin a column to a PyArrow type alias or \"dictionary\", e.g. id=int64 (repeatable)",
+    )
+    parser.add_argument(
+        "--dict-encode",
+        action="store_true",
+        default=False,
+        dest="dict_encode",
+        help="Dictionary-encode low-cardinality string columns for Parquet output",
+    )
+    parser.add_argument(
+        "--dict-max-cardinality",
+        type=_positive_int,
+        default=None,
+        dest="dict_max_cardinality",
+        metavar="N",
+        help="Most distinct values in the sample for --dict-encode to apply (default: 50)",
+    )
+    parser.add_argument(
+        "--partition-by",
+        type=_column_list,
+        default=None,
+        dest="partition_by",
+        metavar="COL[,COL...]",
+        help="Write Parquet output as a hive-partitioned dataset (col=value/ directories)",
+    )
+    parser.add_argument(
+        "--max-open-writers",
+        type=_positive_int,
+        default=None,
+        dest="max_open_writers",
+        help="Most partition files open at once with --partition-by (default: 32)",
+    )
+    parser.add_argument(
+        "--max-file-rows",
+        type=_positive_int,
+        default=None,
+        dest="max_file_rows",
+        help="Roll output into part-NNNNN files of at most this many rows",
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=_byte_size,
+        default=None,
+        dest="max_file_bytes",
+        metavar="SIZE",
+        help="Roll output into part-NNNNN files once a part reaches SIZE (e.g. 512M, 1G)",
+    )
+    parser.add_argument(
+        "--sort-by",
+        type=_column_list,
+        default=None,
+        dest="sort_by",
+        metavar="COL[,COL...]",
+        help="Sort each Parquet row group by these columns (clustered min/max statistics)",
+    )
+    parser.add_argument(
+        "--global-sort",
+        action="store_true",
+        default=False,
+        dest="global_sort",
+        help="With --sort-by, sort each whole file with an external merge sort",
+    )
+    parser.add_argument(
+        "--sort-memory-mb",
+        type=_positive_float,
+        default=None,
+        dest="sort_memory_mb",
+        help="Memory for --global-sort before sorted runs spill to disk (default: 256)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        default=False,
+        dest="merge",
+        help="Write all tar.gz members into one Parquet output with a _source_file column",
+    )
+    parser.add_argument(
+        "--small-member-bytes",
+        type=_byte_size,
+        default=None,
+        dest="small_member_bytes",
+        metavar="SIZE",
+        help="tar.gz members up to SIZE are parsed single-threaded and their Parquet files "
+             "published in groups (default: 64K)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=None,
+        dest="include",
+        metavar="PATTERN",
+        help="Only convert tar members matching this glob pattern (repeatable)",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=_positive_float,
+        default=None,
+        dest="max_memory_mb",
+        help="Fail a file or tar member whose process RSS exceeds this many MB (default: no limit)",
+    )
+    parser.add_argument(
+        "--memory-pool",
+        choices=["system", "jemalloc", "mimalloc"],
+        default=None,
+        dest="memory_pool",
+        help="Arrow memory allocator for Parquet output (default: PyArrow's default)",
+    )
+    parser.add_argument(
+        "--s3-endpoint",
+        default=None,
+        dest="s3_endpoint",
+        metavar="URL",
+        help="Endpoint of the S3-compatible store for s3:// inputs and outputs, "
+             "e.g. http://minio:9000 "
+             "(default: AWS_ENDPOINT_URL or AWS S3)",
+    )
+    parser.add_argument(
+        "--s3-part-size-mb",
+        type=_positive_float,
+        default=None,
+        dest="s3_part_size_mb",
+        help="Multipart upload part size for s3:// outputs (default: 16, at least 5)",
+    )
+    parser.add_argument(
+        "--s3-upload-threads",
+        type=_positive_int,
+        default=None,
+        dest="s3_upload_threads",
+        help="Parts uploaded in parallel for s3:// outputs (default: 4)",
+    )
+    parser.add_argument(
+        "--s3-read-ahead-mb",
+        type=_positive_float,
+        default=None,
+        dest="s3_read_ahead_mb",
+        help="Bytes of an s3:// input fetched ahead of the parser by parallel ranged GETs "
+             "of up to 8 MB (default: 64)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=_positive_int,
+        default=None,
+        dest="threads",
+        help="Arrow CPU threads per process (default: --cpu-budget divided by --workers)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=_positive_int,
+        default=None,
+        dest="io_threads",
+        help="Arrow I/O threads per process (default: PyArrow's default, 8)",
+    )
+    parser.add_argument(
+        "--read-ahead-depth",
+        type=_non_negative_int,
+        default=None,
+        dest="read_ahead_depth",
+        metavar="N",
+        help="4 MB chunks of a local input read ahead of the parser on a background "
+             "thread, e.g. for NFS (default: 4, 0 to disable)",
+    )
+    parser.add_argument(
+        "--write-behind",
+        action="store_true",
+        default=None,
+        dest="write_behind",
+        help="Write outputs back to disk and drop them from the page cache in 8 MB chunks "
+             "while writing, so the final fsync of a large file does not stall",
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=_positive_int,
+        default=None,
+        dest="cpu_budget",
+        help="Total cores shared by all worker processes (default: available cores)",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        default=False,
+        help="Enable gzip compression for CSV output",
+    )
+
+
+def _add_report_options(parser):
+    # type: (argparse.ArgumentParser) -> None
+    """Add the machine-readable run report options."""
+    parser.add_argument(
+        "--summary-json",
+        default=None,
+        dest="summary_json",
+        metavar="PATH",
+        help="Write a JSON run report (per-file status, rows, bytes, timings, peak memory)",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        dest="metrics_textfile",
+        metavar="PATH",
+        help="Write run metrics in Prometheus textfile-collector format",
+    )
+
+
+def _add_diagnostic_options(parser):
+    # type: (argparse.ArgumentParser) -> None
+    """Add the profiling and tracing options."""
+    parser.add_argument(
+        "--profile",
+        default=None,
+        dest="profile",
+        metavar="PATH",
+        help="Write a cProfile/pstats dump of the run (main process) to PATH",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        dest="trace",
+        metavar="PATH",
+        help="Write per-stage and per-file spans as Chrome trace-event JSON to PATH",
+    )
+
+
+@contextlib.contextmanager
+def _diagnostics(args):
+    """Run the enclosed block under --profile and/or --trace."""
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    if args.trace:
+        tracing.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            logger.info("Wrote profile to %s", args.profile)
+        if args.trace:
+            tracing.write_trace(args.trace, tracing.stop())
+            logger.info("Wrote trace to %s", args.trace)
+
+
+def _write_reports(args, summary, exit_code, started_at, error=None, extra=None):
+    # type: (Optional[argparse.Namespace], ConversionSummary, int, float, Optional[str], Optional[dict]) -> int
+    """Write the reports requested by --summary-json/--metrics-textfile.
+
+    Returns:
+        exit_code, or 1 if a report could not be written.
+    """
+    if args is None or not (args.summary_json or args.metrics_textfile):
+        return exit_code
+
+    from csvconv import report
+
+    data = report.build_report(summary, exit_code, started_at, error=error, extra=extra)
+    try:
+        if args.summary_json:
+            report.write_summary_json(args.summary_json, data)
+        if args.metrics_textfile:
+            report.write_metrics_textfile(args.metrics_textfile, data)
+    except OSError as e:
+        logger.error("Failed to write run report: %s", e)
+        return 1
+    return exit_code
+
+
 def parse_args(argv=None):
-    # type: (list) -> argparse.Namespace
+    # type: (Optional[list]) -> argparse.Namespace
     """Parse command-line arguments for csvconv.
 
     Args:
@@ -89,7 +517,7 @@ def parse_args(argv=None):
         "--input",
         required=True,
         dest="input",
-        help="Input file path (CSV or tar.gz)",
+        help="Input file path or s3:// URI (CSV or tar.gz), or a directory/glob of such files",
     )
     parser.add_argument(
         "--output",
@@ -99,46 +527,35 @@ def parse_args(argv=None):
     )
 
     # Optional arguments
+    _add_conversion_options(parser)
     parser.add_argument(
-        "--input-type",
-        choices=["csv", "tar.gz"],
-        default=None,
-        dest="input_type",
-        help='Input type: "csv" or "tar.gz" (auto-detected from extension if not given)',
-    )
-    parser.add_argument(
-        "--output-type",
-        choices=["parquet", "csv"],
-        default="parquet",
-        dest="output_type",
-        help='Output type: "parquet" or "csv" (default: parquet)',
-    )
-    parser.add_argument(
-        "--block-size-mb",
-        type=_positive_float,
+        "--workers",
+        type=_positive_int,
         default=1,
-        dest="block_size_mb",
-        help="Block size in MB for CSV reading (default: 1, must be > 0)",
+        dest="workers",
+        help="Worker processes for directory/glob inputs (default: 1, must be > 0)",
     )
     parser.add_argument(
-        "--row-group-size",
-        type=_positive_int,
+        "--memory-budget-mb",
+        type=_positive_float,
         default=None,
-        dest="row_group_size",
-        help="Parquet row group size (default: None, must be > 0 if given)",
+        dest="memory_budget_mb",
+        help="Shared memory budget in MB across workers (default: unbounded, must be > 0)",
     )
     parser.add_argument(
-        "--schema-sample-rows",
-        type=_positive_int,
-        default=1000,
-        dest="schema_sample_rows",
-        help="Number of rows to sample for schema inference (default: 1000, must be > 0)",
+        "--connect",
+        default=None,
+        dest="connect",
+        metavar="SOCKET",
+        help="Submit the conversion to a 'csvconv serve' daemon listening on SOCKET",
     )
+    _add_report_options(parser)
+    _add_diagnostic_options(parser)
     parser.add_argument(
-        "--gzip",
+        "--progress",
         action="store_true",
         default=False,
-        help="Enable gzip compression for CSV output",
+        help="Report progress, throughput and ETA on stderr while converting",
     )
     parser.add_argument(
         "--log-level",
@@ -150,31 +567,35 @@ def parse_args(argv=None):
 
     args = parser.parse_args(argv)
 
-    # Auto-detect input type from extension if not explicitly provided
-    if args.input_type is None:
-        input_lower = args.input.lower()
-        if input_lower.endswith(".tar.gz") or input_lower.endswith(".tgz"):
-            args.input_type = "tar.gz"
-        else:
-            args.input_type = "csv"
+    # Auto-detect input type from extension if not explicitly provided.
+    # Directory/glob inputs are detected per file at scheduling time.
+    args.multi_input = parallel.is_multi_input(args.input)
+    if args.input_type is None and not args.multi_input:
+        args.input_type = parallel.detect_input_type(args.input)
 
     # Normalize WARN -> WARNING
     if args.log_level == "WARN":
         args.log_level = "WARNING"
 
-    # Warn if --gzip used with --output-type parquet
-    if args.gzip and args.output_type == "parquet":
+    if args.column_types is not None:
+        args.column_types = dict(args.column_types)
+
+    if args.connect and (args.profile or args.trace):
+        parser.error("--profile and --trace are not supported with --connect")
+
+    # Warn if --gzip used with a columnar --output-type
+    if args.gzip and args.output_type != "csv":
         # Setup logging first so the warning is visible
         logging_config.setup_logging(args.log_level)
         logger.warning(
-            "--gzip flag has no effect with --output-type parquet"
+            "--gzip flag has no effect with --output-type %s", args.output_type
         )
 
     return args
 
 
 def main(argv=None):
-    # type: (list) -> int
+    # type: (Optional[list]) -> int
     """Main entry point for csvconv CLI.
 
     Args:
@@ -183,26 +604,443 @@ def main(argv=None):
     Returns:
         Exit code: 0 on success, 1 on failure.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in _COMMANDS:
+        return _COMMANDS[argv[0]](argv[1:])
+
+    started_at = time.time()
+    summary = ConversionSummary()
+    args, error = None, None
     try:
         args = parse_args(argv)
         logging_config.setup_logging(args.log_level)
 
-        summary = convert(
-            input_path=args.input,
-            output_path=args.output,
-            input_type=args.input_type,
-            output_type=args.output_type,
-            block_size_mb=args.block_size_mb,
-            row_group_size=args.row_group_size,
-            schema_sample_rows=args.schema_sample_rows,
-            gzip=args.gzip,
-        )
+        if args.connect:
+            from csvconv import daemon
+
+            exit_code, error = daemon.submit(args.connect, args, summary=summary)
+        else:
+            with _diagnostics(args):
+                exit_code, _ = run_conversion(args, summary=summary)
+            print(summary.get_report())
+
+    except SystemExit:
+        raise
+    except Exception as e:
+        logger.error("Conversion failed: %s", e)
+        exit_code, error = 1, str(e)
+
+    return _write_reports(args, summary, exit_code, started_at, error=error)
+
+
+def convert_kwargs(args):
+    # type: (argparse.Namespace) -> dict
+    """Map parsed one-shot CLI arguments onto convert() keyword arguments."""
+    from csvconv.threads import plan_threads
+
+    return {
+        "input_path": args.input,
+        "output_path": args.output,
+        "input_type": args.input_type,
+        "output_type": args.output_type,
+        "block_size_mb": args.block_size_mb,
+        "row_group_size": args.row_group_size,
+        "schema_sample_rows": args.schema_sample_rows,
+        "gzip": args.gzip,
+        "compression": args.compression,
+        "optimize": args.optimize,
+        "min_throughput_mbps": args.min_throughput_mbps,
+        "column_types": args.column_types,
+        "dict_encode": args.dict_encode,
+        "dict_max_cardinality": args.dict_max_cardinality,
+        "encoding": args.encoding,
+        "include": args.include,
+        "partition_by": args.partition_by,
+        "max_open_writers": args.max_open_writers,
+        "max_file_rows": args.max_file_rows,
+        "max_file_bytes": args.max_file_bytes,
+        "sort_by": args.sort_by,
+        "global_sort": args.global_sort,
+        "sort_memory_mb": args.sort_memory_mb,
+        "merge": args.merge,
+        "small_member_bytes": args.small_member_bytes,
+        "max_memory_mb": args.max_memory_mb,
+        "memory_pool": args.memory_pool,
+        "s3_endpoint": args.s3_endpoint,
+        "s3_part_size_mb": args.s3_part_size_mb,
+        "s3_upload_threads": args.s3_upload_threads,
+        "s3_read_ahead_mb": args.s3_read_ahead_mb,
+        "threads": plan_threads(args.workers, args.threads, args.cpu_budget),
+        "io_threads": args.io_threads,
+        "read_ahead_depth": args.read_ahead_depth,
+        "write_behind": args.write_behind,
+    }
+
+
+def run_conversion(args, summary=None):
+    # type: (argparse.Namespace, Optional[ConversionSummary]) -> tuple
+    """Run the conversion described by parsed one-shot CLI arguments.
+
+    Shared by the CLI and the warm worker daemon so both behave identically.
+    Results are recorded into summary (a new ConversionSummary if None), so
+    a caller keeps the files converted before a whole-conversion failure.
+
+    Returns:
+        (exit_code, summary). A single-file conversion that fails as a whole
+        raises instead; directory/glob inputs exit 1 if any file failed.
+    """
+    if summary is None:
+        summary = ConversionSummary()
+    if args.multi_input:
+        return _convert_many(args, summary)
+
+    # Deferred until a conversion actually runs: pulls in PyArrow
+    from csvconv.converter import convert
+
+    total_bytes = os.path.getsize(args.input) if os.path.isfile(args.input) else 0
+    with _progress_reporter(args, total_bytes) as progress:
+        convert(summary=summary, progress=progress, **convert_kwargs(args))
+    return 0, summary
+
+
+def _progress_reporter(args, total_bytes):
+    # type: (argparse.Namespace, int) -> ContextManager
+    """Return a ProgressReporter context for --progress, else a no-op one."""
+    if not args.progress:
+        return contextlib.nullcontext()
+
+    from csvconv.progress import ProgressReporter
+
+    return ProgressReporter(total_bytes)
+
+
+def _convert_many(args, summary):
+    # type: (argparse.Namespace, ConversionSummary) -> tuple
+    """Convert every file matched by a directory/glob input on one pool.
+
+    Returns:
+        (exit_code, summary): exit code 1 if any file failed.
+    """
+    kwargs = convert_kwargs(args)
+    tasks = parallel.build_tasks(
+        input_path=kwargs.pop("input_path"),
+        output_path=kwargs.pop("output_path"),
+        **kwargs
+    )
+    logger.info("Scheduling %d input file(s) on %d worker(s)", len(tasks), args.workers)
+
+    def _finished(task, result):
+        progress.finish_input(task.size_bytes, rows=sum(f.get("rows") or 0 for f in result.files))
+
+    with _progress_reporter(args, sum(task.size_bytes for task in tasks)) as progress:
+        summary.merge(parallel.run_tasks(
+            tasks, workers=args.workers, memory_budget_mb=args.memory_budget_mb,
+            on_result=_finished if progress is not None else None,
+        ))
+    return (1 if summary.total_failure else 0), summary
 
+
+def parse_run_args(argv=None):
+    # type: (Optional[list]) -> argparse.Namespace
+    """Parse arguments for ``csvconv run JOB_FILE``.
+
+    Args:
+        argv: Argument strings following the "run" subcommand.
+
+    Returns:
+        Parsed argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="csvconv run",
+        description="Execute a JSON/YAML/TOML batch job file on one worker pool.",
+    )
+    parser.add_argument("job_file", help="Path to the job file")
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        dest="workers",
+        help="Worker processes (default: the job file's \"workers\", else 1)",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=_positive_float,
+        default=None,
+        dest="memory_budget_mb",
+        help="Shared memory budget in MB (default: the job file's \"memory_budget_mb\")",
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=_positive_int,
+        default=None,
+        dest="cpu_budget",
+        help="Total cores shared by all workers (default: the job file's \"cpu_budget\")",
+    )
+    _add_report_options(parser)
+    _add_diagnostic_options(parser)
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARN", "WARNING", "ERROR"],
+        default="INFO",
+        dest="log_level",
+        help="Logging level (default: INFO)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.log_level == "WARN":
+        args.log_level = "WARNING"
+    return args
+
+
+def run_main(argv=None):
+    # type: (Optional[list]) -> int
+    """Entry point for ``csvconv run``.
+
+    Returns:
+        Exit code: 0 if every job succeeded, 1 otherwise.
+    """
+    started_at = time.time()
+    summary = ConversionSummary()
+    args, error, extra = None, None, None
+    try:
+        args = parse_run_args(argv)
+        logging_config.setup_logging(args.log_level)
+
+        with _diagnostics(args):
+            summary, job_summaries = jobs.run_jobs(
+                args.job_file, workers=args.workers, memory_budget_mb=args.memory_budget_mb,
+                cpu_budget=args.cpu_budget,
+            )
+
+        print(jobs.format_job_report(job_summaries))
+        print("")
         print(summary.get_report())
+        exit_code = 1 if summary.total_failure else 0
+        extra = {"jobs": {
+            name: {"success": s.total_success, "failure": s.total_failure}
+            for name, s in job_summaries.items()
+        }}
+
+    except SystemExit:
+        raise
+    except Exception as e:
+        logger.error("Batch run failed: %s", e)
+        exit_code, error = 1, str(e)
+
+    return _write_reports(args, summary, exit_code, started_at, error=error, extra=extra)
+
+
+def parse_serve_args(argv=None):
+    # type: (Optional[list]) -> argparse.Namespace
+    """Parse arguments for ``csvconv serve --socket PATH``.
+
+    Args:
+        argv: Argument strings following the "serve" subcommand.
+
+    Returns:
+        Parsed argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="csvconv serve",
+        description="Run a warm worker daemon that accepts conversions over a Unix socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        required=True,
+        dest="socket",
+        help="Unix domain socket path to listen on",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        dest="workers",
+        help="Warm worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=_positive_int,
+        default=None,
+        dest="cpu_budget",
+        help="Total cores shared by all warm workers (default: available cores)",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARN", "WARNING", "ERROR"],
+        default="INFO",
+        dest="log_level",
+        help="Daemon logging level (default: INFO)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.log_level == "WARN":
+        args.log_level = "WARNING"
+    return args
+
+
+def serve_main(argv=None):
+    # type: (Optional[list]) -> int
+    """Entry point for ``csvconv serve``.
+
+    Returns:
+        Exit code: 0 after a clean shutdown, 1 on failure.
+    """
+    try:
+        args = parse_serve_args(argv)
+        logging_config.setup_logging(args.log_level)
+
+        from csvconv import daemon
+
+        daemon.serve(args.socket, workers=args.workers, cpu_budget=args.cpu_budget)
         return 0
 
     except SystemExit:
         raise
     except Exception as e:
-        logger.error("Conversion failed: %s", e)
+        logger.error("Daemon failed: %s", e)
         return 1
+
+
+def parse_watch_args(argv=None):
+    # type: (Optional[list]) -> argparse.Namespace
+    """Parse arguments for ``csvconv watch --input DIR --output DIR``.
+
+    Args:
+        argv: Argument strings following the "watch" subcommand.
+
+    Returns:
+        Parsed argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="csvconv watch",
+        description="Continuously convert CSV and tar.gz files dropped into a directory.",
+    )
+    parser.add_argument(
+        "--input",
+        required=True,
+        dest="input",
+        help="Landing directory to watch",
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        dest="output",
+        help="Output directory",
+    )
+    _add_conversion_options(parser)
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        dest="workers",
+        help="Maximum concurrent conversions on the warm pool (default: 1)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=_positive_float,
+        default=5.0,
+        dest="poll_interval",
+        help="Seconds between directory rescans (default: 5)",
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=10.0,
+        dest="settle_seconds",
+        help="Minimum age of a file's mtime before it is considered complete (default: 10)",
+    )
+    parser.add_argument(
+        "--marker-suffix",
+        default=None,
+        dest="marker_suffix",
+        help="Only convert files once NAME+SUFFIX exists, e.g. .done",
+    )
+    parser.add_argument(
+        "--done-dir",
+        default=None,
+        dest="done_dir",
+        help="Move successfully converted inputs to this directory",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=None,
+        dest="state_file",
+        help="Ledger of processed files (default: OUTPUT/.csvconv-watch.jsonl)",
+    )
+    parser.add_argument(
+        "--no-inotify",
+        action="store_false",
+        dest="use_inotify",
+        help="Disable inotify wake-ups and rely on polling only",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        default=False,
+        help="Convert what is currently in the directory, then exit",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARN", "WARNING", "ERROR"],
+        default="INFO",
+        dest="log_level",
+        help="Logging level (default: INFO)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.log_level == "WARN":
+        args.log_level = "WARNING"
+    if args.column_types is not None:
+        args.column_types = dict(args.column_types)
+    if not os.path.isdir(args.input):
+        parser.error("--input must be an existing directory: {}".format(args.input))
+    return args
+
+
+def watch_main(argv=None):
+    # type: (Optional[list]) -> int
+    """Entry point for ``csvconv watch``.
+
+    Returns:
+        Exit code: 0 after a clean stop (with --once, 1 if any file failed).
+    """
+    try:
+        args = parse_watch_args(argv)
+        logging_config.setup_logging(args.log_level)
+
+        import signal
+
+        from csvconv.watch import DropZoneWatcher
+
+        # The watcher fills in the path and type of every file it picks up
+        options = convert_kwargs(args)
+        for key in ("input_path", "output_path", "input_type"):
+            del options[key]
+        watcher = DropZoneWatcher(
+            args.input, args.output, convert_options=options, workers=args.workers,
+            poll_interval=args.poll_interval, settle_seconds=args.settle_seconds,
+            marker_suffix=args.marker_suffix, done_dir=args.done_dir,
+            state_file=args.state_file, use_inotify=args.use_inotify,
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+        signal.signal(signal.SIGINT, lambda signum, frame: watcher.stop())
+
+        logger.info("Watching %s -> %s", args.input, args.output)
+        summary = watcher.run(once=args.once)
+
+        print(summary.get_report())
+        return 1 if (args.once and summary.total_failure) else 0
+
+    except SystemExit:
+        raise
+    except Exception as e:
+        logger.error("Watch failed: %s", e)
+        return 1
+
+
+_COMMANDS = {
+    "run": run_main,
+    "serve": serve_main,
+    "watch": watch_main,
+}
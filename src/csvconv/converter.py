@@ -1,19 +1,41 @@
-"""High-level conversion orchestration and dispatch."""
+"""High-level conversion orchestration and dispatch.
 
+PyArrow-backed readers and writers are imported inside the pipeline that
+needs them, so importing this module (and the CLI) stays cheap and each
+run only loads the writer it actually uses.
+"""
+
+import contextlib
+import itertools
 import logging
 import os
+from typing import Iterator, Optional  # noqa: F401
 
-from csvconv.reader.csv_reader import read_streaming
-from csvconv.reader.tar_reader import list_csv_members, open_member_stream, extract_member_stream
-from csvconv.schema.inference import infer_schema
-from csvconv.schema.validation import validate_batch_schema
+from csvconv.errors import InputValidationError
+from csvconv.metrics import MemoryTracker, StageTimer, file_metrics
+from csvconv.reader.readahead import configure_read_ahead
+from csvconv.reader.tar_reader import iter_csv_members
+from csvconv.s3 import S3Settings, is_s3_uri
 from csvconv.security import validate_tar_member_path
 from csvconv.summary import ConversionSummary
-from csvconv.writer.csv_writer import extract_stream
-from csvconv.writer.parquet_writer import IncrementalParquetWriter
 
 logger = logging.getLogger("csvconv")
 
+# Output types written from RecordBatches by an AtomicFileWriter
+COLUMNAR_OUTPUT_TYPES = ("parquet", "arrow", "orc")
+
+# Column naming the tar member each row came from in --merge output
+SOURCE_FILE_COLUMN = "_source_file"
+
+# Row groups of --merge output are coalesced to about this size, however
+# small the members are
+MERGE_ROW_GROUP_BYTES = 32 * 1024 * 1024
+
+# Tar members up to this size take the small-member path, and their
+# Parquet files are published this many at a time
+SMALL_MEMBER_BYTES = 64 * 1024
+SMALL_MEMBER_GROUP = 256
+
 
 def convert(
     input_path,        # type: str
@@ -21,9 +43,39 @@ def convert(
     input_type="csv",  # type: str
     output_type="parquet",  # type: str
     block_size_mb=1,   # type: int
-    row_group_size=None,  # type: int
+    row_group_size=None,  # type: Optional[int]
     schema_sample_rows=1000,  # type: int
     gzip=False,        # type: bool
+    compression=None,  # type: Optional[str]
+    column_types=None,  # type: Optional[dict]
+    include=None,      # type: Optional[list]
+    summary=None,      # type: Optional[ConversionSummary]
+    progress=None,     # type: ProgressReporter
+    max_memory_mb=None,  # type: Optional[float]
+    memory_pool=None,  # type: Optional[str]
+    threads=None,      # type: Optional[int]
+    io_threads=None,   # type: Optional[int]
+    dict_encode=False,  # type: bool
+    dict_max_cardinality=None,  # type: Optional[int]
+    encoding=None,     # type: Optional[str]
+    optimize="balanced",  # type: str
+    min_throughput_mbps=None,  # type: Optional[float]
+    partition_by=None,  # type: Optional[list]
+    max_open_writers=None,  # type: Optional[int]
+    part_prefix=None,  # type: Optional[str]
+    max_file_rows=None,  # type: Optional[int]
+    max_file_bytes=None,  # type: Optional[int]
+    sort_by=None,      # type: Optional[list]
+    global_sort=False,  # type: bool
+    sort_memory_mb=None,  # type: Optional[float]
+    merge=False,       # type: bool
+    small_member_bytes=None,  # type: Optional[int]
+    s3_endpoint=None,  # type: Optional[str]
+    s3_part_size_mb=None,  # type: Optional[float]
+    s3_upload_threads=None,  # type: Optional[int]
+    s3_read_ahead_mb=None,  # type: Optional[float]
+    read_ahead_depth=None,  # type: Optional[int]
+    write_behind=None,  # type: Optional[bool]
 ):
     """Top-level dispatch: route to correct reader/writer pipeline.
 
@@ -31,108 +83,738 @@ def convert(
       - csv + parquet    -> csv_reader + parquet_writer (streaming RecordBatch)
       - tar.gz + parquet -> tar_reader + csv_reader + parquet_writer (schema inference)
       - tar.gz + csv     -> tar_reader + csv_writer.extract_stream() (raw extraction)
+
+    output_type "arrow" (Arrow IPC file) and "orc" take the Parquet
+    pipelines with writer.arrow_writer / writer.orc_writer in place of the
+    Parquet writer. Arrow output accepts lz4 and zstd compression, ORC
+    output snappy, gzip (zlib), zstd and lz4; partitioning, part files and
+    the auto codec and encoding are Parquet only.
+
+    compression selects the Parquet codec, column_types pins the types of
+    individual columns ({name: type alias or pa.DataType}) and include
+    restricts tar members to those matching any of the given glob patterns.
+
+    Results are recorded into summary (a new ConversionSummary if None),
+    which is also returned; passing one in keeps the records of a
+    conversion that raises. progress is an optional ProgressReporter fed
+    with the input read position and row counts.
+
+    Peak RSS and Arrow pool usage are recorded per file. With max_memory_mb,
+    a file whose RSS exceeds the ceiling fails with MemoryLimitError (tar
+    members are recorded as failed and the next member is attempted).
+    memory_pool selects Arrow's allocator (system, jemalloc or mimalloc) for
+    Parquet output during this conversion; cached free memory is released
+    after every file.
+    threads and io_threads size Arrow's CPU and I/O thread pools for the
+    duration of the conversion.
+
+    With dict_encode, inferred string columns with at most
+    dict_max_cardinality distinct values (default 50) in the first block
+    (CSV) or the schema sample (tar.gz) are parsed and written to Parquet
+    as dictionary-encoded columns. encoding="auto" picks each Parquet
+    column's encoding from a profile of the file's first row group; the
+    choice and the estimated bytes saved are recorded per file.
+
+    compression="auto" trial-compresses the first blocks with several
+    codecs and levels and picks one for the optimize objective ("speed",
+    "size" or "balanced"), optionally no slower than min_throughput_mbps;
+    the choice is cached per schema (see writer.parquet_codec).
+
+    partition_by writes Parquet output as a hive-partitioned dataset
+    (output_path/col=value/...) with at most max_open_writers part files
+    open at once; see writer.partitioned_writer. Part files are prefixed
+    with part_prefix (default: the input file name without extension).
+
+    max_file_rows and max_file_bytes roll each output file into numbered
+    parts (out.parquet -> out-part-00000.parquet, ...; likewise for CSV
+    extraction), each published atomically and listed under "parts" in
+    the file's summary record.
+
+    sort_by sorts each Parquet row group by those columns and records the
+    order in the file footer. With global_sort the whole file (or tar
+    member) is sorted instead, spilling sorted runs to a temporary
+    directory once sort_memory_mb (default 256) is buffered; see
+    writer.sorting.
+
+    With merge, tar.gz -> parquet streams every member into one output at
+    output_path (a file, or the dataset root / part files with
+    partition_by / max_file_rows / max_file_bytes) with a dictionary-encoded
+    _source_file column holding the member name. Row groups are coalesced
+    to MERGE_ROW_GROUP_BYTES and the archive is recorded as one file.
+
+    tar.gz archives are decompressed in a single pass. Members of at most
+    small_member_bytes (default SMALL_MEMBER_BYTES) are parsed on the
+    calling thread and, for per-member Parquet output, published in groups
+    of SMALL_MEMBER_GROUP files.
+
+    An ``s3://bucket/key`` output_path (for tar.gz, the key prefix of the
+    member outputs) streams columnar output into S3 multipart uploads of
+    s3_part_size_mb parts, up to s3_upload_threads in flight, against
+    s3_endpoint (default: AWS or the AWS_ENDPOINT_URL environment); each
+    object is published only when its file completes. An ``s3://``
+    input_path is read with ranged GETs in parallel, up to s3_read_ahead_mb
+    ahead of the parser. These S3 settings hold for this conversion only.
+    See csvconv.s3.
+
+    Local inputs are read in large chunks by a background thread,
+    read_ahead_depth chunks (default DEFAULT_READ_AHEAD_DEPTH, 0 to read
+    directly) ahead of the parser, and dropped from the page cache once
+    consumed; see reader.readahead. The depth is set anew by every
+    conversion. With write_behind, local outputs are written back and
+    evicted from the page cache in chunks while they are written, so
+    publishing a large file no longer waits for one long fsync; see
+    writer.writebehind.
     """
-    summary = ConversionSummary()
-
-    if input_type == "csv" and output_type == "parquet":
-        _convert_csv_to_parquet(input_path, output_path, block_size_mb, row_group_size, summary)
-    elif input_type == "tar.gz" and output_type == "parquet":
-        _convert_targz_to_parquet(
-            input_path, output_path, block_size_mb, row_group_size,
-            schema_sample_rows, summary
-        )
-    elif input_type == "tar.gz" and output_type == "csv":
-        _extract_targz_to_csv(input_path, output_path, gzip, summary)
-    else:
-        raise ValueError(
-            "Unsupported conversion: {} -> {}".format(input_type, output_type)
-        )
+    if summary is None:
+        summary = ConversionSummary()
+    if encoding not in (None, "default", "auto"):
+        raise InputValidationError("Unknown encoding mode: {}".format(encoding))
+    if compression == "auto" and optimize not in ("speed", "size", "balanced"):
+        raise InputValidationError("Unknown optimization objective: {}".format(optimize))
+    if is_s3_uri(output_path):
+        _check_s3_options(output_type, partition_by=partition_by, max_file_rows=max_file_rows,
+                          max_file_bytes=max_file_bytes)
+    s3 = S3Settings(s3_endpoint, s3_part_size_mb, s3_upload_threads, s3_read_ahead_mb)
+    configure_read_ahead(read_ahead_depth)
+    write_behind = bool(write_behind)
+    if output_type in ("arrow", "orc"):
+        _check_non_parquet_options(output_type, compression=compression, encoding=encoding,
+                                   partition_by=partition_by, max_file_rows=max_file_rows,
+                                   max_file_bytes=max_file_bytes)
+    limit_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+    if output_type in COLUMNAR_OUTPUT_TYPES:
+        if dict_encode and dict_max_cardinality is None:
+            from csvconv.schema.inference import DEFAULT_DICT_MAX_CARDINALITY
+
+            dict_max_cardinality = DEFAULT_DICT_MAX_CARDINALITY
+    if not dict_encode:
+        dict_max_cardinality = None
+    if small_member_bytes is None:
+        small_member_bytes = SMALL_MEMBER_BYTES
+    if column_types:
+        from csvconv.schema.inference import parse_column_types
+
+        column_types = parse_column_types(column_types)
+
+    with contextlib.ExitStack() as scope:
+        if memory_pool is not None and output_type in COLUMNAR_OUTPUT_TYPES:
+            from csvconv.memory import scoped_memory_pool
+
+            scope.enter_context(scoped_memory_pool(memory_pool))
+        if (threads is not None or io_threads is not None) and output_type in COLUMNAR_OUTPUT_TYPES:
+            from csvconv.threads import scoped_thread_limits
+
+            scope.enter_context(scoped_thread_limits(threads, io_threads))
+        if input_type == "csv" and output_type in COLUMNAR_OUTPUT_TYPES:
+            _convert_csv_to_parquet(
+                input_path, output_path, block_size_mb, row_group_size, summary,
+                output_type=output_type,
+                compression=compression, column_types=column_types, progress=progress,
+                limit_bytes=limit_bytes, dict_max_cardinality=dict_max_cardinality,
+                encoding=encoding, optimize=optimize, min_throughput_mbps=min_throughput_mbps,
+                partition_by=partition_by, max_open_writers=max_open_writers,
+                part_prefix=part_prefix, max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                sort_by=sort_by, global_sort=global_sort, sort_memory_mb=sort_memory_mb, s3=s3,
+                write_behind=write_behind,
+            )
+        elif input_type == "tar.gz" and output_type in COLUMNAR_OUTPUT_TYPES and merge:
+            _convert_targz_merged(
+                input_path, output_path, block_size_mb, row_group_size,
+                schema_sample_rows, summary, output_type=output_type,
+                compression=compression, column_types=column_types, include=include,
+                progress=progress, limit_bytes=limit_bytes,
+                dict_max_cardinality=dict_max_cardinality, encoding=encoding,
+                optimize=optimize, min_throughput_mbps=min_throughput_mbps,
+                partition_by=partition_by, max_open_writers=max_open_writers,
+                part_prefix=part_prefix, max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                sort_by=sort_by, global_sort=global_sort, sort_memory_mb=sort_memory_mb,
+                small_member_bytes=small_member_bytes, s3=s3, write_behind=write_behind,
+            )
+        elif input_type == "tar.gz" and output_type in COLUMNAR_OUTPUT_TYPES:
+            _convert_targz_to_parquet(
+                input_path, output_path, block_size_mb, row_group_size,
+                schema_sample_rows, summary, output_type=output_type,
+                compression=compression, column_types=column_types, include=include,
+                progress=progress, limit_bytes=limit_bytes,
+                dict_max_cardinality=dict_max_cardinality, encoding=encoding,
+                optimize=optimize, min_throughput_mbps=min_throughput_mbps,
+                partition_by=partition_by, max_open_writers=max_open_writers,
+                part_prefix=part_prefix, max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                sort_by=sort_by, global_sort=global_sort, sort_memory_mb=sort_memory_mb,
+                small_member_bytes=small_member_bytes, s3=s3, write_behind=write_behind,
+            )
+        elif input_type == "tar.gz" and output_type == "csv":
+            _extract_targz_to_csv(input_path, output_path, gzip, summary, include=include,
+                                  progress=progress, limit_bytes=limit_bytes,
+                                  max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                                  s3=s3, write_behind=write_behind)
+        else:
+            raise ValueError(
+                "Unsupported conversion: {} -> {}".format(input_type, output_type)
+            )
 
     return summary
 
 
-def _convert_csv_to_parquet(input_path, output_path, block_size_mb, row_group_size, summary):
-    """Convert a single CSV file to Parquet."""
-    file_name = os.path.basename(input_path)
-    try:
-        # First pass: read a batch to get schema
-        batches = list(read_streaming(input_path, block_size_mb=block_size_mb))
+def _check_non_parquet_options(output_type, compression=None, encoding=None,
+                               partition_by=None, max_file_rows=None, max_file_bytes=None):
+    # type: (str, Optional[str], Optional[str], Optional[list], Optional[int], Optional[int]) -> None
+    """Raise InputValidationError for Parquet-only options given with output_type."""
+    unsupported = []
+    if compression == "auto":
+        unsupported.append("compression=auto")
+    if encoding == "auto":
+        unsupported.append("encoding=auto")
+    if partition_by:
+        unsupported.append("partition_by")
+    if max_file_rows or max_file_bytes:
+        unsupported.append("max_file_rows/max_file_bytes")
+    if unsupported:
+        raise InputValidationError("Not supported with {} output: {}".format(
+            output_type, ", ".join(unsupported)
+        ))
+
+
+def _check_s3_options(output_type, partition_by=None, max_file_rows=None, max_file_bytes=None):
+    # type: (str, Optional[list], Optional[int], Optional[int]) -> None
+    """Raise InputValidationError for options that cannot write to S3."""
+    unsupported = []
+    if output_type not in COLUMNAR_OUTPUT_TYPES:
+        unsupported.append("output_type={}".format(output_type))
+    if partition_by:
+        unsupported.append("partition_by")
+    if max_file_rows or max_file_bytes:
+        unsupported.append("max_file_rows/max_file_bytes")
+    if unsupported:
+        raise InputValidationError("Not supported with S3 output: {}".format(
+            ", ".join(unsupported)
+        ))
+
+
+@contextlib.contextmanager
+def _open_tracked(input_path, progress, s3=None):
+    """Yield input_path itself, or an open file tracked by progress if given.
+
+    An ``s3://`` input is opened with read-ahead per the s3 settings and
+    not tracked.
+    """
+    from csvconv.reader.readahead import open_input
 
-        if not batches:
-            logger.warning("Empty CSV file: %s", input_path)
-            summary.record_success(file_name)
-            return
+    if is_s3_uri(input_path):
+        with open_input(input_path, s3=s3) as f:
+            yield f
+        return
+    if progress is None:
+        yield input_path
+        return
+    with open_input(input_path) as f, progress.tracking(f):
+        yield f
 
-        schema = batches[0].schema
 
-        with IncrementalParquetWriter(output_path, schema, row_group_size=row_group_size) as writer:
-            for batch in batches:
-                writer.write_batch(batch)
+def _autotune_codec(batches, timer, optimize, min_throughput_mbps):
+    # type: (Iterator, StageTimer, str, float) -> tuple
+    """Buffer the first blocks of batches and choose a codec from them.
 
-        summary.record_success(file_name)
+    Returns:
+        (CodecChoice or None for an empty input, iterator yielding the
+        buffered blocks and then the rest of batches)
+    """
+    import pyarrow as pa
+
+    from csvconv.writer.parquet_codec import TRIAL_SAMPLE_BYTES, choose_codec
+
+    head = []
+    head_bytes = 0
+    for batch in batches:
+        head.append(batch)
+        head_bytes += batch.nbytes
+        if head_bytes >= TRIAL_SAMPLE_BYTES:
+            break
+    timer.lap("read")
+    if not head:
+        return None, batches
+    choice = choose_codec(pa.Table.from_batches(head), optimize, min_throughput_mbps)
+    timer.lap("autotune")
+    return choice, itertools.chain(head, batches)
+
+
+@contextlib.contextmanager
+def _sorted_input(batches, schema, timer, sort_by, global_sort, sort_memory_mb):
+    """Yield batches, or with global_sort all of them externally sorted by sort_by.
+
+    The spill directory of the external sort is removed on exit.
+    """
+    if not (sort_by and global_sort):
+        yield batches
+        return
+    from csvconv.writer.sorting import DEFAULT_SORT_MEMORY_MB, ExternalSorter
+
+    memory_bytes = int((sort_memory_mb or DEFAULT_SORT_MEMORY_MB) * 1024 * 1024)
+    with ExternalSorter(schema, sort_by, memory_bytes) as sorter:
+        for batch in batches:
+            timer.lap("read")
+            sorter.add(batch)
+            timer.lap("sort")
+        logger.debug("Sorted %s in %d spilled run(s)", timer.name, sorter.runs)
+        yield sorter.merged()
+
+
+def _codec_kwargs(compression, codec):
+    # type: (str, CodecChoice) -> dict
+    """IncrementalParquetWriter compression arguments."""
+    if codec is not None:
+        return {"compression": codec.compression, "compression_level": codec.level}
+    if compression == "auto":
+        return {}
+    return {"compression": compression}
+
+
+def _archive_stem(path):
+    # type: (str) -> str
+    """Archive file name without its .tar.gz/.tgz extension."""
+    name = os.path.basename(path)
+    for ext in (".tar.gz", ".tgz"):
+        if name.lower().endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def _first_member_schema(input_path, include, progress, schema_sample_rows, column_types,
+                         dict_max_cardinality, s3):
+    """Start the single pass over an archive's CSV members and infer their schema.
+
+    The schema comes from the first member, which is put back in front of
+    the rest. Returns (members, schema), or (None, None) for an archive
+    without CSV members.
+    """
+    from csvconv.schema.inference import infer_schema_from_stream
+
+    streams = iter_csv_members(input_path, include=include, progress=progress, s3=s3)
+    first = next(streams, None)
+    if first is None:
+        logger.info("No CSV members found in %s", input_path)
+        return None, None
+
+    schema = infer_schema_from_stream(
+        first[1], sample_rows=schema_sample_rows, column_types=column_types,
+        dict_max_cardinality=dict_max_cardinality,
+    )
+    return itertools.chain([first], streams), schema
+
+
+def _batch_writer(output_type, output_path, schema, partition_by=None, max_open_writers=None,
+                  prefix=None, max_file_rows=None, max_file_bytes=None, defer_publish=False,
+                  **writer_kwargs):
+    """Open the output_type writer for output_path.
+
+    For Parquet, a PartitionedParquetWriter rooted at output_path when
+    partition_by is given, a RollingParquetWriter when a part size limit
+    is, else an IncrementalParquetWriter. Arrow and ORC output use
+    IncrementalArrowWriter and IncrementalOrcWriter. Single-file writers
+    publish on close unless defer_publish.
+    """
+    if output_type == "arrow":
+        from csvconv.writer.arrow_writer import IncrementalArrowWriter
+
+        writer_kwargs.pop("encoding", None)
+        return IncrementalArrowWriter(output_path, schema, defer_publish=defer_publish,
+                                      **writer_kwargs)
+    if output_type == "orc":
+        from csvconv.writer.orc_writer import IncrementalOrcWriter
+
+        writer_kwargs.pop("encoding", None)
+        return IncrementalOrcWriter(output_path, schema, defer_publish=defer_publish,
+                                    **writer_kwargs)
+    if partition_by:
+        from csvconv.writer.partitioned_writer import DEFAULT_MAX_OPEN_WRITERS, PartitionedParquetWriter
+
+        return PartitionedParquetWriter(
+            output_path, schema, partition_by, prefix=prefix,
+            max_open_writers=max_open_writers or DEFAULT_MAX_OPEN_WRITERS,
+            max_file_rows=max_file_rows, max_file_bytes=max_file_bytes, **writer_kwargs
+        )
+    if max_file_rows or max_file_bytes:
+        from csvconv.writer.parquet_writer import RollingParquetWriter
+
+        return RollingParquetWriter(output_path, schema, max_file_rows=max_file_rows,
+                                    max_file_bytes=max_file_bytes, **writer_kwargs)
+    from csvconv.writer.parquet_writer import IncrementalParquetWriter
+
+    return IncrementalParquetWriter(output_path, schema, defer_publish=defer_publish,
+                                    **writer_kwargs)
+
+
+def _writer_metrics(writer, codec=None):
+    # type: (IncrementalParquetWriter, CodecChoice) -> dict
+    """Per-file metrics for the codec, encodings, partitions and parts written."""
+    metrics = {}
+    if getattr(writer, "remote", False):
+        metrics["output_bytes"] = writer.bytes_written
+    if codec is not None:
+        metrics["codec"] = repr(codec)
+    if getattr(writer, "encodings", None) is not None:
+        metrics["encodings"] = writer.encodings
+        metrics["encoding_saved_bytes"] = writer.encoding_saved_bytes
+    if hasattr(writer, "partitions"):
+        metrics["partitions"] = writer.partitions
+        metrics["output_files"] = len(writer.files)
+        metrics["output_bytes"] = writer.output_bytes
+    if hasattr(writer, "parts"):
+        metrics["parts"] = writer.parts
+        metrics["output_bytes"] = sum(part["bytes"] for part in writer.parts)
+    return metrics
+
+
+def _convert_csv_to_parquet(input_path, output_path, block_size_mb, row_group_size, summary,
+                            output_type="parquet", compression=None, column_types=None, progress=None,
+                            limit_bytes=None, dict_max_cardinality=None, encoding=None,
+                            optimize="balanced", min_throughput_mbps=None,
+                            partition_by=None, max_open_writers=None, part_prefix=None,
+                            max_file_rows=None, max_file_bytes=None, sort_by=None,
+                            global_sort=False, sort_memory_mb=None, s3=None, write_behind=False):
+    """Convert a single CSV file to Parquet (or output_type)."""
+    from csvconv.memory import release_unused
+    from csvconv.reader.csv_reader import read_streaming
+    file_name = os.path.basename(input_path)
+    timer = StageTimer(file_name)
+    memory = MemoryTracker(limit_bytes)
+    rows = 0
+    input_bytes = os.path.getsize(input_path) if os.path.isfile(input_path) else None
+    try:
+        with _open_tracked(input_path, progress, s3=s3) as source:
+            if is_s3_uri(input_path):
+                input_bytes = source.size
+            # Peek the first batch to get the schema, then keep streaming
+            batches = read_streaming(source, block_size_mb=block_size_mb, column_types=column_types,
+                                     dict_max_cardinality=dict_max_cardinality)
+            codec = None
+            if compression == "auto":
+                codec, batches = _autotune_codec(batches, timer, optimize, min_throughput_mbps)
+            first = next(batches, None)
+            timer.lap("read")
+
+            if first is None:
+                logger.warning("Empty CSV file: %s", input_path)
+                summary.record_success(file_name, **file_metrics(timer, rows, input_bytes, memory=memory))
+                return
+
+            with _sorted_input(itertools.chain([first], batches), first.schema, timer, sort_by,
+                               global_sort, sort_memory_mb) as batches, \
+                    _batch_writer(output_type, output_path, first.schema, partition_by,
+                                  max_open_writers,
+                                  prefix=part_prefix or os.path.splitext(file_name)[0],
+                                  max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                                  row_group_size=row_group_size, encoding=encoding,
+                                  sort_by=sort_by, s3=s3, write_behind=write_behind,
+                                  **_codec_kwargs(compression, codec)) as writer:
+                for batch in batches:
+                    timer.lap("read")
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+                    if progress is not None:
+                        progress.add_rows(batch.num_rows)
+                    memory.sample()
+                    timer.lap("write")
+            timer.lap("close")
+
+        summary.record_success(file_name, **file_metrics(timer, rows, input_bytes, output_path, memory,
+                                                         **_writer_metrics(writer, codec)))
         logger.info("Converted: %s -> %s", input_path, output_path)
 
     except Exception as e:
-        summary.record_failure(file_name, str(e))
+        summary.record_failure(file_name, str(e), **file_metrics(timer, rows, input_bytes, memory=memory))
         logger.error("Failed to convert %s: %s", input_path, e)
         raise
 
+    finally:
+        release_unused(file_name)
+
 
 def _convert_targz_to_parquet(input_path, output_path, block_size_mb, row_group_size,
-                               schema_sample_rows, summary):
-    """Convert tar.gz containing CSVs to per-file Parquet.
+                               schema_sample_rows, summary, output_type="parquet",
+                               compression=None, column_types=None, include=None, progress=None,
+                               limit_bytes=None, dict_max_cardinality=None, encoding=None,
+                               optimize="balanced", min_throughput_mbps=None,
+                               partition_by=None, max_open_writers=None, part_prefix=None,
+                               max_file_rows=None, max_file_bytes=None, sort_by=None,
+                               global_sort=False, sort_memory_mb=None,
+                               small_member_bytes=SMALL_MEMBER_BYTES, s3=None,
+                               write_behind=False):
+    """Convert tar.gz containing CSVs to per-file Parquet (or output_type).
 
     For each CSV member in the archive, streams it through csv_reader
     and writes to Parquet using IncrementalParquetWriter. Schema is
     inferred from the first CSV member and enforced on all subsequent files.
-    """
-    members = list_csv_members(input_path)
 
-    if not members:
-        logger.info("No CSV members found in %s", input_path)
+    The archive is decompressed once, members in archive order. Members of
+    at most small_member_bytes are parsed without Arrow's thread pool and
+    their files are published in groups of SMALL_MEMBER_GROUP (see
+    atomic.publish_all); their records are added once the group
+    is published.
+    """
+    from csvconv.memory import release_unused
+    from csvconv.reader.csv_reader import read_streaming
+    from csvconv.schema.validation import validate_batch_schema
+    from csvconv.writer.atomic import publish_all
+
+    streams, schema = _first_member_schema(input_path, include, progress, schema_sample_rows,
+                                           column_types, dict_max_cardinality, s3)
+    if streams is None:
         return
 
-    # Infer schema from first CSV member
-    schema = infer_schema(input_path, members[0], sample_rows=schema_sample_rows)
-
     # Create output directory if needed
-    os.makedirs(output_path, exist_ok=True)
-
-    for member in members:
-        member_basename = os.path.basename(member)
-        out_name = os.path.splitext(member_basename)[0] + ".parquet"
-        out_file = os.path.join(output_path, out_name)
+    if not is_s3_uri(output_path):
+        os.makedirs(output_path, exist_ok=True)
+
+    # With compression="auto" the first member's blocks pick the codec for all
+    codec = None
+    # Partitioned part files are named after the archive and the member
+    archive_prefix = part_prefix or _archive_stem(input_path)
+    # Small members can be grouped only when each is one plain file
+    groupable = not (partition_by or max_file_rows or max_file_bytes or (sort_by and global_sort))
+    # (member name, writer, success record) of small members awaiting publication
+    unpublished = []
+
+    def _publish_group():
+        group = list(unpublished)
+        del unpublished[:]
+        failed = publish_all([writer for _, writer, _ in group])
+        for member_basename, writer, metrics in group:
+            if writer in failed:
+                writer.abort()
+                summary.record_failure(member_basename, str(failed[writer]), **metrics)
+                logger.error("Failed to publish %s: %s", member_basename, failed[writer])
+                continue
+            summary.record_success(member_basename, **metrics)
+            logger.info("Converted: %s -> %s", member_basename, metrics["output"])
 
-        try:
-            stream = open_member_stream(input_path, member)
-            batches = read_streaming(stream, block_size_mb=block_size_mb, schema=schema)
-
-            with IncrementalParquetWriter(out_file, schema, row_group_size=row_group_size) as writer:
-                for batch in batches:
-                    validate_batch_schema(batch, schema)
-                    writer.write_batch(batch)
+    try:
+        for member, stream in streams:
+            member_basename = os.path.basename(member)
+            out_name = os.path.splitext(member_basename)[0] + "." + output_type
+            # Partitioned members all write into the dataset at output_path
+            out_file = output_path if partition_by else os.path.join(output_path, out_name)
+
+            timer = StageTimer(member_basename)
+            memory = MemoryTracker(limit_bytes)
+            rows = 0
+            input_bytes = None
+            try:
+                input_bytes = stream.getbuffer().nbytes
+                timer.lap("decompress")
+                memory.sample()
+                small = (groupable and input_bytes <= small_member_bytes
+                         and (compression != "auto" or codec is not None))
+                batches = read_streaming(stream, block_size_mb=block_size_mb, schema=schema,
+                                         use_threads=not small)
+                if compression == "auto" and codec is None:
+                    codec, batches = _autotune_codec(batches, timer, optimize, min_throughput_mbps)
+
+                with _sorted_input(batches, schema, timer, sort_by, global_sort,
+                                   sort_memory_mb) as batches, \
+                        _batch_writer(output_type, out_file, schema, partition_by,
+                                      max_open_writers,
+                                      prefix=archive_prefix + "-" + os.path.splitext(member_basename)[0],
+                                      max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                                      row_group_size=row_group_size, encoding=encoding,
+                                      sort_by=sort_by, defer_publish=small, s3=s3,
+                                      write_behind=write_behind,
+                                      **_codec_kwargs(compression, codec)) as writer:
+                    for batch in batches:
+                        timer.lap("read")
+                        validate_batch_schema(batch, schema)
+                        timer.lap("validate")
+                        writer.write_batch(batch)
+                        rows += batch.num_rows
+                        if progress is not None:
+                            progress.add_rows(batch.num_rows)
+                        memory.sample()
+                        timer.lap("write")
+                timer.lap("close")
+
+                metrics = file_metrics(timer, rows, input_bytes, out_file, memory,
+                                       **_writer_metrics(writer, codec))
+                if small:
+                    # Closed but not yet published: the temp file has the final size
+                    metrics["output_bytes"] = writer.bytes_written
+                    # Published (and released) with the rest of its group
+                    unpublished.append((member_basename, writer, metrics))
+                    if len(unpublished) >= SMALL_MEMBER_GROUP:
+                        _publish_group()
+                        release_unused(member_basename)
+                    continue
+                summary.record_success(member_basename, **metrics)
+                logger.info("Converted: %s -> %s", member, out_file)
+
+            except Exception as e:
+                summary.record_failure(member_basename, str(e),
+                                       **file_metrics(timer, rows, input_bytes, memory=memory))
+                logger.error("Failed to convert member %s: %s", member, e)
+
+            # Keep RSS flat across members: hand freed buffers back to the OS
+            release_unused(member_basename)
+    finally:
+        if unpublished:
+            _publish_group()
+
+    release_unused(os.path.basename(input_path))
+
+
+def _merged_member_batches(streams, schema, summary, merged, block_size_mb, progress,
+                           memory, timer, small_member_bytes=SMALL_MEMBER_BYTES):
+    """Yield the rows of every member, tagged with SOURCE_FILE_COLUMN.
+
+    Rows are buffered into batches of about MERGE_ROW_GROUP_BYTES. A member
+    that fails before any of its rows were yielded is recorded as failed
+    and skipped; a failure after that raises, since its rows are already
+    in the output. Names of the members merged are appended to merged.
+    """
+    import pyarrow as pa
 
-            summary.record_success(member_basename)
-            logger.info("Converted: %s -> %s", member, out_file)
+    from csvconv.reader.csv_reader import read_streaming
+    from csvconv.schema.validation import validate_batch_schema
 
+    pending = []
+    pending_bytes = 0
+    for member, stream in streams:
+        member_basename = os.path.basename(member)
+        source = pa.array([member])
+        start = len(pending)
+        committed = False
+        try:
+            input_bytes = stream.getbuffer().nbytes
+            merged["input_bytes"] += input_bytes
+            timer.lap("decompress")
+            for batch in read_streaming(stream, block_size_mb=block_size_mb, schema=schema,
+                                        use_threads=input_bytes > small_member_bytes):
+                validate_batch_schema(batch, schema)
+                batch = batch.append_column(SOURCE_FILE_COLUMN, pa.DictionaryArray.from_arrays(
+                    pa.repeat(pa.scalar(0, pa.int32()), batch.num_rows), source
+                ))
+                pending.append(batch)
+                pending_bytes += batch.nbytes
+                merged["rows"] += batch.num_rows
+                if progress is not None:
+                    progress.add_rows(batch.num_rows)
+                memory.sample()
+                timer.lap("read")
+                if pending_bytes >= MERGE_ROW_GROUP_BYTES:
+                    committed = True
+                    table = pa.Table.from_batches(pending).combine_chunks()
+                    pending = []
+                    pending_bytes = 0
+                    for coalesced in table.to_batches():
+                        yield coalesced
         except Exception as e:
+            if committed:
+                raise
+            dropped = pending[start:]
+            del pending[start:]
+            pending_bytes -= sum(batch.nbytes for batch in dropped)
+            merged["rows"] -= sum(batch.num_rows for batch in dropped)
             summary.record_failure(member_basename, str(e))
             logger.error("Failed to convert member %s: %s", member, e)
+            continue
+        merged["members"].append(member)
+    if pending:
+        for coalesced in pa.Table.from_batches(pending).combine_chunks().to_batches():
+            yield coalesced
+
+
+def _convert_targz_merged(input_path, output_path, block_size_mb, row_group_size,
+                          schema_sample_rows, summary, output_type="parquet",
+                          compression=None, column_types=None,
+                          include=None, progress=None, limit_bytes=None,
+                          dict_max_cardinality=None, encoding=None, optimize="balanced",
+                          min_throughput_mbps=None, partition_by=None, max_open_writers=None,
+                          part_prefix=None, max_file_rows=None, max_file_bytes=None,
+                          sort_by=None, global_sort=False, sort_memory_mb=None,
+                          small_member_bytes=SMALL_MEMBER_BYTES, s3=None, write_behind=False):
+    """Convert every CSV member of a tar.gz into one Parquet (or output_type) output.
+
+    The schema is inferred from the first member and enforced on the rest,
+    as in _convert_targz_to_parquet. The archive is recorded as a single
+    file whose "members" lists the members merged into it; members that
+    fail on their own are recorded as failed and left out.
+    """
+    import pyarrow as pa
+
+    from csvconv.memory import release_unused
+    from csvconv.schema.inference import DICTIONARY_TYPE
+
+    streams, schema = _first_member_schema(input_path, include, progress, schema_sample_rows,
+                                           column_types, dict_max_cardinality, s3)
+    if streams is None:
+        return
+    if SOURCE_FILE_COLUMN in schema.names:
+        raise InputValidationError(
+            "Cannot merge: members already have a {} column".format(SOURCE_FILE_COLUMN)
+        )
+    merged_schema = schema.append(pa.field(SOURCE_FILE_COLUMN, DICTIONARY_TYPE))
 
+    archive_name = os.path.basename(input_path)
+    timer = StageTimer(archive_name)
+    memory = MemoryTracker(limit_bytes)
+    merged = {"members": [], "rows": 0, "input_bytes": 0}
+    try:
+        batches = _merged_member_batches(streams, schema, summary, merged, block_size_mb,
+                                         progress, memory, timer, small_member_bytes)
+        codec = None
+        if compression == "auto":
+            codec, batches = _autotune_codec(batches, timer, optimize, min_throughput_mbps)
+
+        with _sorted_input(batches, merged_schema, timer, sort_by, global_sort,
+                           sort_memory_mb) as batches, \
+                _batch_writer(output_type, output_path, merged_schema, partition_by,
+                              max_open_writers,
+                              prefix=part_prefix or _archive_stem(input_path),
+                              max_file_rows=max_file_rows, max_file_bytes=max_file_bytes,
+                              row_group_size=row_group_size, encoding=encoding,
+                              sort_by=sort_by, s3=s3, write_behind=write_behind,
+                              **_codec_kwargs(compression, codec)) as writer:
+            for batch in batches:
+                timer.lap("read")
+                writer.write_batch(batch)
+                memory.sample()
+                timer.lap("write")
+        timer.lap("close")
 
-def _extract_targz_to_csv(input_path, output_path, gzip_compress, summary):
+        summary.record_success(archive_name, **file_metrics(
+            timer, merged["rows"], merged["input_bytes"], output_path, memory,
+            members=merged["members"], **_writer_metrics(writer, codec)
+        ))
+        logger.info("Merged %d member(s): %s -> %s", len(merged["members"]), input_path,
+                    output_path)
+
+    except Exception as e:
+        summary.record_failure(archive_name, str(e), **file_metrics(
+            timer, merged["rows"], merged["input_bytes"], memory=memory
+        ))
+        logger.error("Failed to merge %s: %s", input_path, e)
+
+    finally:
+        release_unused(archive_name)
+
+
+def _extract_targz_to_csv(input_path, output_path, gzip_compress, summary, include=None,
+                          progress=None, limit_bytes=None, max_file_rows=None,
+                          max_file_bytes=None, s3=None, write_behind=False):
     """Extract CSVs from tar.gz to individual CSV files.
 
     Raw byte-fidelity extraction using csv_writer.extract_stream().
-    Each member is validated for path traversal before extraction.
+    Each member is validated for path traversal before extraction. The
+    archive is decompressed once, members in archive order.
     """
-    members = list_csv_members(input_path)
+    from csvconv.writer.csv_writer import extract_stream, extract_stream_rolling
 
     # Create output directory if needed
     os.makedirs(output_path, exist_ok=True)
 
-    for member in members:
+    for member, stream in iter_csv_members(input_path, include=include, progress=progress, s3=s3):
         member_basename = os.path.basename(member)
+        timer = StageTimer(member_basename)
+        memory = MemoryTracker(limit_bytes, arrow=False)
+        input_bytes = None
 
         try:
             # Security check: validate path is safe
@@ -144,13 +826,26 @@ def _extract_targz_to_csv(input_path, output_path, gzip_compress, summary):
                 out_name = out_name + ".gz"
             out_file = os.path.join(output_path, out_name)
 
-            # Extract raw bytes
-            stream = extract_member_stream(input_path, member)
-            extract_stream(stream, out_file, gzip_compress=gzip_compress)
-
-            summary.record_success(member_basename)
+            input_bytes = stream.getbuffer().nbytes
+            timer.lap("decompress")
+            memory.sample()
+            extra = {}
+            if max_file_rows or max_file_bytes:
+                parts = extract_stream_rolling(stream, out_file, gzip_compress=gzip_compress,
+                                               max_file_rows=max_file_rows,
+                                               max_file_bytes=max_file_bytes,
+                                               write_behind=write_behind)
+                extra = {"parts": parts, "output_bytes": sum(part["bytes"] for part in parts)}
+            else:
+                extract_stream(stream, out_file, gzip_compress=gzip_compress,
+                               write_behind=write_behind)
+            timer.lap("write")
+
+            summary.record_success(member_basename, **file_metrics(timer, None, input_bytes, out_file,
+                                                                   memory, **extra))
             logger.info("Extracted: %s -> %s", member, out_file)
 
         except Exception as e:
-            summary.record_failure(member_basename, str(e))
+            summary.record_failure(member_basename, str(e),
+                                   **file_metrics(timer, None, input_bytes, memory=memory))
             logger.error("Failed to extract member %s: %s", member, e)
@@ -0,0 +1,267 @@
+"""Warm worker daemon and thin client over a Unix domain socket.
+
+``csvconv serve --socket PATH`` keeps a pool of worker processes that have
+already imported PyArrow and the readers/writers, so a request costs only the
+conversion itself. ``csvconv --connect PATH ...`` parses its arguments
+locally (argument errors behave exactly like the one-shot CLI), submits them
+and replays the worker's log records and summary, returning the same exit
+code the one-shot CLI would.
+
+Protocol: one newline-delimited JSON request per connection,
+``{"op": "convert", "args": {...}}`` or ``{"op": "ping"}``, answered by a
+single JSON line ``{"exit_code": int, "summary": dict, "error": str|null,
+"logs": [...]}``; error is the message of a whole-conversion failure.
+Directory/glob requests run inside one warm worker, sequentially.
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+from typing import Optional  # noqa: F401
+
+from csvconv.errors import CsvconvError
+from csvconv.s3 import is_s3_uri
+from csvconv.summary import ConversionSummary
+
+logger = logging.getLogger("csvconv")
+
+_MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def warm_worker():
+    # type: () -> None
+    """Pool initializer: pay the PyArrow and writer import cost once."""
+    import csvconv.converter  # noqa: F401
+    import csvconv.reader.csv_reader  # noqa: F401
+    import csvconv.schema.inference  # noqa: F401
+    import csvconv.writer.csv_writer  # noqa: F401
+    import csvconv.writer.parquet_writer  # noqa: F401
+
+
+class _RecordingHandler(logging.Handler):
+    """Collect (levelno, message) pairs for replay in the client."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []  # type: list
+
+    def emit(self, record):
+        self.records.append([record.levelno, record.getMessage()])
+
+
+def execute_request(args_dict, server_workers=1, cpu_budget=None):
+    # type: (dict, int, Optional[int]) -> dict
+    """Run one conversion in a worker and return the response payload.
+
+    Mirrors cli.main(): a whole-conversion failure is logged as
+    "Conversion failed: ..." and yields exit code 1, its message as
+    "error" and the summary of whatever was converted before it.
+    The Arrow CPU threads are planned for server_workers concurrent
+    requests sharing cpu_budget cores (see threads.plan_threads).
+    """
+    from csvconv import cli
+    from csvconv.threads import plan_threads
+
+    args = argparse.Namespace(**args_dict)
+    # The daemon's budget replaces the client's: it is shared by all warm workers
+    args.threads = plan_threads(server_workers, args.threads, cpu_budget)
+    args.cpu_budget = cpu_budget
+    args.workers = 1
+
+    log = logging.getLogger("csvconv")
+    saved_handlers, saved_level = log.handlers[:], log.level
+    handler = _RecordingHandler()
+    log.handlers[:] = [handler]
+    log.setLevel(args.log_level)
+    summary = ConversionSummary()
+    error = None
+    try:
+        try:
+            exit_code, _ = cli.run_conversion(args, summary=summary)
+        except Exception as e:
+            log.error("Conversion failed: %s", e)
+            exit_code, error = 1, str(e)
+    finally:
+        log.handlers[:] = saved_handlers
+        log.setLevel(saved_level)
+
+    return {
+        "exit_code": exit_code,
+        "summary": summary.to_dict(),
+        "error": error,
+        "logs": handler.records,
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(_MAX_REQUEST_BYTES)
+        if not line:
+            return  # liveness probe or client gone
+        try:
+            request = json.loads(line.decode("utf-8"))
+            op = request.get("op", "convert")
+            if op == "ping":
+                response = {"ok": True}
+            elif op == "convert":
+                response = self.server.run(request["args"])
+            else:
+                raise ValueError("unknown op: {}".format(op))
+        except Exception as e:
+            logger.error("Bad request: %s", e)
+            response = {
+                "exit_code": 1,
+                "summary": ConversionSummary().to_dict(),
+                "error": str(e),
+                "logs": [[logging.ERROR, "Conversion failed: {}".format(e)]],
+            }
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        except OSError as e:
+            logger.warning("Client disconnected before the response was sent: %s", e)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that dispatches conversions to a warm process pool."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, workers=None, cpu_budget=None):
+        # type: (str, Optional[int], Optional[int]) -> None
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.cpu_budget = cpu_budget
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        # Workers start lazily; force them up now so the first requests are warm too
+        for _ in range(self.workers):
+            executor.submit(os.getpid)
+        return executor
+
+    def run(self, args_dict):
+        # type: (dict) -> dict
+        """Execute one conversion request on the pool."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._lock:
+            executor = self._executor
+        try:
+            return executor.submit(execute_request, args_dict, self.workers, self.cpu_budget).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool for later requests
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = self._new_executor()
+            raise
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def _remove_stale_socket(socket_path):
+    # type: (str) -> None
+    """Unlink a leftover socket file, refusing if a daemon still answers on it."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise CsvconvError("A csvconv daemon is already listening on {}".format(socket_path))
+    finally:
+        probe.close()
+
+
+def serve(socket_path, workers=None, cpu_budget=None):
+    # type: (str, Optional[int], Optional[int]) -> None
+    """Run the daemon until SIGINT or SIGTERM."""
+    server = DaemonServer(socket_path, workers=workers, cpu_budget=cpu_budget)
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    logger.info("csvconv daemon listening on %s with %d warm worker(s)", socket_path, server.workers)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        logger.info("csvconv daemon stopped")
+
+
+def request(socket_path, payload, timeout=None):
+    # type: (str, dict, Optional[float]) -> dict
+    """Send one request to the daemon and return the decoded response."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise CsvconvError("Cannot connect to csvconv daemon at {}: {}".format(socket_path, e))
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise CsvconvError("csvconv daemon closed the connection without a response")
+    return json.loads(line.decode("utf-8"))
+
+
+def submit(socket_path, args, summary=None):
+    # type: (str, argparse.Namespace, Optional[ConversionSummary]) -> tuple
+    """Thin client: run a parsed one-shot CLI invocation on the daemon.
+
+    Relative paths are resolved against the client's working directory;
+    ``s3://`` URIs are passed through.
+    Log records are replayed through the local csvconv logger and the
+    summary report is printed unless the conversion failed as a whole,
+    exactly as the one-shot CLI would. If summary is given, the remote
+    results are merged into it.
+
+    Returns:
+        (exit code, error message of a whole-conversion failure or None)
+        of the remote conversion.
+    """
+    args_dict = dict(vars(args))
+    args_dict.pop("connect", None)
+    # Reports are written by the client, not the daemon
+    args_dict.pop("summary_json", None)
+    args_dict.pop("metrics_textfile", None)
+    # Progress is not streamed back; the worker must not draw on its own stderr
+    args_dict["progress"] = False
+    if not is_s3_uri(args_dict["input"]):
+        args_dict["input"] = os.path.abspath(args_dict["input"])
+    if not is_s3_uri(args_dict["output"]):
+        args_dict["output"] = os.path.abspath(args_dict["output"])
+
+    response = request(socket_path, {"op": "convert", "args": args_dict})
+    for levelno, message in response.get("logs", []):
+        logger.log(levelno, "%s", message)
+    remote = ConversionSummary.from_dict(response["summary"])
+    if summary is not None:
+        summary.merge(remote)
+    error = response.get("error")
+    if error is None:
+        print(remote.get_report())
+    return int(response["exit_code"]), error
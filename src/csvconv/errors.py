@@ -45,3 +45,9 @@ class MemberNotFoundError(InputError):
     """Error when a tar.gz member is not found."""
 
     pass
+
+
+class MemoryLimitError(CsvconvError):
+    """Error when a conversion exceeds the configured memory ceiling."""
+
+    pass
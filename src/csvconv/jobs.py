@@ -0,0 +1,292 @@
+"""Declarative batch job files executed on the shared worker pool.
+
+A job file lists conversion specs that all run in one process tree::
+
+    {
+      "workers": 4,
+      "memory_budget_mb": 4096,
+      "cpu_budget": 16,
+      "defaults": {"output_type": "parquet", "compression": "zstd"},
+      "jobs": [
+        {"name": "sales", "input": "/data/sales.tar.gz", "output": "/out/sales",
+         "column_types": {"id": "int64"}, "include": ["2024-*.csv"]},
+        {"input": "/data/daily/*.csv", "output": "/out/daily", "max_concurrency": 2}
+      ]
+    }
+
+JSON, YAML (requires PyYAML) and TOML (``[[jobs]]`` tables) are accepted. A
+bare list is treated as the "jobs" entry. Each job maps onto convert()
+keyword arguments; directory and glob inputs expand to one task per file.
+"max_concurrency" caps how many of a job's tasks run at once, so one large
+job cannot take every worker.
+"""
+
+import json
+import logging
+import os
+from typing import Optional  # noqa: F401
+
+from csvconv import parallel
+from csvconv.errors import InputValidationError
+from csvconv.summary import ConversionSummary
+from csvconv.threads import plan_threads
+
+logger = logging.getLogger("csvconv")
+
+_JOB_KEYS = {
+    "name",
+    "input",
+    "output",
+    "input_type",
+    "output_type",
+    "block_size_mb",
+    "row_group_size",
+    "schema_sample_rows",
+    "gzip",
+    "compression",
+    "column_types",
+    "include",
+    "max_memory_mb",
+    "memory_pool",
+    "threads",
+    "io_threads",
+    "dict_encode",
+    "dict_max_cardinality",
+    "encoding",
+    "optimize",
+    "min_throughput_mbps",
+    "partition_by",
+    "max_open_writers",
+    "max_file_rows",
+    "max_file_bytes",
+    "sort_by",
+    "global_sort",
+    "sort_memory_mb",
+    "merge",
+    "small_member_bytes",
+    "s3_endpoint",
+    "s3_part_size_mb",
+    "s3_upload_threads",
+    "s3_read_ahead_mb",
+    "read_ahead_depth",
+    "write_behind",
+    "max_concurrency",
+}
+
+_KEY_ALIASES = {
+    "types": "column_types",
+    "schema": "column_types",
+    "codec": "compression",
+    "filters": "include",
+}
+
+_POSITIVE_KEYS = (
+    "block_size_mb",
+    "row_group_size",
+    "schema_sample_rows",
+    "max_memory_mb",
+    "threads",
+    "io_threads",
+    "dict_max_cardinality",
+    "min_throughput_mbps",
+    "max_open_writers",
+    "max_file_rows",
+    "max_file_bytes",
+    "sort_memory_mb",
+    "s3_part_size_mb",
+    "s3_upload_threads",
+    "s3_read_ahead_mb",
+    "max_concurrency",
+)
+
+
+def load_job_file(path):
+    # type: (str) -> dict
+    """Parse a JSON, YAML or TOML job file.
+
+    Returns:
+        Dict with a "jobs" list and optional "workers", "memory_budget_mb"
+        and "defaults" entries.
+
+    Raises:
+        InputValidationError: If the file is missing, malformed or of an
+                              unsupported type.
+    """
+    if not os.path.isfile(path):
+        raise InputValidationError("Job file does not exist: {}".format(path))
+
+    lower = path.lower()
+    try:
+        if lower.endswith(".json"):
+            with open(path, "r") as f:
+                data = json.load(f)
+        elif lower.endswith(".yaml") or lower.endswith(".yml"):
+            data = _load_yaml(path)
+        elif lower.endswith(".toml"):
+            data = _load_toml(path)
+        else:
+            raise InputValidationError("Unsupported job file type: {}. Allowed: .json, .yaml, .yml, .toml".format(path))
+    except InputValidationError:
+        raise
+    except Exception as e:
+        raise InputValidationError("Cannot parse job file {}: {}".format(path, e))
+
+    if isinstance(data, list):
+        data = {"jobs": data}
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise InputValidationError("Job file must contain a list of jobs: {}".format(path))
+    return data
+
+
+def _load_yaml(path):
+    try:
+        import yaml
+    except ImportError:
+        raise InputValidationError("YAML job files require PyYAML to be installed")
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def _load_toml(path):
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise InputValidationError("TOML job files require Python 3.11+ or tomli")
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def _job_kwargs(job, defaults):
+    # type: (dict, dict) -> dict
+    """Merge a job with the file defaults and map it onto convert() kwargs."""
+    if not isinstance(job, dict):
+        raise InputValidationError("Job must be a mapping, got {}".format(type(job).__name__))
+
+    spec = {}
+    for source in (defaults, job):
+        for key, value in source.items():
+            key = _KEY_ALIASES.get(key, key)
+            if key not in _JOB_KEYS:
+                raise InputValidationError("Unknown job option: {}".format(key))
+            spec[key] = value
+
+    for key in ("input", "output"):
+        if not spec.get(key):
+            raise InputValidationError("Job is missing required option: {}".format(key))
+    for key in _POSITIVE_KEYS:
+        value = spec.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            raise InputValidationError("Job option {} must be > 0, got {!r}".format(key, value))
+    if isinstance(spec.get("include"), str):
+        spec["include"] = [spec["include"]]
+    for key in ("partition_by", "sort_by"):
+        if isinstance(spec.get(key), str):
+            spec[key] = [name.strip() for name in spec[key].split(",")]
+
+    spec.pop("name", None)
+    kwargs = {
+        "input_path": spec.pop("input"),
+        "output_path": spec.pop("output"),
+    }
+    kwargs.update(spec)
+    return kwargs
+
+
+def _job_tasks(kwargs, group):
+    # type: (dict, str) -> list
+    """Expand one job into pool tasks."""
+    input_path = kwargs["input_path"]
+    if parallel.is_multi_input(input_path):
+        kwargs = dict(kwargs)
+        return parallel.build_tasks(
+            input_path=kwargs.pop("input_path"), output_path=kwargs.pop("output_path"), group=group, **kwargs
+        )
+
+    kwargs = dict(kwargs)
+    if not kwargs.get("input_type"):
+        kwargs["input_type"] = parallel.detect_input_type(input_path)
+    return [parallel.make_task(kwargs, group=group)]
+
+
+def run_jobs(job_file, workers=None, memory_budget_mb=None, cpu_budget=None):
+    # type: (str, Optional[int], Optional[float], Optional[int]) -> tuple
+    """Execute every job in a job file on one worker pool.
+
+    A job that is invalid or whose files fail to convert is recorded as
+    failed without affecting the other jobs.
+
+    Args:
+        job_file: Path to the JSON/YAML/TOML job file.
+        workers: Worker processes; overrides the file's "workers" entry.
+        memory_budget_mb: Shared memory budget; overrides the file's entry.
+        cpu_budget: Total cores for Arrow threads across workers; overrides
+                    the file's "cpu_budget" entry.
+
+    Returns:
+        (summary, job_summaries): the merged ConversionSummary and a dict of
+        per-job ConversionSummary in job-file order.
+    """
+    data = load_job_file(job_file)
+    defaults = data.get("defaults") or {}
+    if workers is None:
+        workers = int(data.get("workers", 1))
+    if memory_budget_mb is None:
+        memory_budget_mb = data.get("memory_budget_mb")
+    if cpu_budget is None:
+        cpu_budget = data.get("cpu_budget")
+
+    summary = ConversionSummary()
+    job_summaries = {}
+    group_limits = {}
+    tasks = []
+    for index, job in enumerate(data["jobs"]):
+        name = "job-{}".format(index + 1)
+        if isinstance(job, dict) and job.get("name"):
+            name = str(job["name"])
+        if name in job_summaries:
+            name = "{}-{}".format(name, index + 1)
+        job_summaries[name] = ConversionSummary()
+        try:
+            kwargs = _job_kwargs(job, defaults)
+            max_concurrency = kwargs.pop("max_concurrency", None)
+            if max_concurrency is not None:
+                group_limits[name] = int(max_concurrency)
+            kwargs["threads"] = plan_threads(workers, kwargs.get("threads"), cpu_budget)
+            tasks.extend(_job_tasks(kwargs, group=name))
+        except Exception as e:
+            job_summaries[name].record_failure(name, str(e))
+            summary.record_failure(name, str(e))
+            logger.error("Invalid job %s: %s", name, e)
+
+    logger.info("Running %d task(s) from %d job(s) on %d worker(s)", len(tasks), len(job_summaries), workers)
+
+    def _on_result(task, result):
+        job_summaries[task.group].merge(result)
+
+    summary.merge(
+        parallel.run_tasks(
+            tasks,
+            workers=workers,
+            memory_budget_mb=memory_budget_mb,
+            on_result=_on_result,
+            group_limits=group_limits,
+        )
+    )
+    return summary, job_summaries
+
+
+def format_job_report(job_summaries):
+    # type: (dict) -> str
+    """Format a per-job status block to print before the merged report."""
+    lines = ["Job Summary", "=" * 40]
+    for name, job_summary in job_summaries.items():
+        status = "FAILED" if job_summary.total_failure else "OK"
+        lines.append(
+            "  - {}: {} ({} success, {} failure)".format(
+                name, status, job_summary.total_success, job_summary.total_failure
+            )
+        )
+    return "\n".join(lines)
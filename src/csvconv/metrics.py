@@ -0,0 +1,159 @@
+"""Lightweight per-file metrics collection."""
+
+import os
+import sys
+import time
+from typing import Any, Optional  # noqa: F401
+
+from csvconv import tracing
+from csvconv.errors import MemoryLimitError
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class StageTimer:
+    """Accumulate wall-clock time per pipeline stage.
+
+    lap(stage) charges the time since the previous lap (or construction) to
+    stage. It costs one perf_counter() call and a dict update, so it can be
+    called per batch on the hot path. While tracing is recording, each lap
+    is also recorded as a span; name labels the span of the whole file.
+    """
+
+    def __init__(self, name=None):
+        # type: (Optional[str]) -> None
+        self.name = name
+        self._start = time.perf_counter()
+        self._mark = self._start
+        self.stages = {}  # type: dict
+
+    def lap(self, stage):
+        # type: (str) -> None
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._mark)
+        if tracing.recording:
+            tracing.complete(stage, self._mark, now)
+        self._mark = now
+
+    @property
+    def elapsed(self):
+        # type: () -> float
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self._start
+
+    def as_dict(self):
+        # type: () -> dict
+        return {stage: round(seconds, 6) for stage, seconds in self.stages.items()}
+
+
+class MemoryTracker:
+    """Track peak process RSS and Arrow memory pool usage for one file.
+
+    sample() is called at batch boundaries, where a batch and the writer's
+    buffers are both alive. It costs one small /proc read and a pool counter
+    lookup, which is negligible next to reading and writing a block.
+
+    Args:
+        limit_bytes: Optional RSS ceiling; sample() raises MemoryLimitError
+                     once it is exceeded.
+        arrow: Also track the Arrow default memory pool. Pipelines that do
+               not load PyArrow (raw extraction) pass False.
+    """
+
+    def __init__(self, limit_bytes=None, arrow=True):
+        # type: (Optional[int], bool) -> None
+        self.limit_bytes = limit_bytes
+        self.rss_peak = 0
+        self.arrow_peak = None
+        self._pool = None
+        if arrow:
+            import pyarrow as pa
+
+            self.arrow_peak = 0
+            self._pool = pa.default_memory_pool()
+        self._update()
+
+    def _update(self):
+        # type: () -> int
+        rss = current_rss_bytes()
+        self.rss_peak = max(self.rss_peak, rss)
+        if self._pool is not None:
+            self.arrow_peak = max(self.arrow_peak, self._pool.bytes_allocated())
+        return rss
+
+    def sample(self):
+        # type: () -> None
+        """Update the peaks and enforce the ceiling."""
+        rss = self._update()
+        if self.limit_bytes is not None and rss > self.limit_bytes:
+            raise MemoryLimitError(
+                "RSS {:.1f} MB exceeds the {:.1f} MB memory ceiling".format(
+                    rss / 1048576.0, self.limit_bytes / 1048576.0
+                )
+            )
+
+    def as_dict(self):
+        # type: () -> dict
+        result = {"rss_peak_bytes": self.rss_peak}
+        if self.arrow_peak is not None:
+            result["arrow_pool_peak_bytes"] = self.arrow_peak
+        return result
+
+
+def file_metrics(timer, rows=None, input_bytes=None, output_path=None, memory=None, **extra):
+    # type: (StageTimer, Optional[int], Optional[int], Optional[str], Optional[MemoryTracker], **Any) -> dict
+    """Build the metrics recorded with a file in ConversionSummary.
+
+    extra entries (e.g. the writer's chosen encodings) are recorded as-is.
+    """
+    metrics = {
+        "duration_s": round(timer.elapsed, 6),
+        "stages": timer.as_dict(),
+    }
+    if rows is not None:
+        metrics["rows"] = rows
+    if input_bytes is not None:
+        metrics["input_bytes"] = input_bytes
+    if output_path is not None:
+        metrics["output"] = output_path
+        if os.path.isfile(output_path):
+            metrics["output_bytes"] = os.path.getsize(output_path)
+    if memory is not None:
+        metrics.update(memory.as_dict())
+    metrics.update(extra)
+    if tracing.recording and timer.name:
+        args = {k: v for k, v in metrics.items() if k != "stages"}
+        tracing.complete(timer.name, timer._start, time.perf_counter(), cat="file", args=args)
+    return metrics
+
+
+def current_rss_bytes():
+    # type: () -> int
+    """Current resident set size in bytes.
+
+    Read from /proc/self/statm on Linux; elsewhere the peak so far is the
+    best cheap approximation.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    # type: () -> int
+    """Peak resident set size of this process and its reaped children, in bytes."""
+    if resource is None:
+        return 0
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,325 @@
+"""Multi-input expansion and process-pool scheduling."""
+
+import glob
+import logging
+import os
+from collections import Counter, deque
+from typing import Callable, Optional  # noqa: F401
+
+from csvconv import tracing
+from csvconv.errors import InputValidationError
+from csvconv.s3 import is_s3_uri
+from csvconv.security import ALLOWED_INPUT_EXTENSIONS
+from csvconv.summary import ConversionSummary
+
+logger = logging.getLogger("csvconv")
+
+# Rough per-worker memory model used for admission against the budget:
+# interpreter + pyarrow baseline, plus a multiple of the CSV block size
+# (raw block, decoded RecordBatch and writer buffers).
+_WORKER_BASE_MB = 64
+_BLOCK_MEMORY_FACTOR = 4
+
+
+def detect_input_type(path):
+    # type: (str) -> str
+    """Return "tar.gz" for .tar.gz/.tgz paths and "csv" otherwise."""
+    lower = path.lower()
+    if lower.endswith(".tar.gz") or lower.endswith(".tgz"):
+        return "tar.gz"
+    return "csv"
+
+
+def is_multi_input(path):
+    # type: (str) -> bool
+    """Return True if path is a directory or a glob pattern rather than a file."""
+    if os.path.isdir(path):
+        return True
+    return glob.has_magic(path) and not os.path.isfile(path)
+
+
+def has_input_extension(path):
+    # type: (str) -> bool
+    """Return True if path ends with an allowed input extension."""
+    lower = path.lower()
+    return any(lower.endswith(ext) for ext in ALLOWED_INPUT_EXTENSIONS)
+
+
+def expand_inputs(path):
+    # type: (str) -> list
+    """Expand a directory or glob pattern into a sorted list of input files.
+
+    Directories are walked recursively. Only files with an allowed input
+    extension (.csv, .tar.gz, .tgz) are returned.
+
+    Raises:
+        InputValidationError: If nothing matches.
+    """
+    if os.path.isdir(path):
+        candidates = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in files:
+                candidates.append(os.path.join(root, name))
+    else:
+        candidates = []
+        for match in glob.glob(path, recursive=True):
+            if os.path.isdir(match):
+                candidates.extend(expand_inputs(match))
+            else:
+                candidates.append(match)
+
+    files = sorted(set(p for p in candidates if os.path.isfile(p) and has_input_extension(p)))
+    if not files:
+        raise InputValidationError("No input files matched: {}".format(path))
+    return files
+
+
+def _strip_input_extension(path):
+    # type: (str) -> str
+    lower = path.lower()
+    for ext in (".tar.gz", ".tgz", ".csv"):
+        if lower.endswith(ext):
+            return path[: -len(ext)]
+    return path
+
+
+def output_path_for(input_path, output_dir, input_type, output_type, base_dir=None, merge=False):
+    # type: (str, str, str, str, Optional[str], bool) -> str
+    """Map an input file to its output location inside output_dir.
+
+    CSV inputs map to a single file; archives map to a directory named after
+    the archive, or with merge (columnar output) to a single file. The input's
+    path relative to base_dir is mirrored so that equal basenames from
+    different directories do not collide.
+    """
+    if base_dir is None:
+        rel = os.path.basename(input_path)
+    else:
+        rel = os.path.relpath(input_path, base_dir)
+    stem = _strip_input_extension(rel)
+    if input_type == "csv" or (merge and output_type != "csv"):
+        return os.path.join(output_dir, stem + "." + output_type)
+    return os.path.join(output_dir, stem)
+
+
+def estimate_memory_mb(block_size_mb):
+    # type: (float) -> float
+    """Estimate the peak memory of one conversion task in MB."""
+    return _WORKER_BASE_MB + block_size_mb * _BLOCK_MEMORY_FACTOR
+
+
+class ConversionTask:
+    """One unit of work for the pool: keyword arguments for convert().
+
+    Attributes:
+        name: Label used in the summary if the task fails as a whole.
+        kwargs: Keyword arguments passed to csvconv.converter.convert().
+        size_bytes: Input size, used for largest-first ordering.
+        memory_mb: Estimated peak memory, charged against the pool budget.
+        group: Optional label of the batch job the task belongs to.
+    """
+
+    def __init__(self, name, kwargs, size_bytes=0, memory_mb=0.0, group=None):
+        # type: (str, dict, int, float, Optional[str]) -> None
+        self.name = name
+        self.kwargs = kwargs
+        self.size_bytes = size_bytes
+        self.memory_mb = memory_mb
+        self.group = group
+
+
+def make_task(kwargs, group=None):
+    # type: (dict, Optional[str]) -> ConversionTask
+    """Build a ConversionTask for a single input file from convert() kwargs."""
+    input_path = kwargs["input_path"]
+    try:
+        size_bytes = os.path.getsize(input_path)
+    except OSError:
+        size_bytes = 0
+    return ConversionTask(
+        name=os.path.basename(input_path),
+        kwargs=kwargs,
+        size_bytes=size_bytes,
+        memory_mb=estimate_memory_mb(kwargs.get("block_size_mb", 1)),
+        group=group,
+    )
+
+
+def build_tasks(
+    input_path,  # type: str
+    output_path,  # type: str
+    input_type=None,  # type: Optional[str]
+    output_type="parquet",  # type: str
+    block_size_mb=1,  # type: float
+    group=None,  # type: Optional[str]
+    **convert_kwargs,
+):
+    # type: (...) -> list
+    """Expand a directory/glob input into one ConversionTask per file.
+
+    Args:
+        input_path: Directory or glob pattern.
+        output_path: Output directory; created if missing.
+        input_type: Force "csv" or "tar.gz" for every file; auto-detected
+                    per file when None.
+        output_type: "parquet", "arrow", "orc" or "csv".
+        block_size_mb: CSV block size, also used for the memory estimate.
+        group: Optional batch job label attached to every task.
+        **convert_kwargs: Remaining options forwarded to convert().
+    """
+    files = expand_inputs(input_path)
+    if os.path.isdir(input_path):
+        base_dir = os.path.abspath(input_path)
+    else:
+        base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+
+    tasks = []
+    for path in files:
+        file_type = input_type or detect_input_type(path)
+        out = output_path_for(
+            os.path.abspath(path),
+            output_path,
+            file_type,
+            output_type,
+            base_dir=base_dir,
+            merge=convert_kwargs.get("merge", False),
+        )
+        kwargs = dict(convert_kwargs)
+        if convert_kwargs.get("partition_by") and output_type == "parquet":
+            # Every file adds its rows to the one dataset at output_path;
+            # part files are prefixed with the mirrored input path instead
+            kwargs["part_prefix"] = _strip_input_extension(os.path.relpath(os.path.abspath(path), base_dir)).replace(
+                os.sep, "_"
+            )
+            out = output_path
+        kwargs.update(
+            input_path=path,
+            output_path=out,
+            input_type=file_type,
+            output_type=output_type,
+            block_size_mb=block_size_mb,
+        )
+        tasks.append(make_task(kwargs, group=group))
+    return tasks
+
+
+def run_task(task):
+    # type: (ConversionTask) -> ConversionSummary
+    """Run one task and return its summary; never raises."""
+    from csvconv.converter import convert
+
+    summary = ConversionSummary()
+    try:
+        out_dir = os.path.dirname(task.kwargs["output_path"])
+        if out_dir and not is_s3_uri(out_dir):
+            os.makedirs(out_dir, exist_ok=True)
+        summary.merge(convert(**task.kwargs))
+    except Exception as e:
+        summary.record_failure(task.name, str(e))
+        logger.error("Failed to convert %s: %s", task.kwargs.get("input_path", task.name), e)
+    return summary
+
+
+def _run_traced_task(task):
+    # type: (ConversionTask) -> tuple
+    """Pool entry point while tracing: return (summary, trace events)."""
+    tracing.start()
+    try:
+        result = run_task(task)
+    finally:
+        events = tracing.stop()
+    return result, events
+
+
+def run_tasks(tasks, workers=1, memory_budget_mb=None, on_result=None, group_limits=None):
+    # type: (list, int, Optional[float], Optional[Callable], Optional[dict]) -> ConversionSummary
+    """Run tasks largest-first (LPT) on a process pool under a memory budget.
+
+    Tasks are dispatched in descending size order. A task is only started
+    while the sum of memory estimates of running tasks stays within
+    memory_budget_mb; the first task is always admitted so a single
+    oversized task cannot stall the pool. Tasks of a group already running
+    its limit of tasks are passed over for the next ones in order.
+
+    Args:
+        tasks: List of ConversionTask.
+        workers: Maximum number of worker processes. 1 runs in-process.
+        memory_budget_mb: Shared memory budget in MB, or None for unbounded.
+        on_result: Optional callback(task, summary) invoked as each task
+                   finishes, in completion order.
+        group_limits: Optional {group: max concurrent tasks}; groups not
+                      listed are only bound by workers.
+
+    While tracing is recording, workers record too and their events are
+    merged into this process's trace. If a worker dies (e.g. OOM-killed),
+    the tasks in flight on the pool are recorded as failed and the
+    remaining tasks run on a new pool.
+
+    Returns:
+        ConversionSummary aggregated over all tasks.
+    """
+    ordered = deque(sorted(tasks, key=lambda t: t.size_bytes, reverse=True))
+    summary = ConversionSummary()
+
+    if workers <= 1 or len(ordered) <= 1:
+        for task in ordered:
+            _collect(summary, task, run_task(task), on_result)
+        return summary
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    traced = tracing.recording
+    group_limits = group_limits or {}
+    running = {}  # type: dict
+    running_groups = Counter()  # type: Counter
+    reserved_mb = 0.0
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while ordered or running:
+            while ordered and len(running) < workers:
+                task = next((t for t in ordered if running_groups[t.group] < group_limits.get(t.group, workers)), None)
+                if task is None:
+                    break
+                if running and memory_budget_mb is not None and reserved_mb + task.memory_mb > memory_budget_mb:
+                    break
+                try:
+                    future = pool.submit(_run_traced_task if traced else run_task, task)
+                except BrokenProcessPool:
+                    # A worker died; its running tasks fail below, the rest go to a new pool
+                    logger.error("Worker pool broken; starting a new one")
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+                    continue
+                ordered.remove(task)
+                running[future] = task
+                running_groups[task.group] += 1
+                reserved_mb += task.memory_mb
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                running_groups[task.group] -= 1
+                reserved_mb -= task.memory_mb
+                try:
+                    result = future.result()
+                    if traced:
+                        result, events = result
+                        tracing.add_events(events)
+                except Exception as e:
+                    result = ConversionSummary()
+                    result.record_failure(task.name, str(e))
+                    logger.error("Worker failed on %s: %s", task.name, e)
+                _collect(summary, task, result, on_result)
+    finally:
+        pool.shutdown(wait=True)
+
+    return summary
+
+
+def _collect(summary, task, result, on_result):
+    # type: (ConversionSummary, ConversionTask, ConversionSummary, Optional[Callable]) -> None
+    summary.merge(result)
+    if on_result is not None:
+        on_result(task, result)
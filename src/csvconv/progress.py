@@ -0,0 +1,148 @@
+"""Throttled progress reporting with throughput and ETA.
+
+Progress is measured in bytes consumed from the input file on disk: for a
+tar.gz that is the compressed position, which is known up front (the file
+size) and cheap to observe even while a member is being streamed. The
+pipelines only register the file being read and bump a row counter; a side
+thread samples the file offset with lseek() and renders the output, so no
+formatting or I/O happens on the conversion path.
+
+On a TTY the line is redrawn in place every TTY_INTERVAL seconds; otherwise a
+full line is written every LINE_INTERVAL seconds, suitable for log files.
+Output goes to stderr so stdout keeps only the logs and the summary report.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+
+TTY_INTERVAL = 0.5
+LINE_INTERVAL = 10.0
+
+_MB = 1024.0 * 1024.0
+
+
+def format_eta(seconds):
+    # type: (float) -> str
+    """Format seconds as H:MM:SS, or --:--:-- when unknown."""
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(round(seconds))
+    return "{}:{:02d}:{:02d}".format(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+class ProgressReporter:
+    """Report bytes, rows, throughput and ETA from a side thread.
+
+    Args:
+        total_bytes: Total input bytes on disk (compressed size for tar.gz).
+        stream: Output stream (default: sys.stderr).
+        interval: Seconds between updates (default: TTY_INTERVAL on a TTY,
+                  LINE_INTERVAL otherwise).
+
+    Use as a context manager around the conversion. Inputs read by this
+    process are registered with tracking(); inputs converted elsewhere (e.g.
+    by pool workers) are accounted for with finish_input().
+    """
+
+    def __init__(self, total_bytes, stream=None, interval=None):
+        self.total_bytes = total_bytes
+        self.rows = 0
+        self._stream = stream if stream is not None else sys.stderr
+        self._tty = bool(getattr(self._stream, "isatty", lambda: False)())
+        if interval is None:
+            interval = TTY_INTERVAL if self._tty else LINE_INTERVAL
+        self.interval = interval
+        self._done_bytes = 0
+        self._position = 0
+        self._fd = None
+        self._started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_rows(self, count):
+        # type: (int) -> None
+        """Count rows written by this process."""
+        self.rows += count
+
+    @contextlib.contextmanager
+    def tracking(self, fileobj):
+        """Sample the read offset of fileobj while the block runs.
+
+        Offsets only ever move progress forward, so an input that is read
+        again from the start (one tar member after another) is counted once.
+        """
+        self._fd = fileobj.fileno()
+        try:
+            yield fileobj
+        finally:
+            self._sample()
+            self._fd = None
+
+    def finish_input(self, nbytes, rows=0):
+        # type: (int, int) -> None
+        """Account for a whole input finished outside tracking()."""
+        self._done_bytes += nbytes
+        self._position = 0
+        self.rows += rows
+
+    @property
+    def bytes_done(self):
+        # type: () -> int
+        return min(self._done_bytes + self._position, self.total_bytes)
+
+    def _sample(self):
+        fd = self._fd
+        if fd is None:
+            return
+        try:
+            position = os.lseek(fd, 0, os.SEEK_CUR)
+        except OSError:
+            return  # closed between the check and the call
+        if position > self._position:
+            self._position = position
+
+    def format_line(self):
+        # type: () -> str
+        """Render the current progress as a single line."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        done = self.bytes_done
+        rate = done / elapsed
+        eta = (self.total_bytes - done) / rate if rate > 0 else None
+        percent = 100.0 * done / self.total_bytes if self.total_bytes else 100.0
+        return "Progress: {:5.1f}% {:.1f}/{:.1f} MB  {:.1f} MB/s  {:,.0f} rows/s  ETA {}".format(
+            percent,
+            done / _MB,
+            self.total_bytes / _MB,
+            rate / _MB,
+            self.rows / elapsed,
+            format_eta(eta),
+        )
+
+    def _emit(self, final=False):
+        line = self.format_line()
+        if self._tty:
+            self._stream.write("\r" + line + "\x1b[K" + ("\n" if final else ""))
+        else:
+            self._stream.write(line + "\n")
+        self._stream.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+            self._emit()
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="csvconv-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self._emit(final=True)
+        return False
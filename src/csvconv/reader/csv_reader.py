@@ -1,36 +1,115 @@
 """Streaming CSV reader using PyArrow."""
 
+import functools
+import io
+from typing import BinaryIO, Iterator, Optional, Union  # noqa: F401
 
 import pyarrow.csv as pcsv
 
+from csvconv.reader.readahead import open_input
+
+
+@functools.lru_cache(maxsize=32)
+def _read_options(block_size_bytes, use_threads):
+    # type: (int, bool) -> pcsv.ReadOptions
+    return pcsv.ReadOptions(block_size=block_size_bytes, use_threads=use_threads)
+
+
+@functools.lru_cache(maxsize=32)
+def _schema_convert_options(schema):
+    # type: (pa.Schema) -> pcsv.ConvertOptions
+    return pcsv.ConvertOptions(column_types=schema)
+
 
 def read_streaming(
     source,  # type: Union[str, BinaryIO]
     block_size_mb=1,  # type: int
     schema=None,  # type: Optional[pa.Schema]
+    column_types=None,  # type: Optional[dict]
+    dict_max_cardinality=None,  # type: Optional[int]
+    use_threads=True,  # type: bool
 ):  # type: (...) -> Iterator[pa.RecordBatch]
     """Yield RecordBatch chunks from CSV using PyArrow streaming API.
 
     Args:
-        source: File path (str) or binary file-like object.
+        source: File path or ``s3://`` URI (str), or binary file-like object.
+                A path is read through reader.readahead.open_input.
         block_size_mb: Block size in megabytes. Internally converted to bytes
                        via block_size_mb * 1024 * 1024 for PyArrow's
                        ReadOptions(block_size=...) which expects bytes.
         schema: Optional PyArrow schema to enforce on all batches.
+        column_types: Optional {column: pa.DataType} overrides, used only
+                      when schema is not given. Other columns are inferred.
+        dict_max_cardinality: If given (and schema is not), string columns
+                      with at most this many distinct values in the first
+                      block are parsed straight into dictionary arrays. The
+                      first block is read twice, so source must be a path
+                      or a seekable file object.
+        use_threads: Parse blocks on Arrow's CPU pool; for inputs of a
+                     block or less the thread handoff costs more than it
+                     saves.
 
     Yields:
         pa.RecordBatch for each chunk read from the CSV.
     """
+    if isinstance(source, str):
+        with open_input(source) as f:
+            yield from read_streaming(f, block_size_mb, schema, column_types,
+                                      dict_max_cardinality, use_threads)
+        return
+
     block_size_bytes = block_size_mb * 1024 * 1024
 
-    read_options = pcsv.ReadOptions(block_size=block_size_bytes)
+    # Options are shared across calls (nothing here mutates them), so a tar
+    # of many members with the same pinned schema builds them once
+    read_options = _read_options(int(block_size_bytes), use_threads)
+
+    if schema is None and dict_max_cardinality is not None:
+        column_types = _with_dictionary_types(
+            source, read_options, column_types, dict_max_cardinality
+        )
 
     convert_options = None
     if schema is not None:
-        convert_options = pcsv.ConvertOptions(column_types=schema)
+        convert_options = _schema_convert_options(schema)
+    elif column_types:
+        convert_options = pcsv.ConvertOptions(column_types=column_types)
 
     reader = pcsv.open_csv(source, read_options=read_options, convert_options=convert_options)
 
     for batch in reader:
         if batch.num_rows > 0:
             yield batch
+
+
+def _with_dictionary_types(source, read_options, column_types, max_cardinality):
+    # type: (...) -> dict
+    """Probe the first block and add dictionary types to column_types.
+
+    Arrow's own auto_dict_encode fails the stream as soon as a later block
+    exceeds the cardinality, so the choice is made once from the first block
+    and pinned as explicit dictionary column types, which have no limit.
+    """
+    from csvconv.schema.inference import select_dictionary_types
+
+    # The probe parses a copy of the first block: a second Arrow reader on
+    # source would race the main reader's background read-ahead
+    start = source.tell()
+    head = source.read(read_options.block_size)
+    source.seek(start)
+    if len(head) == read_options.block_size and b"\n" in head:
+        head = head[:head.rfind(b"\n") + 1]
+    convert_options = pcsv.ConvertOptions(column_types=column_types) if column_types else None
+    probe = pcsv.open_csv(io.BytesIO(head), read_options=read_options,
+                          convert_options=convert_options)
+    first = next(iter(probe), None)
+
+    selected = select_dictionary_types(
+        [first] if first is not None else [], max_cardinality,
+        exclude=tuple(column_types or ()),
+    )
+    if not selected:
+        return column_types
+    merged = dict(column_types or {})
+    merged.update(selected)
+    return merged
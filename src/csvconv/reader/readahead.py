@@ -0,0 +1,258 @@
+"""Read-ahead input files for network file systems.
+
+Arrow and tarfile read their input in small synchronous calls, which on NFS
+each wait a full round trip. ReadAheadFile instead reads large sequential
+chunks on a background thread into a ring of reusable buffers, so the
+network latency overlaps parsing and decompression. The kernel is told the
+file is read sequentially (POSIX_FADV_SEQUENTIAL), and every consumed chunk
+is dropped from the page cache (POSIX_FADV_DONTNEED), so converting a huge
+input does not evict the cached files of other jobs. posix_fadvise is
+skipped where the platform lacks it.
+"""
+
+import io
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional  # noqa: F401
+
+from csvconv.errors import InputValidationError
+
+DEFAULT_READ_AHEAD_DEPTH = 4
+
+# Size of each background read and of each buffer in the ring
+READ_AHEAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Process-wide settings (see configure_read_ahead); depth 0 disables read-ahead
+config = {
+    "depth": DEFAULT_READ_AHEAD_DEPTH,
+    "chunk_size": READ_AHEAD_CHUNK_SIZE,
+}
+
+
+def configure_read_ahead(depth=None):
+    # type: (Optional[int]) -> None
+    """Set the number of chunks read ahead of the reader (0 to read directly).
+
+    None restores DEFAULT_READ_AHEAD_DEPTH. convert() calls this for every
+    conversion, so one conversion's depth does not carry over to the next.
+
+    Raises:
+        InputValidationError: If depth is negative.
+    """
+    if depth is None:
+        depth = DEFAULT_READ_AHEAD_DEPTH
+    if depth < 0:
+        raise InputValidationError("Read-ahead depth must be >= 0, got {}".format(depth))
+    config["depth"] = depth
+
+
+def open_input(path, s3=None):
+    # type: (str, S3Settings) -> BinaryIO
+    """Open an input for binary reading.
+
+    An ``s3://`` URI is read through a PrefetchReader with the s3 settings
+    (see csvconv.s3), a local file through a ReadAheadFile unless
+    read-ahead is disabled.
+    """
+    from csvconv.s3 import is_s3_uri
+
+    if is_s3_uri(path):
+        from csvconv.s3.download import PrefetchReader
+
+        return PrefetchReader(path, settings=s3)
+    if config["depth"] > 0:
+        return ReadAheadFile(path)
+    return open(path, "rb")
+
+
+def _fadvise(fd, offset, length, advice):
+    # type: (int, int, int, str) -> None
+    """posix_fadvise(fd, offset, length, os.<advice>) where supported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, advice))
+        except OSError:
+            pass
+
+
+class ReadAheadFile(io.RawIOBase):
+    """Seekable binary file read in large chunks ahead of the caller.
+
+    A background thread reads chunk_size bytes at a time into one of depth
+    reusable buffers (config values when None) and queues them in file
+    order; reads are served from the queued buffers, and a buffer goes back
+    to the thread once consumed, after its range was dropped from the page
+    cache. A seek outside the current buffer restarts the thread at the
+    new offset.
+
+    read(n) returns n bytes unless at the end of the file, since the Arrow
+    CSV reader takes a short read for the end of the stream. fileno() is
+    the underlying file, whose offset runs up to depth chunks ahead.
+    """
+
+    def __init__(self, path, chunk_size=None, depth=None):
+        # type: (str, Optional[int], Optional[int]) -> None
+        super().__init__()
+        self._raw = open(path, "rb", buffering=0)
+        self.name = path
+        fd = self._raw.fileno()
+        size = os.fstat(fd).st_size
+        chunk_size = chunk_size or config["chunk_size"]
+        depth = depth or config["depth"] or DEFAULT_READ_AHEAD_DEPTH
+        # A small file gets a single buffer of its own size
+        self._chunk_size = max(1, min(chunk_size, size))
+        self._buffers = [bytearray(self._chunk_size) for _ in range(max(1, min(depth, -(-size // self._chunk_size))))]
+        _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        self._thread = None  # type: Optional[threading.Thread]
+        self._start(0)
+
+    def _start(self, offset):
+        # type: (int) -> None
+        """Start the reader thread at offset with every buffer free."""
+        self._raw.seek(offset)
+        self._free = queue.Queue()  # type: queue.Queue
+        for buffer in self._buffers:
+            self._free.put(buffer)
+        self._filled = queue.Queue()  # type: queue.Queue
+        self._stopping = False
+        # (buffer, file offset, bytes held) of the chunk being consumed
+        self._current = None
+        self._cursor = 0
+        self._position = offset
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._read_chunks, args=(offset,), name="csvconv-read-ahead", daemon=True
+        )
+        self._thread.start()
+
+    def _stop(self):
+        # type: () -> None
+        """Stop the reader thread and wait for its read in progress."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._free.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _read_chunks(self, offset):
+        # type: (int) -> None
+        try:
+            while True:
+                buffer = self._free.get()
+                if buffer is None or self._stopping:
+                    return
+                view = memoryview(buffer)
+                n = 0
+                while n < len(view):
+                    count = self._raw.readinto(view[n:])
+                    if not count:
+                        break
+                    n += count
+                self._filled.put((buffer, offset, n))
+                offset += n
+                if n < len(view):
+                    return
+        except Exception as e:
+            self._filled.put((None, offset, e))
+
+    def _next_chunk(self):
+        # type: () -> bool
+        """Recycle the consumed chunk and take the next one; False at the end."""
+        if self._current is not None:
+            buffer, offset, n = self._current
+            if n:
+                _fadvise(self._raw.fileno(), offset, n, "POSIX_FADV_DONTNEED")
+            self._free.put(buffer)
+            self._current = None
+        if self._eof:
+            return False
+        buffer, offset, n = self._filled.get()
+        if buffer is None:
+            self._eof = True
+            raise n
+        if n < len(buffer):
+            self._eof = True
+        self._current = (buffer, offset, n)
+        self._cursor = 0
+        return n > 0
+
+    def readable(self):
+        # type: () -> bool
+        return True
+
+    def seekable(self):
+        # type: () -> bool
+        return True
+
+    def fileno(self):
+        # type: () -> int
+        return self._raw.fileno()
+
+    def tell(self):
+        # type: () -> int
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # type: (int, int) -> int
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += os.fstat(self._raw.fileno()).st_size
+        if offset < 0:
+            raise ValueError("Negative seek position {}".format(offset))
+        current = self._current
+        if current is not None and current[1] <= offset <= current[1] + current[2]:
+            self._cursor = offset - current[1]
+            self._position = offset
+        elif offset != self._position:
+            self._stop()
+            self._start(offset)
+        return offset
+
+    def readinto(self, buffer):
+        # type: (bytearray) -> int
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            if self._current is None or self._cursor == self._current[2]:
+                if not self._next_chunk():
+                    break
+            chunk, _, held = self._current
+            n = min(len(view) - filled, held - self._cursor)
+            view[filled : filled + n] = memoryview(chunk)[self._cursor : self._cursor + n]
+            self._cursor += n
+            filled += n
+        self._position += filled
+        return filled
+
+    def read(self, size=-1):
+        # type: (int) -> bytes
+        if size is None or size < 0:
+            return self.readall()
+        current = self._current
+        if current is not None and not self.closed and self._cursor + size <= current[2]:
+            # Served from the current buffer with a single copy
+            start = self._cursor
+            self._cursor += size
+            self._position += size
+            return bytes(memoryview(current[0])[start : start + size])
+        buffer = bytearray(size)
+        del buffer[self.readinto(buffer) :]
+        return bytes(buffer)
+
+    def readall(self):
+        # type: () -> bytes
+        buffer = bytearray(max(0, os.fstat(self._raw.fileno()).st_size - self._position))
+        return bytes(buffer[: self.readinto(buffer)])
+
+    def close(self):
+        # type: () -> None
+        """Stop reading ahead and close the file."""
+        if not self.closed:
+            self._stop()
+            self._raw.close()
+        super().close()
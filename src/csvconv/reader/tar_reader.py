@@ -1,32 +1,79 @@
 """tar.gz archive reader with security controls."""
 
+import contextlib
+import fnmatch
 import io
+import os
 import tarfile
+from typing import Iterator, Optional  # noqa: F401
 
 from csvconv.errors import MemberNotFoundError
+from csvconv.reader.readahead import open_input
+from csvconv.s3 import is_s3_uri
 
 
-def list_csv_members(tar_path):
-    # type: (str) -> list
+def list_csv_members(tar_path, include=None, s3=None):
+    # type: (str, Optional[list], S3Settings) -> list
     """List CSV file members inside a tar.gz archive.
 
+    Args:
+        tar_path: Path or ``s3://`` URI of the tar.gz archive.
+        include: Optional list of glob patterns. A member is kept if any
+                 pattern matches its full name or its basename.
+        s3: S3Settings for an ``s3://`` archive (defaults when None).
+
     Returns a sorted list of member names ending in .csv.
     """
     members = []
-    with tarfile.open(tar_path, "r:gz") as tar:
+    with _open_archive(tar_path, s3=s3) as tar:
         for member in tar.getmembers():
-            if member.isfile() and member.name.lower().endswith(".csv"):
+            if _is_csv_member(member, include):
                 members.append(member.name)
     return sorted(members)
 
 
-def open_member_stream(tar_path, member_name):
-    # type: (str, str) -> io.BytesIO
+def _is_csv_member(member, include):
+    # type: (tarfile.TarInfo, Optional[list]) -> bool
+    if not (member.isfile() and member.name.lower().endswith(".csv")):
+        return False
+    return not include or _matches_any(member.name, include)
+
+
+def _matches_any(member_name, patterns):
+    # type: (str, list) -> bool
+    base = os.path.basename(member_name)
+    return any(
+        fnmatch.fnmatchcase(member_name, p) or fnmatch.fnmatchcase(base, p)
+        for p in patterns
+    )
+
+
+@contextlib.contextmanager
+def _open_archive(tar_path, progress=None, s3=None):
+    """Yield the open tarfile, read through progress tracking if given.
+
+    The archive is read ahead in large chunks (see reader.readahead).
+    ``s3://`` archives are read with the s3 settings and not tracked, since
+    progress samples the position of a local file.
+    """
+    with open_input(tar_path, s3=s3) as raw:
+        tracking = contextlib.nullcontext()
+        if progress is not None and not is_s3_uri(tar_path):
+            tracking = progress.tracking(raw)
+        with tracking, tarfile.open(fileobj=raw, mode="r:gz") as tar:
+            yield tar
+
+
+def open_member_stream(tar_path, member_name, progress=None, s3=None):
+    # type: (str, str, ProgressReporter, S3Settings) -> io.BytesIO
     """Open a tar member and return its content as a BytesIO stream.
 
     Args:
-        tar_path: Path to the tar.gz archive.
+        tar_path: Path or ``s3://`` URI of the tar.gz archive.
         member_name: Name of the member to extract.
+        progress: Optional ProgressReporter that samples the compressed
+                  position while the member is read.
+        s3: S3Settings for an ``s3://`` archive (defaults when None).
 
     Returns:
         BytesIO object containing the member's data.
@@ -34,10 +81,11 @@ def open_member_stream(tar_path, member_name):
     Raises:
         MemberNotFoundError: If the member doesn't exist in the archive.
     """
-    with tarfile.open(tar_path, "r:gz") as tar:
-        try:
-            member = tar.getmember(member_name)
-        except KeyError:
+    with _open_archive(tar_path, progress, s3=s3) as tar:
+        # Scan only up to the member instead of indexing the whole
+        # archive, so the compressed position tracks the member
+        member = next((m for m in tar if m.name == member_name), None)
+        if member is None:
             raise MemberNotFoundError(
                 "Member not found in archive: {}".format(member_name)
             )
@@ -53,10 +101,67 @@ def open_member_stream(tar_path, member_name):
         return io.BytesIO(data)
 
 
-def extract_member_stream(tar_path, member_name):
-    # type: (str, str) -> io.BytesIO
+def iter_member_streams(tar_path, member_names, progress=None, s3=None):
+    # type: (str, list, ProgressReporter, S3Settings) -> Iterator[tuple]
+    """Yield (member name, BytesIO) for member_names in one pass over the archive.
+
+    open_member_stream decompresses the archive from the start for every
+    member, which is quadratic for archives of many members; this reads it
+    once. Members are yielded in archive order. A requested member that is
+    missing or not a regular file is yielded last as (name, None).
+
+    Args:
+        tar_path: Path to the tar.gz archive.
+        member_names: Names of the members to read.
+        progress: Optional ProgressReporter that samples the compressed
+                  position while the archive is read.
+        s3: S3Settings for an ``s3://`` archive (defaults when None).
+    """
+    wanted = set(member_names)
+    with _open_archive(tar_path, progress, s3=s3) as tar:
+        for member in tar:
+            if member.name not in wanted:
+                continue
+            f = tar.extractfile(member)
+            if f is None:
+                continue
+            wanted.discard(member.name)
+            yield member.name, io.BytesIO(f.read())
+    for name in member_names:
+        if name in wanted:
+            yield name, None
+
+
+def iter_csv_members(tar_path, include=None, progress=None, s3=None):
+    # type: (str, Optional[list], ProgressReporter, S3Settings) -> Iterator[tuple]
+    """Yield (member name, BytesIO) for every CSV member in one pass over the archive.
+
+    The members are those list_csv_members would return, in archive order
+    rather than sorted. Unlike list_csv_members followed by
+    iter_member_streams, the archive is downloaded and decompressed only
+    once, which matters for ``s3://`` archives.
+
+    Args:
+        tar_path: Path or ``s3://`` URI of the tar.gz archive.
+        include: Optional list of glob patterns, as for list_csv_members.
+        progress: Optional ProgressReporter that samples the compressed
+                  position while the archive is read.
+        s3: S3Settings for an ``s3://`` archive (defaults when None).
+    """
+    with _open_archive(tar_path, progress, s3=s3) as tar:
+        for member in tar:
+            if not _is_csv_member(member, include):
+                continue
+            f = tar.extractfile(member)
+            if f is None:
+                continue
+            yield member.name, io.BytesIO(f.read())
+
+
+def extract_member_stream(tar_path, member_name, progress=None):
+    # type: (str, str, ProgressReporter) -> io.BytesIO
     """Open a raw binary stream for a tar member (no parsing).
 
     Same as open_member_stream but semantically indicates raw extraction usage.
     """
-    return open_member_stream(tar_path, member_name)
+    return open_member_stream(tar_path, member_name, progress=progress)
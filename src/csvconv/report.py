@@ -0,0 +1,182 @@
+"""Machine-readable run reports: summary JSON and Prometheus textfile.
+
+Both are built once at the end of a run from the ConversionSummary, so they
+add nothing to the per-batch path, and both are written atomically (temp
+file in the target directory, fsync, os.replace) so a scraper never sees a
+partial file.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Optional  # noqa: F401
+
+import csvconv
+from csvconv.metrics import peak_rss_bytes
+
+_TOTAL_KEYS = ("rows", "input_bytes", "output_bytes", "encoding_saved_bytes")
+_PEAK_KEYS = ("rss_peak_bytes", "arrow_pool_peak_bytes")
+
+
+def build_report(summary, exit_code, started_at, finished_at=None, error=None, extra=None):
+    # type: (ConversionSummary, int, float, Optional[float], Optional[str], Optional[dict]) -> dict
+    """Assemble the structured run report.
+
+    Args:
+        summary: ConversionSummary of the run.
+        exit_code: Process exit code the run ends with.
+        started_at: Run start as a Unix timestamp.
+        finished_at: Run end as a Unix timestamp (default: now).
+        error: Message of a whole-run failure, if any.
+        extra: Optional additional top-level entries (e.g. per-job results).
+
+    Returns:
+        JSON-serializable dict.
+    """
+    if finished_at is None:
+        finished_at = time.time()
+    files = summary.files
+
+    totals = {
+        "success": summary.total_success,
+        "failure": summary.total_failure,
+    }
+    for key in _TOTAL_KEYS:
+        totals[key] = sum(f.get(key) or 0 for f in files)
+    for key in _PEAK_KEYS:
+        totals[key] = max([f.get(key) or 0 for f in files], default=0)
+    stages = {}  # type: dict
+    for f in files:
+        for stage, seconds in (f.get("stages") or {}).items():
+            stages[stage] = round(stages.get(stage, 0.0) + seconds, 6)
+    totals["stages"] = stages
+    duration = finished_at - started_at
+    # Files (tar members count one each) per wall-clock second: the figure
+    # of merit for archives of many small members
+    totals["files_per_s"] = round(len(files) / duration, 2) if duration > 0 else None
+
+    report = {
+        "version": csvconv.__version__,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "duration_s": round(duration, 6),
+        "exit_code": exit_code,
+        "error": error,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "totals": totals,
+        "files": files,
+    }
+    if extra:
+        report.update(extra)
+    return report
+
+
+def _default_file_mode():
+    # type: () -> int
+    """Mode of a newly created file under the current umask (0o666 & ~umask)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write_text(path, text):
+    # type: (str, str) -> None
+    """Write text to path via temp file -> fsync -> os.replace().
+
+    The file gets the usual mode of a new file rather than mkstemp's 0600,
+    so e.g. a node_exporter running as another user can read it.
+    """
+    output_dir = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, _default_file_mode())
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_summary_json(path, report):
+    # type: (str, dict) -> None
+    """Write the report as JSON."""
+    atomic_write_text(path, json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def _escape_label(value):
+    # type: (str) -> str
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_metrics_textfile(report):
+    # type: (dict) -> str
+    """Render the report in the Prometheus text exposition format.
+
+    Values describe the last run, so every metric is a gauge; this is the
+    format expected by node_exporter's textfile collector.
+    """
+    totals = report["totals"]
+    metrics = [
+        ("csvconv_last_run_timestamp_seconds", "Unix time the last run finished.", [("", report["finished_at"])]),
+        ("csvconv_last_run_duration_seconds", "Wall-clock duration of the last run.", [("", report["duration_s"])]),
+        ("csvconv_last_run_exit_code", "Exit code of the last run.", [("", report["exit_code"])]),
+        (
+            "csvconv_last_run_files",
+            "Files converted in the last run by status.",
+            [('status="success"', totals["success"]), ('status="failure"', totals["failure"])],
+        ),
+        ("csvconv_last_run_rows", "Rows written in the last run.", [("", totals["rows"])]),
+        ("csvconv_last_run_input_bytes", "Input bytes processed in the last run.", [("", totals["input_bytes"])]),
+        ("csvconv_last_run_output_bytes", "Output bytes written in the last run.", [("", totals["output_bytes"])]),
+        (
+            "csvconv_last_run_encoding_saved_bytes",
+            "Estimated Parquet bytes saved by --encoding auto in the last run.",
+            [("", totals["encoding_saved_bytes"])],
+        ),
+        (
+            "csvconv_last_run_stage_seconds",
+            "Time spent per pipeline stage in the last run.",
+            [
+                ('stage="{}"'.format(_escape_label(stage)), seconds)
+                for stage, seconds in sorted(totals["stages"].items())
+            ],
+        ),
+        (
+            "csvconv_last_run_peak_rss_bytes",
+            "Peak resident set size of the last run.",
+            [("", report["peak_rss_bytes"])],
+        ),
+        (
+            "csvconv_last_run_file_rss_peak_bytes",
+            "Highest per-file peak resident set size in the last run.",
+            [("", totals["rss_peak_bytes"])],
+        ),
+        (
+            "csvconv_last_run_file_arrow_pool_peak_bytes",
+            "Highest per-file peak Arrow memory pool allocation in the last run.",
+            [("", totals["arrow_pool_peak_bytes"])],
+        ),
+    ]
+
+    lines = []
+    for name, help_text, samples in metrics:
+        if not samples:
+            continue
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} gauge".format(name))
+        for labels, value in samples:
+            label_str = "{" + labels + "}" if labels else ""
+            lines.append("{}{} {}".format(name, label_str, value))
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_textfile(path, report):
+    # type: (str, dict) -> None
+    """Write the report as a Prometheus textfile-collector file."""
+    atomic_write_text(path, format_metrics_textfile(report))
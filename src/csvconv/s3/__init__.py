@@ -0,0 +1,84 @@
+"""Input from and output to S3-compatible object stores (AWS S3, MinIO, ...).
+
+An ``s3://bucket/key`` input is opened with pyarrow.fs and read through a
+PrefetchReader: ranged GETs of up to READ_CHUNK_SIZE bytes are issued in
+parallel ahead of the parser, with at most read_ahead bytes in flight or
+buffered (see s3.download).
+
+An ``s3://`` output streams straight into a multipart upload instead of a
+local temp file: parts of part_size bytes are uploaded in the background
+by up to upload_threads threads while the writer keeps producing row
+groups. The object only becomes visible when the upload is completed on a
+successful close, and a failed conversion aborts the upload, so object
+store outputs keep the all-or-nothing publication of the local writers.
+An output smaller than one part is sent as a single PUT on commit (see
+s3.upload).
+
+Uploads are signed with AWS Signature Version 4 (see s3.client). Both
+directions use the standard environment credentials (AWS_ACCESS_KEY_ID,
+AWS_SECRET_ACCESS_KEY and optionally AWS_SESSION_TOKEN) and AWS_REGION /
+AWS_DEFAULT_REGION. The endpoint is taken from the conversion's S3Settings, AWS_ENDPOINT_URL_S3 or
+AWS_ENDPOINT_URL, and defaults to AWS; custom endpoints use path-style
+addressing (``http://host:9000/bucket/key``).
+
+Settings are per conversion: convert() builds an S3Settings and hands it
+to the readers and uploads it opens, so one conversion's options never
+carry over to the next in the same process.
+
+This module only holds the URI helpers and settings, so checking an
+output path does not import the HTTP client.
+"""
+
+from typing import Optional  # noqa: F401
+
+from csvconv.errors import InputValidationError
+
+DEFAULT_PART_SIZE_MB = 16
+DEFAULT_UPLOAD_THREADS = 4
+DEFAULT_READ_AHEAD_MB = 64
+
+# Size of each ranged GET; read_ahead / READ_CHUNK_SIZE GETs run in parallel
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+
+# S3 rejects smaller parts (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def is_s3_uri(path):
+    # type: (str) -> bool
+    """Whether path is an ``s3://`` URI."""
+    return isinstance(path, str) and path.startswith("s3://")
+
+
+def split_s3_uri(uri):
+    # type: (str) -> tuple
+    """(bucket, key) of an ``s3://bucket/key`` URI.
+
+    Raises:
+        InputValidationError: If the bucket or the key is missing.
+    """
+    bucket, _, key = uri[len("s3://") :].partition("/")
+    if not bucket or not key or key.endswith("/"):
+        raise InputValidationError("S3 URI must name a bucket and an object key: {}".format(uri))
+    return bucket, key
+
+
+class S3Settings:
+    """Endpoint, part size, upload concurrency and read-ahead of one conversion.
+
+    Options left as None take the defaults; without endpoint_url the
+    endpoint comes from the environment (see client.environment_options).
+    Sizes are held in bytes.
+
+    Raises:
+        InputValidationError: If part_size_mb is below the S3 minimum of 5 MB.
+    """
+
+    def __init__(self, endpoint_url=None, part_size_mb=None, upload_threads=None, read_ahead_mb=None):
+        # type: (Optional[str], Optional[float], Optional[int], Optional[float]) -> None
+        self.endpoint_url = endpoint_url
+        self.part_size = int((part_size_mb or DEFAULT_PART_SIZE_MB) * 1024 * 1024)
+        if self.part_size < MIN_PART_SIZE:
+            raise InputValidationError("S3 part size must be at least 5 MB")
+        self.upload_threads = upload_threads or DEFAULT_UPLOAD_THREADS
+        self.read_ahead = max(1, int((read_ahead_mb or DEFAULT_READ_AHEAD_MB) * 1024 * 1024))
@@ -0,0 +1,280 @@
+"""Minimal S3 REST client signed with AWS Signature Version 4."""
+
+import concurrent.futures
+import datetime
+import hashlib
+import hmac
+import http.client
+import os
+import threading
+import time
+from typing import Optional  # noqa: F401
+from urllib.parse import quote, urlsplit
+from xml.etree import ElementTree
+
+from csvconv.errors import InputValidationError, OutputError
+
+# Attempts per request on connection errors and 5xx responses
+MAX_ATTEMPTS = 3
+
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+_pools = {}  # type: dict
+_pools_lock = threading.Lock()
+
+
+def thread_pool(name, workers):
+    # type: (str, int) -> concurrent.futures.ThreadPoolExecutor
+    """Process-wide thread pool name, shared by every upload or download.
+
+    Recreated (after its running requests finish) when workers changes.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is not None and pool._max_workers != workers:
+            pool.shutdown(wait=True)
+            pool = None
+        if pool is None:
+            pool = _pools[name] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="csvconv-s3-" + name
+            )
+        return pool
+
+
+def _hmac(key, text):
+    # type: (bytes, str) -> bytes
+    return hmac.new(key, text.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_v4(method, host, path, query, headers, payload_hash, access_key, secret_key, region, amz_date, service="s3"):
+    # type: (str, str, str, dict, dict, str, str, str, str, str, str) -> str
+    """Authorization header value for a request, per AWS Signature Version 4.
+
+    Args:
+        path: Already URI-encoded request path.
+        query: {name: value} query parameters (unencoded).
+        headers: Headers to sign, other than Host.
+        payload_hash: Hex SHA-256 of the request body.
+        amz_date: Request time as ``YYYYMMDDTHHMMSSZ`` (also in headers).
+    """
+    signed = dict((name.lower(), " ".join(str(value).split())) for name, value in headers.items())
+    signed["host"] = host
+    names = sorted(signed)
+    canonical_query = "&".join(
+        "{}={}".format(quote(name, safe="-_.~"), quote(str(value), safe="-_.~"))
+        for name, value in sorted(query.items())
+    )
+    canonical_request = "\n".join(
+        [
+            method,
+            path,
+            canonical_query,
+            "".join("{}:{}\n".format(name, signed[name]) for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+    day = amz_date[:8]
+    scope = "{}/{}/{}/aws4_request".format(day, region, service)
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+    key = _hmac(("AWS4" + secret_key).encode("utf-8"), day)
+    for part in (region, service, "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    return "AWS4-HMAC-SHA256 Credential={}/{}, SignedHeaders={}, Signature={}".format(
+        access_key, scope, ";".join(names), signature
+    )
+
+
+def environment_options(endpoint_url=None):
+    # type: (Optional[str]) -> dict
+    """Credentials, region and endpoint from the environment, as S3Client arguments.
+
+    Without endpoint_url, AWS_ENDPOINT_URL_S3 or AWS_ENDPOINT_URL is used,
+    else AWS itself (endpoint_url None).
+
+    Raises:
+        InputValidationError: If no credentials are set.
+    """
+    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+    if not access_key or not secret_key:
+        raise InputValidationError("S3 access requires AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY to be set")
+    return {
+        "access_key": access_key,
+        "secret_key": secret_key,
+        "session_token": os.environ.get("AWS_SESSION_TOKEN"),
+        "region": (os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"),
+        "endpoint_url": (endpoint_url or os.environ.get("AWS_ENDPOINT_URL_S3") or os.environ.get("AWS_ENDPOINT_URL")),
+    }
+
+
+class S3Client:
+    """Minimal S3 REST client for multipart uploads.
+
+    Inputs are read through pyarrow.fs instead (see s3.download).
+
+    Connections are kept alive per thread. Requests are retried up to
+    MAX_ATTEMPTS times on connection errors and 5xx responses.
+    """
+
+    def __init__(self, access_key, secret_key, session_token=None, region="us-east-1", endpoint_url=None):
+        # type: (str, str, Optional[str], str, Optional[str]) -> None
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._session_token = session_token
+        self._region = region
+        self._path_style = endpoint_url is not None
+        url = urlsplit(endpoint_url or "https://s3.{}.amazonaws.com".format(region))
+        self._https = url.scheme == "https"
+        self._host = url.netloc
+        self._local = threading.local()
+
+    @classmethod
+    def from_environment(cls, endpoint_url=None):
+        # type: (Optional[str]) -> S3Client
+        """Client for endpoint_url with the environment's credentials.
+
+        Raises:
+            InputValidationError: If no credentials are set.
+        """
+        return cls(**environment_options(endpoint_url))
+
+    def _connection(self, host):
+        # type: (str) -> http.client.HTTPConnection
+        connections = self._local.__dict__.setdefault("connections", {})
+        connection = connections.get(host)
+        if connection is None:
+            cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            connection = connections[host] = cls(host, timeout=60)
+        return connection
+
+    def _drop_connection(self, host):
+        # type: (str) -> None
+        connection = self._local.__dict__.get("connections", {}).pop(host, None)
+        if connection is not None:
+            connection.close()
+
+    def request(self, method, bucket, key, query=None, body=b"", headers=None, error=OutputError):
+        # type: (str, str, str, Optional[dict], bytes, Optional[dict], type) -> tuple
+        """Send a signed request and return (headers, body) of the response.
+
+        headers are sent unsigned, in addition to the signed ones.
+
+        Raises:
+            error: On an error response or once the retries are used up.
+        """
+        extra_headers = headers or {}
+        query = query or {}
+        if self._path_style:
+            host, path = self._host, "/{}/{}".format(bucket, quote(key, safe="/-_.~"))
+        else:
+            host, path = "{}.{}".format(bucket, self._host), "/" + quote(key, safe="/-_.~")
+        target = path
+        if query:
+            target += "?" + "&".join(
+                "{}={}".format(quote(name, safe="-_.~"), quote(str(value), safe="-_.~"))
+                if value != ""
+                else quote(name, safe="-_.~")
+                for name, value in sorted(query.items())
+            )
+        payload_hash = hashlib.sha256(body).hexdigest() if body else _EMPTY_SHA256
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            amz_date = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            headers = {"x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+            if self._session_token:
+                headers["x-amz-security-token"] = self._session_token
+            headers["Authorization"] = sign_v4(
+                method,
+                host,
+                path,
+                query,
+                headers,
+                payload_hash,
+                self._access_key,
+                self._secret_key,
+                self._region,
+                amz_date,
+            )
+            headers["Content-Length"] = str(len(body))
+            headers.update(extra_headers)
+            try:
+                connection = self._connection(host)
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection(host)
+                if attempt == MAX_ATTEMPTS:
+                    raise error("S3 {} s3://{}/{} failed: {}".format(method, bucket, key, e))
+            else:
+                if response.status < 300:
+                    return response.headers, data
+                if response.status < 500 or attempt == MAX_ATTEMPTS:
+                    raise error(
+                        "S3 {} s3://{}/{} failed: HTTP {} {}".format(
+                            method, bucket, key, response.status, _error_code(data)
+                        )
+                    )
+            time.sleep(0.2 * 2 ** (attempt - 1))
+
+    def put_object(self, bucket, key, data):
+        # type: (str, str, bytes) -> None
+        self.request("PUT", bucket, key, body=data)
+
+    def create_multipart_upload(self, bucket, key):
+        # type: (str, str) -> str
+        """Start a multipart upload and return its upload id."""
+        _, data = self.request("POST", bucket, key, {"uploads": ""})
+        return _xml_text(data, "UploadId")
+
+    def upload_part(self, bucket, key, upload_id, number, data):
+        # type: (str, str, str, int, bytes) -> str
+        """Upload part number (from 1) and return its ETag."""
+        headers, _ = self.request("PUT", bucket, key, {"partNumber": number, "uploadId": upload_id}, data)
+        return headers["ETag"]
+
+    def complete_multipart_upload(self, bucket, key, upload_id, etags):
+        # type: (str, str, str, list) -> None
+        """Publish the object from its parts' ETags, in part order."""
+        body = "<CompleteMultipartUpload>{}</CompleteMultipartUpload>".format(
+            "".join(
+                "<Part><PartNumber>{}</PartNumber><ETag>{}</ETag></Part>".format(number, etag)
+                for number, etag in enumerate(etags, 1)
+            )
+        ).encode("utf-8")
+        _, data = self.request("POST", bucket, key, {"uploadId": upload_id}, body)
+        # S3 may report a failed completion in a 200 response
+        if b"<Error>" in data:
+            raise OutputError("S3 completing s3://{}/{} failed: {}".format(bucket, key, _error_code(data)))
+
+    def abort_multipart_upload(self, bucket, key, upload_id):
+        # type: (str, str, str) -> None
+        self.request("DELETE", bucket, key, {"uploadId": upload_id})
+
+
+def _xml_text(data, tag):
+    # type: (bytes, str) -> str
+    element = ElementTree.fromstring(data).find("{*}" + tag)
+    if element is None:
+        element = ElementTree.fromstring(data).find(tag)
+    if element is None or not element.text:
+        raise OutputError("Unexpected S3 response: {!r}".format(data[:200]))
+    return element.text
+
+
+def _error_code(data):
+    # type: (bytes) -> str
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError:
+        return ""
+    return " ".join(filter(None, (root.findtext("Code"), root.findtext("Message"))))
@@ -0,0 +1,174 @@
+"""Read S3 objects through pyarrow.fs with parallel ranged GETs ahead of the reader."""
+
+import io
+import threading
+from typing import Optional  # noqa: F401
+from urllib.parse import urlsplit
+
+import pyarrow.fs as pafs
+
+from csvconv.errors import InputError
+from csvconv.s3 import READ_CHUNK_SIZE, S3Settings, split_s3_uri
+from csvconv.s3.client import MAX_ATTEMPTS, environment_options, thread_pool
+
+_filesystems = {}  # type: dict
+_filesystems_lock = threading.Lock()
+
+
+def input_filesystem(endpoint_url=None):
+    # type: (Optional[str]) -> pafs.S3FileSystem
+    """pyarrow S3FileSystem for endpoint_url with the environment's credentials.
+
+    One filesystem is shared per endpoint and credentials (see
+    client.environment_options). Custom endpoints use path-style addressing.
+
+    Raises:
+        InputValidationError: If no credentials are set.
+    """
+    options = environment_options(endpoint_url)
+    with _filesystems_lock:
+        key = tuple(sorted(options.items()))
+        filesystem = _filesystems.get(key)
+        if filesystem is None:
+            kwargs = {}
+            if options["endpoint_url"]:
+                url = urlsplit(options["endpoint_url"])
+                kwargs = {"endpoint_override": url.netloc, "scheme": url.scheme}
+            filesystem = _filesystems[key] = pafs.S3FileSystem(
+                access_key=options["access_key"],
+                secret_key=options["secret_key"],
+                session_token=options["session_token"],
+                region=options["region"],
+                retry_strategy=pafs.AwsStandardS3RetryStrategy(max_attempts=MAX_ATTEMPTS),
+                **kwargs,
+            )
+        return filesystem
+
+
+class PrefetchReader(io.RawIOBase):
+    """Seekable binary file over an ``s3://bucket/key`` object.
+
+    The object is opened with pyarrow.fs (input_filesystem for the
+    settings' endpoint unless filesystem is given) and fetched in chunks
+    of up to READ_CHUNK_SIZE bytes by ranged reads on a shared thread pool. Reading keeps the chunks covering
+    the next read_ahead bytes (that of settings when None) requested,
+    so the downloads overlap parsing while the memory held stays bounded;
+    consumed chunks are dropped. A seek simply restarts the window at the
+    new position.
+
+    read(n) returns n bytes unless at the end of the object, since the
+    Arrow CSV reader takes a short read for the end of the stream.
+    """
+
+    def __init__(self, uri, settings=None, filesystem=None, read_ahead=None):
+        # type: (str, Optional[S3Settings], Optional[pafs.FileSystem], Optional[int]) -> None
+        super().__init__()
+        settings = settings or S3Settings()
+        self._uri = uri
+        bucket, key = split_s3_uri(uri)
+        filesystem = filesystem or input_filesystem(settings.endpoint_url)
+        read_ahead = read_ahead or settings.read_ahead
+        self._chunk_size = min(READ_CHUNK_SIZE, read_ahead)
+        self._depth = max(1, read_ahead // self._chunk_size)
+        self._pool = thread_pool("download", self._depth)
+        self._position = 0
+        # chunk index -> Future of its bytes
+        self._chunks = {}  # type: dict
+        self._file = None
+        try:
+            self._file = filesystem.open_input_file("{}/{}".format(bucket, key))
+            self._size = self._file.size()
+        except OSError as e:
+            raise InputError("Cannot open {}: {}".format(uri, e))
+
+    @property
+    def name(self):
+        # type: () -> str
+        return self._uri
+
+    @property
+    def size(self):
+        # type: () -> int
+        """Object size in bytes."""
+        return self._size
+
+    def readable(self):
+        # type: () -> bool
+        return True
+
+    def seekable(self):
+        # type: () -> bool
+        return True
+
+    def tell(self):
+        # type: () -> int
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # type: (int, int) -> int
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError("Negative seek position {}".format(offset))
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer):
+        # type: (bytearray) -> int
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view) and self._position < self._size:
+            index = self._position // self._chunk_size
+            data = self._fetch(index).result()
+            offset = self._position - index * self._chunk_size
+            n = min(len(view) - filled, len(data) - offset)
+            view[filled : filled + n] = memoryview(data)[offset : offset + n]
+            filled += n
+            self._position += n
+        return filled
+
+    def readall(self):
+        # type: () -> bytes
+        buffer = bytearray(max(0, self._size - self._position))
+        return bytes(buffer[: self.readinto(buffer)])
+
+    def _fetch(self, index):
+        # type: (int) -> concurrent.futures.Future
+        """Future of chunk index, after moving the read-ahead window to start there."""
+        last = (self._size - 1) // self._chunk_size
+        window = range(index, min(index + self._depth, last + 1))
+        for stale in [i for i in self._chunks if i not in window]:
+            self._chunks.pop(stale).cancel()
+        for i in window:
+            if i not in self._chunks:
+                start = i * self._chunk_size
+                end = min(start + self._chunk_size, self._size)
+                self._chunks[i] = self._pool.submit(self._read_range, start, end)
+        return self._chunks[index]
+
+    def _read_range(self, start, end):
+        # type: (int, int) -> pyarrow.Buffer
+        """Bytes start to end (exclusive) of the object, as one ranged GET."""
+        try:
+            data = self._file.read_at(end - start, start)
+        except OSError as e:
+            raise InputError("Cannot read {}: {}".format(self._uri, e))
+        if len(data) != end - start:
+            raise InputError(
+                "Short read from {}: {} of {} bytes at {}".format(self._uri, len(data), end - start, start)
+            )
+        return data
+
+    def close(self):
+        # type: () -> None
+        """Cancel the outstanding reads, drop the buffered chunks and close the object."""
+        for future in self._chunks.values():
+            future.cancel()
+        self._chunks.clear()
+        if self._file is not None:
+            self._file.close()
+        super().close()
@@ -0,0 +1,160 @@
+"""Write-only file object streaming into an S3 multipart upload."""
+
+import collections
+import concurrent.futures
+import logging
+from typing import Optional  # noqa: F401
+
+from csvconv.errors import OutputError
+from csvconv.s3 import S3Settings, split_s3_uri
+from csvconv.s3.client import S3Client, thread_pool
+
+logger = logging.getLogger("csvconv")
+
+
+class MultipartUpload:
+    """Write-only file object that streams into an S3 multipart upload.
+
+    Parts are uploaded in the background on the shared upload pool; at
+    most upload_threads parts of one upload are in flight, so a writer
+    holds about (upload_threads + 1) * part_size bytes. Endpoint, part
+    size and upload_threads come from settings (defaults when None);
+    part_size overrides the one of settings. commit() uploads
+    the rest and completes the upload; abort() discards it. close() only
+    ends writing (format writers may close their sink), it publishes
+    nothing.
+    """
+
+    def __init__(self, uri, settings=None, client=None, part_size=None):
+        # type: (str, Optional[S3Settings], Optional[S3Client], Optional[int]) -> None
+        settings = settings or S3Settings()
+        self.uri = uri
+        self._bucket, self._key = split_s3_uri(uri)
+        self._client = client or S3Client.from_environment(settings.endpoint_url)
+        self._part_size = part_size or settings.part_size
+        self.upload_threads = settings.upload_threads
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None  # type: Optional[str]
+        self._parts = []  # type: list
+        self._in_flight = collections.deque()  # type: collections.deque
+        self._finished = False
+        self.closed = False
+
+    @property
+    def parts(self):
+        # type: () -> int
+        """Parts submitted so far."""
+        return len(self._parts)
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def readable(self):
+        return False
+
+    def tell(self):
+        # type: () -> int
+        return self._position
+
+    def flush(self):
+        pass
+
+    def write(self, data):
+        # type: (bytes) -> int
+        if self._finished:
+            raise ValueError("Upload to {} is already finished".format(self.uri))
+        size = memoryview(data).nbytes
+        self._buffer += data
+        self._position += size
+        while len(self._buffer) >= self._part_size:
+            self._submit(bytes(self._buffer[: self._part_size]))
+            del self._buffer[: self._part_size]
+        return size
+
+    def _submit(self, data):
+        # type: (bytes) -> None
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(self._bucket, self._key)
+        # Bound memory: wait for the oldest part once enough are in flight
+        while len(self._in_flight) >= self.upload_threads:
+            self._in_flight.popleft().result()
+        future = thread_pool("upload", self.upload_threads).submit(
+            self._client.upload_part,
+            self._bucket,
+            self._key,
+            self._upload_id,
+            len(self._parts) + 1,
+            data,
+        )
+        self._parts.append(future)
+        self._in_flight.append(future)
+
+    def commit(self):
+        # type: () -> None
+        """Upload the buffered rest and publish the object.
+
+        The upload is aborted if this fails.
+        """
+        if self._finished:
+            return
+        try:
+            if self._upload_id is None:
+                self._client.put_object(self._bucket, self._key, bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                etags = [future.result() for future in self._parts]
+                self._client.complete_multipart_upload(self._bucket, self._key, self._upload_id, etags)
+        except BaseException:
+            self.abort()
+            raise
+        self._buffer = bytearray()
+        self._finished = True
+        self.closed = True
+
+    def abort(self):
+        # type: () -> None
+        """Discard the upload; nothing is published."""
+        if self._finished:
+            return
+        self._finished = True
+        self.closed = True
+        self._buffer = bytearray()
+        for future in self._parts:
+            future.cancel()
+        concurrent.futures.wait(self._parts)
+        if self._upload_id is not None:
+            try:
+                self._client.abort_multipart_upload(self._bucket, self._key, self._upload_id)
+            except OutputError as e:
+                logger.warning("Could not abort the upload to %s: %s", self.uri, e)
+
+    def close(self):
+        # type: () -> None
+        self.closed = True
+
+
+def commit_all(uploads):
+    # type: (list) -> list
+    """Commit MultipartUploads concurrently (uploads of small outputs are one PUT each).
+
+    Every upload is committed or fails on its own; uploads that failed are
+    aborted.
+
+    Returns:
+        The error of each upload, in order (None for those committed).
+    """
+    if len(uploads) == 1:
+        try:
+            uploads[0].commit()
+        except Exception as e:
+            return [e]
+        return [None]
+    workers = min(len(uploads), max(upload.upload_threads for upload in uploads))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(upload.commit) for upload in uploads]
+    return [future.exception() for future in futures]
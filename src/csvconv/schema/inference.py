@@ -1,29 +1,118 @@
 """Schema inference from CSV sample rows."""
 
+from typing import Optional  # noqa: F401
+
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.csv as pcsv
 
+from csvconv.errors import InputValidationError
 from csvconv.reader.tar_reader import open_member_stream
 
+DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+# Arrow's own auto_dict_max_cardinality default
+DEFAULT_DICT_MAX_CARDINALITY = 50
+
+_TYPE_ALIASES = {
+    "dictionary": DICTIONARY_TYPE,
+    "category": DICTIONARY_TYPE,
+}
+
+
+def parse_column_types(column_types):
+    # type: (dict) -> dict
+    """Resolve a {column: type} mapping into PyArrow types.
+
+    Values may already be pa.DataType instances or type aliases such as
+    "int64", "string" or "timestamp[ms]". "dictionary" (or "category")
+    selects a dictionary-encoded string column.
+
+    Raises:
+        InputValidationError: If an alias is not a known PyArrow type.
+    """
+    resolved = {}
+    for name, type_ in column_types.items():
+        if isinstance(type_, pa.DataType):
+            resolved[name] = type_
+            continue
+        if str(type_) in _TYPE_ALIASES:
+            resolved[name] = _TYPE_ALIASES[str(type_)]
+            continue
+        try:
+            resolved[name] = pa.type_for_alias(str(type_))
+        except ValueError:
+            raise InputValidationError("Unknown type for column '{}': {}".format(name, type_))
+    return resolved
+
+
+def select_dictionary_types(batches, max_cardinality=DEFAULT_DICT_MAX_CARDINALITY, exclude=()):
+    # type: (list, int, tuple) -> dict
+    """Pick the string columns worth dictionary-encoding.
 
-def infer_schema(tar_path, member_name, sample_rows=1000):
-    # type: (str, str, int) -> pyarrow.Schema
+    Args:
+        batches: Sample RecordBatches (with plain string columns).
+        max_cardinality: Largest number of distinct values in the sample for
+                         a column to be encoded.
+        exclude: Column names to leave alone (e.g. explicitly typed ones).
+
+    Returns:
+        {column: DICTIONARY_TYPE} for the low-cardinality string columns.
+    """
+    if not batches:
+        return {}
+    table = pa.Table.from_batches(batches)
+    selected = {}
+    for field in table.schema:
+        if field.name in exclude or not pa.types.is_string(field.type):
+            continue
+        if pc.count_distinct(table.column(field.name)).as_py() <= max_cardinality:
+            selected[field.name] = DICTIONARY_TYPE
+    return selected
+
+
+def infer_schema(tar_path, member_name, sample_rows=1000, column_types=None, dict_max_cardinality=None, s3=None):
+    # type: (str, str, int, Optional[dict], Optional[int], S3Settings) -> pyarrow.Schema
     """Infer PyArrow schema from a CSV file within a tar.gz archive.
 
     Reads the first sample_rows rows from the specified member
     to determine column types.
 
     Args:
-        tar_path: Path to the tar.gz archive.
+        tar_path: Path or ``s3://`` URI of the tar.gz archive.
         member_name: Name of the CSV member to use for inference.
         sample_rows: Number of rows to sample for type inference.
+        column_types: Optional {column: pa.DataType} overrides; these columns
+                      are not inferred.
+        dict_max_cardinality: If given, inferred string columns with at most
+                              this many distinct values in the sample become
+                              dictionary-encoded.
+        s3: S3Settings for an ``s3://`` archive (defaults when None).
 
     Returns:
         PyArrow Schema with inferred column types.
     """
-    stream = open_member_stream(tar_path, member_name)
+    stream = open_member_stream(tar_path, member_name, s3=s3)
+    return infer_schema_from_stream(
+        stream, sample_rows=sample_rows, column_types=column_types, dict_max_cardinality=dict_max_cardinality
+    )
+
 
+def infer_schema_from_stream(stream, sample_rows=1000, column_types=None, dict_max_cardinality=None):
+    # type: (io.BytesIO, int, Optional[dict], Optional[int]) -> pyarrow.Schema
+    """Infer PyArrow schema from the first sample_rows rows of a CSV stream.
+
+    Same as infer_schema, for a member already read from the archive. The
+    rows are read from a zero-copy view of the stream's buffer, so the
+    stream itself is not moved: the CSV reader reads ahead on a background
+    thread, which could still be using it after this returns.
+    """
     read_options = pcsv.ReadOptions(block_size=1024 * 1024)
-    reader = pcsv.open_csv(stream, read_options=read_options)
+    convert_options = None
+    if column_types:
+        convert_options = pcsv.ConvertOptions(column_types=column_types)
+    data = pa.py_buffer(stream.getbuffer())
+    reader = pcsv.open_csv(pa.BufferReader(data), read_options=read_options, convert_options=convert_options)
 
     rows_read = 0
     batches = []
@@ -35,8 +124,13 @@ def infer_schema(tar_path, member_name, sample_rows=1000):
 
     if not batches:
         # Fallback: read just the header
-        stream.seek(0)
-        table = pcsv.read_csv(stream)
+        table = pcsv.read_csv(pa.BufferReader(data), convert_options=convert_options)
         return table.schema
 
-    return batches[0].schema
+    schema = batches[0].schema
+    if dict_max_cardinality is not None:
+        selected = select_dictionary_types(batches, dict_max_cardinality, exclude=tuple(column_types or ()))
+        for name, type_ in selected.items():
+            index = schema.get_field_index(name)
+            schema = schema.set(index, schema.field(index).with_type(type_))
+    return schema
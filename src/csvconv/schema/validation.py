@@ -1,13 +1,32 @@
 """Schema validation and mismatch detection."""
 
+import pyarrow as pa
+
 from csvconv.errors import SchemaMismatchError
 
 
+def types_compatible(expected, actual):
+    # type: (pa.DataType, pa.DataType) -> bool
+    """Whether actual can stand in for expected.
+
+    A dictionary-encoded column is compatible with a plain column of its
+    value type (and vice versa); the writer casts between the two.
+    """
+    if expected == actual:
+        return True
+    if pa.types.is_dictionary(expected):
+        expected = expected.value_type
+    if pa.types.is_dictionary(actual):
+        actual = actual.value_type
+    return expected == actual
+
+
 def validate_batch_schema(batch, expected):
     # type: (pyarrow.RecordBatch, pyarrow.Schema) -> None
     """Validate that a RecordBatch schema matches the expected schema.
 
-    Checks column count, column names, and column types.
+    Checks column count, column names, and column types. Dictionary-encoded
+    and plain columns of the same value type are considered to match.
     Raises SchemaMismatchError with a descriptive message if any mismatch.
     """
     actual = batch.schema
@@ -35,7 +54,7 @@ def validate_batch_schema(batch, expected):
 
     # Check column types
     for i, (exp_field, act_field) in enumerate(zip(expected, actual)):
-        if exp_field.type != act_field.type:
+        if not types_compatible(exp_field.type, act_field.type):
             raise SchemaMismatchError(
                 "Schema type mismatch for column '{}': expected {}, got {}".format(
                     exp_field.name, exp_field.type, act_field.type
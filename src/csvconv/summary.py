@@ -2,21 +2,61 @@
 
 
 class ConversionSummary:
-    """Track success and failure counts for file conversions."""
+    """Track success and failure counts for file conversions.
+
+    Each record may carry optional per-file metrics (rows, input_bytes,
+    output_bytes, duration_s, stages, ...) which are kept in files and
+    surface in machine-readable reports; get_report() ignores them.
+    """
 
     def __init__(self):
         self._successes = []  # type: list
         self._failures = []   # type: list
+        self._files = []      # type: list
 
-    def record_success(self, file_name):
-        # type: (str) -> None
-        """Record a successful file conversion."""
+    def record_success(self, file_name, **metrics):
+        # type: (str, **object) -> None
+        """Record a successful file conversion with optional metrics."""
         self._successes.append(file_name)
+        self._files.append(dict(metrics, file=file_name, status="success"))
 
-    def record_failure(self, file_name, reason):
-        # type: (str, str) -> None
-        """Record a failed file conversion with reason."""
+    def record_failure(self, file_name, reason, **metrics):
+        # type: (str, str, **object) -> None
+        """Record a failed file conversion with reason and optional metrics."""
         self._failures.append({"file": file_name, "reason": reason})
+        self._files.append(dict(metrics, file=file_name, status="failure", reason=reason))
+
+    def merge(self, other):
+        # type: (ConversionSummary) -> None
+        """Fold the results of another summary into this one."""
+        self._successes.extend(other._successes)
+        self._failures.extend(other._failures)
+        self._files.extend(other._files)
+
+    def to_dict(self):
+        # type: () -> dict
+        """Return a JSON-serializable representation of the summary."""
+        return {
+            "successes": list(self._successes),
+            "failures": [dict(f) for f in self._failures],
+            "files": [dict(f) for f in self._files],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # type: (dict) -> ConversionSummary
+        """Rebuild a summary from to_dict() output."""
+        summary = cls()
+        summary._successes.extend(data.get("successes", []))
+        summary._failures.extend(dict(f) for f in data.get("failures", []))
+        summary._files.extend(dict(f) for f in data.get("files", []))
+        return summary
+
+    @property
+    def files(self):
+        # type: () -> list
+        """Per-file records in completion order, including metrics."""
+        return [dict(f) for f in self._files]
 
     @property
     def total_success(self):
@@ -46,6 +86,11 @@ class ConversionSummary:
         lines.append("=" * 40)
         lines.append("Success: {} file(s)".format(self.total_success))
         lines.append("Failure: {} file(s)".format(self.total_failure))
+        encoded = [f for f in self._files if f.get("encodings") is not None]
+        if encoded:
+            lines.append("Auto encoding: ~{} bytes saved in {} file(s)".format(
+                sum(f.get("encoding_saved_bytes") or 0 for f in encoded), len(encoded)
+            ))
 
         if self._successes:
             lines.append("")
@@ -0,0 +1,90 @@
+"""Arrow thread pool sizing coordinated with process-level parallelism.
+
+Arrow's CPU pool defaults to every core in each process, so N csvconv
+processes on a shared host (or --workers N) run N x cores threads. The
+thread count per process is planned from a core budget instead:
+
+    threads per process = --threads, or cpu_budget // workers
+
+and an explicit --threads that would exceed the budget is clamped. I/O
+threads spend their time blocked on the filesystem and are not counted
+against the core budget; --io-threads sets them explicitly.
+"""
+
+import contextlib
+import logging
+import os
+from typing import Iterator, Optional  # noqa: F401
+
+logger = logging.getLogger("csvconv")
+
+
+def available_cores():
+    # type: () -> int
+    """Cores this process may run on (CPU affinity aware)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def plan_threads(workers=1, threads=None, cpu_budget=None):
+    # type: (int, Optional[int], Optional[int]) -> Optional[int]
+    """Return the Arrow CPU thread count for each of workers processes.
+
+    Args:
+        workers: Conversion processes sharing the budget.
+        threads: Requested threads per process, or None.
+        cpu_budget: Total cores for all processes (default: available cores).
+
+    Returns:
+        Threads per process, or None to leave Arrow's default untouched
+        (single process, nothing requested).
+    """
+    workers = max(1, workers or 1)
+    if threads is None and cpu_budget is None and workers == 1:
+        return None
+
+    budget = cpu_budget or available_cores()
+    if workers > budget:
+        logger.warning("%d workers exceed the core budget of %d; using 1 thread each", workers, budget)
+    per_worker = max(1, budget // workers)
+    if threads is None:
+        return per_worker
+    if threads > per_worker:
+        logger.warning(
+            "--threads %d x %d worker(s) exceeds the core budget of %d; using %d", threads, workers, budget, per_worker
+        )
+        return per_worker
+    return threads
+
+
+def apply_thread_limits(threads=None, io_threads=None):
+    # type: (Optional[int], Optional[int]) -> None
+    """Size Arrow's CPU and I/O thread pools in this process."""
+    import pyarrow as pa
+
+    if threads is not None and pa.cpu_count() != threads:
+        pa.set_cpu_count(threads)
+        logger.debug("Arrow CPU threads: %d", threads)
+    if io_threads is not None and pa.io_thread_count() != io_threads:
+        pa.set_io_thread_count(io_threads)
+        logger.debug("Arrow I/O threads: %d", io_threads)
+
+
+@contextlib.contextmanager
+def scoped_thread_limits(threads=None, io_threads=None):
+    # type: (Optional[int], Optional[int]) -> Iterator[None]
+    """apply_thread_limits() for the duration of the block.
+
+    Both pool sizes are set back to their previous values afterwards, so a
+    long-lived process (daemon or watch worker) does not keep the thread
+    counts of one conversion for the next.
+    """
+    import pyarrow as pa
+
+    previous = pa.cpu_count(), pa.io_thread_count()
+    apply_thread_limits(threads, io_threads)
+    try:
+        yield
+    finally:
+        apply_thread_limits(*previous)
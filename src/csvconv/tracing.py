@@ -0,0 +1,97 @@
+"""Chrome trace-event recording for ``--trace``.
+
+Spans are recorded as complete ("X") events in the Chrome trace-event JSON
+format, which Perfetto (ui.perfetto.dev) and chrome://tracing open directly.
+Stage spans come from StageTimer laps and file spans from file_metrics(), so
+the pipelines need no extra instrumentation; writers add fsync/rename spans.
+
+While recording is off, StageTimer skips tracing behind a single boolean
+check and span() returns a shared no-op context manager.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Optional  # noqa: F401
+
+recording = False
+_events = []  # type: list
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def start():
+    # type: () -> None
+    """Start recording in this process, discarding earlier events."""
+    global recording, _events
+    _events = []
+    recording = True
+
+
+def stop():
+    # type: () -> list
+    """Stop recording and return the recorded events."""
+    global recording, _events
+    recording = False
+    events, _events = _events, []
+    return events
+
+
+def add_events(events):
+    # type: (list) -> None
+    """Merge events recorded in another process (e.g. a pool worker)."""
+    if recording:
+        _events.extend(events)
+
+
+def complete(name, start_time, end_time, cat="stage", args=None):
+    # type: (str, float, float, str, Optional[dict]) -> None
+    """Record a span between two time.perf_counter() readings."""
+    if not recording:
+        return
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": round(start_time * 1e6, 3),
+        "dur": round((end_time - start_time) * 1e6, 3),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "_start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        complete(self.name, self._start, time.perf_counter(), self.cat, self.args)
+        return False
+
+
+def span(name, cat="io", **args):
+    """Context manager recording a span named name while recording is on."""
+    if not recording:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def write_trace(path, events):
+    # type: (str, list) -> None
+    """Write events as a Chrome trace-event JSON file (atomically)."""
+    from csvconv.report import atomic_write_text
+
+    atomic_write_text(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n")
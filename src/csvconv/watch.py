@@ -0,0 +1,308 @@
+"""Drop-zone directory watcher for continuous ingestion.
+
+``csvconv watch --input DIR --output DIR`` converts CSV and tar.gz files as
+they land in DIR (top level only). A file is considered complete when
+
+  - a marker file ``<name><marker_suffix>`` exists (when marker_suffix is
+    set), or otherwise
+  - its size is unchanged between two scans and its mtime is at least
+    settle_seconds old.
+
+inotify (Linux, via ctypes) wakes the loop early on local filesystems; the
+periodic rescan every poll_interval seconds is what makes NFS work, where
+remote writes raise no inotify events.
+
+Completed files are converted on a warm process pool with at most `workers`
+conversions in flight. Every outcome is appended to a JSON-lines ledger so a
+file is never converted twice (a file replaced under the same name, with a
+new size or mtime, is converted again); successfully converted inputs can
+additionally be moved to done_dir. A worker that dies (e.g. OOM-killed)
+fails its file and the pool is replaced, so ingestion carries on.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import shutil
+import threading
+import time
+
+from csvconv import parallel
+from csvconv.summary import ConversionSummary
+
+logger = logging.getLogger("csvconv")
+
+_LEDGER_NAME = ".csvconv-watch.jsonl"
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+class _Inotify:
+    """Minimal inotify wrapper used only as a wake-up signal."""
+
+    def __init__(self, path):
+        # type: (str) -> None
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+        if libc.inotify_add_watch(self._fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch failed for {}".format(path))
+
+    def wait(self, timeout):
+        # type: (float) -> bool
+        """Block until an event arrives or timeout elapses; drain pending events."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self._fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self._fd)
+
+
+def _file_key(name, st):
+    # type: (str, os.stat_result) -> str
+    return "{}:{}:{}".format(name, st.st_size, st.st_mtime_ns)
+
+
+class DropZoneWatcher:
+    """Watch a directory and convert completed files exactly once.
+
+    Args:
+        input_dir: Landing directory to watch (top level only).
+        output_dir: Where outputs are written, named as for directory inputs.
+        convert_options: convert() keyword arguments applied to every file
+                         (input_path/output_path/input_type are filled in).
+        workers: Maximum conversions in flight.
+        poll_interval: Seconds between rescans.
+        settle_seconds: Minimum mtime age before a file counts as complete.
+        marker_suffix: If set, only files with a matching marker are picked up.
+        done_dir: If set, successfully converted inputs are moved here.
+        state_file: Ledger path (default: <output_dir>/.csvconv-watch.jsonl).
+        use_inotify: Use inotify wake-ups when available.
+    """
+
+    def __init__(
+        self,
+        input_dir,
+        output_dir,
+        convert_options=None,
+        workers=1,
+        poll_interval=5.0,
+        settle_seconds=10.0,
+        marker_suffix=None,
+        done_dir=None,
+        state_file=None,
+        use_inotify=True,
+    ):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.convert_options = dict(convert_options or {})
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.marker_suffix = marker_suffix
+        self.done_dir = done_dir
+        self.state_file = state_file or os.path.join(output_dir, _LEDGER_NAME)
+        self.use_inotify = use_inotify
+        self.summary = ConversionSummary()
+
+        self._stop = threading.Event()
+        self._sizes = {}  # type: dict
+        self._processed = set()  # type: set
+        self._inflight = {}  # type: dict
+        self._pool = None
+        self._load_ledger()
+
+    def stop(self):
+        # type: () -> None
+        """Ask run() to return after in-flight conversions finish."""
+        self._stop.set()
+
+    def _load_ledger(self):
+        if not os.path.exists(self.state_file):
+            return
+        with open(self.state_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self._processed.add(json.loads(line)["key"])
+
+    def _record(self, key, name, status, reason=None):
+        entry = {"key": key, "file": name, "status": status, "time": time.time()}
+        if reason:
+            entry["reason"] = reason
+        with open(self.state_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._processed.add(key)
+
+    def scan(self):
+        # type: () -> tuple
+        """Return (ready, settling): completed files and files still being written.
+
+        ready is a list of (name, key) tuples in name order.
+        """
+        now = time.time()
+        ready, settling = [], 0
+        sizes = {}
+        for entry in sorted(os.scandir(self.input_dir), key=lambda e: e.name):
+            name = entry.name
+            if name.startswith(".") or not entry.is_file() or not parallel.has_input_extension(name):
+                continue
+            st = entry.stat()
+            key = _file_key(name, st)
+            if key in self._processed or name in self._inflight:
+                continue
+            sizes[name] = st.st_size
+
+            if self.marker_suffix:
+                if os.path.exists(os.path.join(self.input_dir, name + self.marker_suffix)):
+                    ready.append((name, key))
+                continue
+            if self._sizes.get(name) == st.st_size and now - st.st_mtime >= self.settle_seconds:
+                ready.append((name, key))
+            else:
+                settling += 1
+        self._sizes = sizes
+        return ready, settling
+
+    def _new_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        from csvconv.daemon import warm_worker
+
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+
+    def _submit(self, name, key):
+        path = os.path.join(self.input_dir, name)
+        input_type = parallel.detect_input_type(name)
+        kwargs = dict(self.convert_options)
+        output_type = kwargs.get("output_type", "parquet")
+        if kwargs.get("partition_by") and output_type == "parquet":
+            # Every file adds its rows to the one dataset at output_dir
+            output_path = self.output_dir
+        else:
+            output_path = parallel.output_path_for(
+                path, self.output_dir, input_type, output_type, merge=kwargs.get("merge", False)
+            )
+        kwargs.update(
+            input_path=path,
+            output_path=output_path,
+            input_type=input_type,
+        )
+        logger.info("Picked up %s", path)
+        from concurrent.futures.process import BrokenProcessPool
+
+        task = parallel.make_task(kwargs)
+        try:
+            future = self._pool.submit(parallel.run_task, task)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); its file was recorded as failed
+            logger.warning("Worker pool broken; starting a new one")
+            self._pool.shutdown(wait=False)
+            self._pool = self._new_pool()
+            future = self._pool.submit(parallel.run_task, task)
+        self._inflight[name] = (future, key)
+
+    def _collect(self, block):
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        if not self._inflight:
+            return
+        futures = [f for f, _ in self._inflight.values()]
+        done, _ = wait(futures, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for name, (future, key) in list(self._inflight.items()):
+            if future not in done:
+                continue
+            del self._inflight[name]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = ConversionSummary()
+                result.record_failure(name, str(e))
+            self.summary.merge(result)
+            if result.total_failure:
+                reason = "; ".join(f["reason"] for f in result.failures)
+                self._record(key, name, "failure", reason)
+                logger.error("Failed to ingest %s: %s", name, reason)
+            else:
+                self._record(key, name, "success")
+                self._finish(name)
+
+    def _finish(self, name):
+        if not self.done_dir:
+            return
+        try:
+            os.makedirs(self.done_dir, exist_ok=True)
+            shutil.move(os.path.join(self.input_dir, name), os.path.join(self.done_dir, name))
+            if self.marker_suffix:
+                marker = os.path.join(self.input_dir, name + self.marker_suffix)
+                if os.path.exists(marker):
+                    os.unlink(marker)
+        except OSError as e:
+            # The ledger already holds the file, so it is not converted again
+            logger.error("Cannot move %s to %s: %s", name, self.done_dir, e)
+
+    def run(self, once=False):
+        # type: (bool) -> ConversionSummary
+        """Watch until stop() is called (or, with once, until the zone is drained).
+
+        Returns:
+            ConversionSummary over every file converted during this run.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        notifier = None
+        if self.use_inotify:
+            try:
+                notifier = _Inotify(self.input_dir)
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable (%s); polling every %ss", e, self.poll_interval)
+
+        self._pool = self._new_pool()
+        try:
+            while not self._stop.is_set():
+                self._collect(block=False)
+                ready, settling = self.scan()
+                for name, key in ready:
+                    if len(self._inflight) >= self.workers:
+                        break
+                    self._submit(name, key)
+
+                if once and not ready and not settling and not self._inflight:
+                    break
+                if len(self._inflight) >= self.workers:
+                    self._collect(block=True)
+                    continue
+
+                timeout = min(self.poll_interval, 0.2) if (self._inflight or settling) else self.poll_interval
+                if notifier is not None:
+                    notifier.wait(min(timeout, 1.0))
+                else:
+                    self._stop.wait(timeout)
+            while self._inflight:
+                self._collect(block=True)
+        finally:
+            self._pool.shutdown(wait=True)
+            if notifier is not None:
+                notifier.close()
+        return self.summary
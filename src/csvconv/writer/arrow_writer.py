@@ -0,0 +1,142 @@
+"""Incremental Arrow IPC (Feather v2) writer using PyArrow.
+
+The IPC file format stores record batches in Arrow's in-memory layout, so
+Arrow-native consumers can memory-map the output without decoding it.
+Buffers are optionally compressed with lz4 or zstd.
+
+The file format allows a single dictionary per column (no replacement
+between batches), while every CSV block comes with its own dictionary.
+Each block is therefore unified against the dictionary written so far
+and only the new values are emitted, as a dictionary delta.
+"""
+
+from typing import Optional  # noqa: F401
+
+import pyarrow as pa
+
+from csvconv.errors import InputValidationError
+from csvconv.memory import RELEASE_INTERVAL_BYTES, release_unused
+from csvconv.writer.atomic import AtomicFileWriter
+from csvconv.writer.sorting import check_sort_columns, sort_table
+
+# Buffer codecs supported by the IPC format ("none" writes uncompressed)
+ARROW_COMPRESSIONS = ("lz4", "zstd", "none")
+
+
+class IncrementalArrowWriter(AtomicFileWriter):
+    """Write RecordBatches incrementally to an Arrow IPC file.
+
+    compression picks the buffer codec ("lz4" or "zstd"; uncompressed when
+    None or "none") at compression_level (zstd only). row_group_size caps
+    the rows per record batch in the file. With sort_by, each batch is
+    sorted by those columns before it is written. Published atomically
+    like IncrementalParquetWriter (see AtomicFileWriter).
+    """
+
+    format_name = "Arrow"
+
+    def __init__(
+        self,
+        output_path,
+        schema,
+        row_group_size=None,
+        compression=None,
+        compression_level=None,
+        sort_by=None,
+        defer_publish=False,
+        s3=None,
+        write_behind=False,
+    ):
+        # type: (str, pa.Schema, Optional[int], Optional[str], Optional[int], Optional[list], bool, S3Settings, bool) -> None
+        if compression is not None and compression not in ARROW_COMPRESSIONS:
+            raise InputValidationError(
+                "Unsupported Arrow compression: {}. Allowed: {}".format(compression, ", ".join(ARROW_COMPRESSIONS))
+            )
+        self._schema = schema
+        self._row_group_size = row_group_size
+        self._sort_by = list(sort_by) if sort_by else None
+        if self._sort_by:
+            check_sort_columns(schema, self._sort_by)
+        super().__init__(
+            output_path, suffix=".arrow.tmp", defer_publish=defer_publish, s3=s3, write_behind=write_behind
+        )
+
+        codec = None
+        if compression not in (None, "none"):
+            codec = pa.Codec(compression, compression_level) if compression_level else compression
+        options = pa.ipc.IpcWriteOptions(compression=codec, emit_dictionary_deltas=True)
+        self._dictionary_columns = [i for i, field in enumerate(schema) if pa.types.is_dictionary(field.type)]
+        self._dictionaries = {}  # type: dict
+        self._rows = 0
+        self._unreleased_bytes = 0
+        self._file = None
+        self._writer = None
+        try:
+            if self._upload is None:
+                self._file = pa.OSFile(self._tmp_path, "wb")
+            else:
+                self._file = pa.PythonFile(self._upload, mode="w")
+            self._writer = pa.ipc.new_file(self._file, schema, options=options)
+        except Exception:
+            self.abort()
+            raise
+
+    @property
+    def rows_written(self):
+        # type: () -> int
+        """Rows written so far."""
+        return self._rows
+
+    def write_batch(self, batch):
+        # type: (pa.RecordBatch) -> None
+        """Write a RecordBatch to the Arrow file."""
+        if self._closed:
+            raise RuntimeError("Writer is already closed")
+        table = pa.Table.from_batches([batch])
+        if not table.schema.equals(self._schema):
+            table = self._conform(table, self._schema)
+        if self._sort_by:
+            table = sort_table(table, self._sort_by)
+        if self._dictionary_columns:
+            table = self._delta_dictionaries(table.combine_chunks())
+        self._writer.write_table(table, max_chunksize=self._row_group_size)
+        self._rows += table.num_rows
+        self._written()
+        self._unreleased_bytes += batch.nbytes
+        if self._unreleased_bytes >= RELEASE_INTERVAL_BYTES:
+            self._unreleased_bytes = 0
+            release_unused(self._output_path)
+
+    def _delta_dictionaries(self, table):
+        # type: (pa.Table) -> pa.Table
+        """Re-index dictionary columns so each dictionary extends the previous one."""
+        for i in self._dictionary_columns:
+            column = table.column(i)
+            if column.num_chunks != 1:
+                continue
+            written = self._dictionaries.get(i)
+            if written is None:
+                self._dictionaries[i] = column.chunk(0).dictionary
+                continue
+            # Unification keeps the first chunk's values (and indices) first,
+            # so the dictionary written so far stays a prefix
+            anchor = pa.DictionaryArray.from_arrays(pa.array([], column.type.index_type), written)
+            unified = pa.chunked_array([anchor, column.chunk(0)]).unify_dictionaries().chunk(1)
+            self._dictionaries[i] = unified.dictionary
+            table = table.set_column(i, table.field(i), unified)
+        return table
+
+    def _finish(self):
+        # type: () -> None
+        self._writer.close()
+        self._file.close()
+
+    def _discard(self):
+        # type: () -> None
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+        if self._file is not None:
+            self._file.close()
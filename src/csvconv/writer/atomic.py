@@ -0,0 +1,212 @@
+"""Atomic publication shared by the columnar file writers.
+
+Every writer streams into a temp file next to its output path and only
+publishes it on a successful close: fsync the temp file (NFS safety), then
+os.replace it onto the output path, so readers never see a partial file.
+On error the temp file is removed instead. An ``s3://`` output path streams
+into a multipart upload that is completed on publish and aborted on error
+(see csvconv.s3). With write_behind, the temp file is written back and
+evicted from the page cache chunk by chunk while it is written, so the
+fsync only flushes the tail (see writer.writebehind).
+"""
+
+import os
+import tempfile
+
+from csvconv import tracing
+from csvconv.errors import SchemaMismatchError
+from csvconv.s3 import is_s3_uri
+from csvconv.schema.validation import types_compatible
+from csvconv.writer.writebehind import open_write_behind
+
+
+class AtomicFileWriter:
+    """Base class for writers with the temp file -> fsync -> os.replace lifecycle.
+
+    Subclasses write to self._sink, the temp file path or for S3 output a
+    writable MultipartUpload, and implement _finish() (flush and close the
+    format writer) and _discard() (close it after an error), and call
+    _written() after each write to the sink. With
+    defer_publish, close() only finishes the temp file and the caller
+    publishes it later, typically together with other small files through
+    publish_all(). An S3 upload uses the s3 settings (defaults when None);
+    write_behind applies to local temp files.
+    """
+
+    # Format label used in error messages
+    format_name = "output"
+
+    def __init__(self, output_path, suffix=".tmp", defer_publish=False, s3=None, write_behind=False):
+        # type: (str, str, bool, S3Settings, bool) -> None
+        self._output_path = output_path
+        self._defer_publish = defer_publish
+        self._closed = False
+        self._upload = None
+        self._tmp_path = None
+        self._write_behind = None
+        if is_s3_uri(output_path):
+            from csvconv.s3.upload import MultipartUpload
+
+            self._upload = self._sink = MultipartUpload(output_path, settings=s3)
+            return
+
+        # Validate output directory exists
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.isdir(output_dir):
+            raise FileNotFoundError("Output directory does not exist: {}".format(output_dir))
+
+        # Write to temp file for NFS-safe atomic write
+        self._output_dir = output_dir or "."
+        self._tmp_fd, self._tmp_path = tempfile.mkstemp(dir=self._output_dir, suffix=suffix)
+        os.close(self._tmp_fd)
+        self._sink = self._tmp_path
+        self._write_behind = open_write_behind(self._tmp_path, write_behind)
+
+    @property
+    def remote(self):
+        # type: () -> bool
+        """Whether the output goes to an object store."""
+        return self._upload is not None
+
+    @property
+    def bytes_written(self):
+        # type: () -> int
+        """Size of the output written so far (of the temp file while local)."""
+        if self._upload is not None:
+            return self._upload.tell()
+        if not os.path.exists(self._tmp_path):
+            return 0
+        return os.path.getsize(self._tmp_path)
+
+    def _conform(self, table, schema):
+        # type: (pa.Table, pa.Schema) -> pa.Table
+        """Cast table to schema across dictionary/plain differences."""
+        names = table.schema.names
+        if names != schema.names or not all(
+            types_compatible(expected.type, actual.type) for expected, actual in zip(schema, table.schema)
+        ):
+            raise SchemaMismatchError(
+                "Batch schema does not match the {} file schema".format(self.format_name),
+                expected=schema,
+                actual=table.schema,
+            )
+        return table.cast(schema)
+
+    def _written(self):
+        # type: () -> None
+        """Write back the temp file chunks completed by the last write (write-behind)."""
+        if self._write_behind is not None:
+            self._write_behind.update()
+
+    def _close_write_behind(self):
+        # type: () -> None
+        if self._write_behind is not None:
+            self._write_behind.close()
+            self._write_behind = None
+
+    def _finish(self):
+        # type: () -> None
+        raise NotImplementedError
+
+    def _discard(self):
+        # type: () -> None
+        raise NotImplementedError
+
+    def close(self):
+        # type: () -> None
+        """Close the writer and atomically move to final path."""
+        if self._closed:
+            return
+        self._finish()
+        self._close_write_behind()
+        self._closed = True
+        if not self._defer_publish:
+            self.publish()
+
+    def publish(self):
+        # type: () -> None
+        """fsync the closed temp file and rename it to the output path.
+
+        The temp file is removed if this fails.
+        """
+        failed = publish_all([self])
+        if failed:
+            self._remove_temp()
+            raise failed[self]
+
+    def abort(self):
+        # type: () -> None
+        """Close the writer and discard the temp file without publishing it."""
+        self._discard()
+        self._closed = True
+        self._close_write_behind()
+        self._remove_temp()
+
+    def _remove_temp(self):
+        # type: () -> None
+        """Delete the temp file (abort the upload for S3 output)."""
+        if self._upload is not None:
+            self._upload.abort()
+        elif os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
+
+def publish_all(writers):
+    # type: (list) -> dict
+    """Publish closed AtomicFileWriters as one group.
+
+    The fsyncs run after the whole group was written rather than after each
+    file, so background writeback of the earlier files overlaps writing the
+    later ones and most fsyncs find their data already on disk. Each file
+    still appears under its final name only once it is durable. Uploads of
+    S3 outputs are completed concurrently.
+
+    Each writer is published or fails on its own, so a failure never leaves
+    the outputs of the others half-accounted for. A failed writer keeps its
+    temp file (its upload is aborted) for the caller to abort().
+
+    Returns:
+        {writer: error} of the writers that could not be published.
+    """
+    failed = {}  # type: dict
+    remote = [writer for writer in writers if writer._upload is not None]
+    if remote:
+        from csvconv.s3.upload import commit_all
+
+        with tracing.span("upload"):
+            errors = commit_all([writer._upload for writer in remote])
+        failed.update((writer, e) for writer, e in zip(remote, errors) if e is not None)
+    writers = [writer for writer in writers if writer._upload is None]
+
+    # fsync for NFS safety
+    with tracing.span("fsync"):
+        for writer in writers:
+            try:
+                fd = os.open(writer._tmp_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                failed[writer] = e
+
+    # Atomic rename
+    with tracing.span("rename"):
+        for writer in writers:
+            if writer in failed:
+                continue
+            try:
+                os.replace(writer._tmp_path, writer._output_path)
+            except OSError as e:
+                failed[writer] = e
+    return failed
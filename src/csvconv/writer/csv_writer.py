@@ -4,16 +4,31 @@ import gzip
 import io
 import os
 import tempfile
+from typing import Iterator, Optional  # noqa: F401
 
-import pyarrow as pa
-import pyarrow.csv as pcsv
+from csvconv import tracing
+from csvconv.writer.parts import part_path
+from csvconv.writer.writebehind import open_write_behind
 
 
 _CHUNK_SIZE = 64 * 1024  # 64KB
 
 
-def extract_stream(source, output_path, gzip_compress=False):
-    # type: (io.IOBase, str, bool) -> None
+def _publish(tmp_path, output_path):
+    # type: (str, str) -> None
+    """fsync tmp_path and atomically rename it to output_path."""
+    with tracing.span("fsync"):
+        fd = os.open(tmp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    with tracing.span("rename"):
+        os.replace(tmp_path, output_path)
+
+
+def extract_stream(source, output_path, gzip_compress=False, write_behind=False):
+    # type: (io.IOBase, str, bool, bool) -> None
     """Raw byte-fidelity extraction from a binary stream to a file.
 
     Uses NFS-safe atomic write pattern: temp file -> fsync -> os.replace().
@@ -23,10 +38,13 @@ def extract_stream(source, output_path, gzip_compress=False):
         source: A binary stream (BytesIO or file-like object).
         output_path: Destination file path.
         gzip_compress: If True, wrap output in gzip compression.
+        write_behind: If True, flush the temp file while it is copied
+                      (see writer.writebehind).
     """
     output_dir = os.path.dirname(output_path) or "."
     fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".csv.tmp")
     os.close(fd)
+    tracker = open_write_behind(tmp_path, write_behind)
 
     try:
         if gzip_compress:
@@ -36,6 +54,8 @@ def extract_stream(source, output_path, gzip_compress=False):
                     if not chunk:
                         break
                     gz_out.write(chunk)
+                    if tracker is not None:
+                        tracker.update()
         else:
             with open(tmp_path, "wb") as f_out:
                 while True:
@@ -43,25 +63,24 @@ def extract_stream(source, output_path, gzip_compress=False):
                     if not chunk:
                         break
                     f_out.write(chunk)
+                    if tracker is not None:
+                        tracker.update()
 
-        # fsync for NFS safety
-        fd = os.open(tmp_path, os.O_RDONLY)
-        try:
-            os.fsync(fd)
-        finally:
-            os.close(fd)
-
-        # Atomic rename
-        os.replace(tmp_path, output_path)
+        # fsync for NFS safety, then atomic rename
+        _publish(tmp_path, output_path)
 
     except Exception:
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
         raise
 
+    finally:
+        if tracker is not None:
+            tracker.close()
+
 
-def write_csv(batches, output_path, gzip_compress=False):
-    # type: (object, str, bool) -> None
+def write_csv(batches, output_path, gzip_compress=False, write_behind=False):
+    # type: (object, str, bool, bool) -> None
     """Write an iterator of PyArrow RecordBatches as CSV.
 
     Uses NFS-safe atomic write pattern: temp file -> fsync -> os.replace().
@@ -70,10 +89,17 @@ def write_csv(batches, output_path, gzip_compress=False):
         batches: Iterator of pyarrow.RecordBatch objects.
         output_path: Destination file path.
         gzip_compress: If True, gzip compress the output.
+        write_behind: If True, flush the temp file while it is written
+                      (see writer.writebehind).
     """
+    # Deferred so raw extraction (extract_stream) never loads PyArrow
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+
     output_dir = os.path.dirname(output_path) or "."
     fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".csv.tmp")
     os.close(fd)
+    tracker = open_write_behind(tmp_path, write_behind)
 
     try:
         header_written = False
@@ -98,20 +124,101 @@ def write_csv(batches, output_path, gzip_compress=False):
                 buf.seek(0)
                 out_file.write(buf.read())
                 header_written = True
+                if tracker is not None:
+                    tracker.update()
         finally:
             out_file.close()
 
-        # fsync for NFS safety
-        fd = os.open(tmp_path, os.O_RDONLY)
-        try:
-            os.fsync(fd)
-        finally:
-            os.close(fd)
-
-        # Atomic rename
-        os.replace(tmp_path, output_path)
+        # fsync for NFS safety, then atomic rename
+        _publish(tmp_path, output_path)
 
     except Exception:
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
         raise
+
+    finally:
+        if tracker is not None:
+            tracker.close()
+
+
+def _records(source):
+    # type: (io.IOBase) -> Iterator[bytes]
+    """Yield complete CSV records (lines joined while inside quotes)."""
+    pending = []
+    quotes = 0
+    for line in source:
+        pending.append(line)
+        # Escaped quotes are doubled, so an odd total means an open field
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            yield b"".join(pending) if len(pending) > 1 else line
+            pending = []
+            quotes = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def extract_stream_rolling(source, output_path, gzip_compress=False, max_file_rows=None,
+                           max_file_bytes=None, write_behind=False):
+    # type: (io.IOBase, str, bool, Optional[int], Optional[int], bool) -> list
+    """Extract a CSV stream into numbered part files, each with the header.
+
+    A part is closed once it holds max_file_rows data rows or max_file_bytes
+    bytes on disk (compressed size when gzip_compress), always at a record
+    boundary (quoted fields with embedded newlines are kept whole). Each
+    part is written with the temp file -> fsync -> os.replace() pattern and
+    named with parts.part_path (out.csv -> out-part-00000.csv). If the
+    extraction fails, the parts already published are removed again.
+    write_behind flushes each part while it is written (see
+    writer.writebehind).
+
+    Returns:
+        [{"path", "rows", "bytes"}] for the parts, in order.
+    """
+    output_dir = os.path.dirname(output_path) or "."
+    records = _records(source)
+    header = next(records, b"")
+    parts = []  # type: list
+    tmp_path = None
+    try:
+        while True:
+            record = next(records, None)
+            if record is None and parts:
+                break
+            path = part_path(output_path, len(parts))
+            fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".csv.tmp")
+            rows = 0
+            tracker = open_write_behind(tmp_path, write_behind)
+            with os.fdopen(fd, "wb") as raw:
+                out = gzip.GzipFile(fileobj=raw, mode="wb") if gzip_compress else raw
+                try:
+                    out.write(header)
+                    while record is not None:
+                        out.write(record)
+                        rows += 1
+                        if max_file_rows and rows >= max_file_rows:
+                            break
+                        if max_file_bytes and raw.tell() >= max_file_bytes:
+                            break
+                        if tracker is not None and rows % 1024 == 0:
+                            tracker.update()
+                        record = next(records, None)
+                finally:
+                    if gzip_compress:
+                        out.close()
+                    if tracker is not None:
+                        tracker.close()
+            _publish(tmp_path, path)
+            tmp_path = None
+            parts.append({"path": path, "rows": rows, "bytes": os.path.getsize(path)})
+            if record is None:
+                break
+    except Exception:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        for part in parts:
+            if os.path.exists(part["path"]):
+                os.unlink(part["path"])
+        raise
+    return parts
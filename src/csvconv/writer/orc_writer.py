@@ -0,0 +1,119 @@
+"""Incremental ORC writer using PyArrow."""
+
+from typing import Optional  # noqa: F401
+
+import pyarrow as pa
+
+from csvconv.errors import InputValidationError
+from csvconv.memory import RELEASE_INTERVAL_BYTES, release_unused
+from csvconv.writer.atomic import AtomicFileWriter
+from csvconv.writer.sorting import check_sort_columns, sort_table
+
+# --compression names -> ORC codecs
+ORC_COMPRESSIONS = {
+    "snappy": "snappy",
+    "gzip": "zlib",
+    "zstd": "zstd",
+    "lz4": "lz4",
+    "none": "uncompressed",
+}
+
+
+def orc_schema(schema):
+    # type: (pa.Schema) -> pa.Schema
+    """schema with dictionary columns as their value type.
+
+    ORC encodes low-cardinality strings with its own dictionaries, and the
+    writer does not accept Arrow dictionary columns.
+    """
+    for i, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(field.type.value_type))
+    return schema
+
+
+class IncrementalOrcWriter(AtomicFileWriter):
+    """Write RecordBatches incrementally to an ORC file.
+
+    compression picks the ORC codec by its --compression name ("gzip" is
+    ORC's zlib; snappy when None). row_group_size sets the writer's batch
+    size in rows. Dictionary-encoded columns are written as their value
+    type (see orc_schema). With sort_by, each batch is sorted by those
+    columns before it is written. Published atomically like
+    IncrementalParquetWriter (see AtomicFileWriter).
+    """
+
+    format_name = "ORC"
+
+    def __init__(
+        self,
+        output_path,
+        schema,
+        row_group_size=None,
+        compression=None,
+        sort_by=None,
+        defer_publish=False,
+        s3=None,
+        write_behind=False,
+    ):
+        # type: (str, pa.Schema, Optional[int], Optional[str], Optional[list], bool, S3Settings, bool) -> None
+        if compression is not None and compression not in ORC_COMPRESSIONS:
+            raise InputValidationError(
+                "Unsupported ORC compression: {}. Allowed: {}".format(compression, ", ".join(ORC_COMPRESSIONS))
+            )
+        self._schema = schema
+        self._file_schema = orc_schema(schema)
+        self._sort_by = list(sort_by) if sort_by else None
+        if self._sort_by:
+            check_sort_columns(schema, self._sort_by)
+        super().__init__(output_path, suffix=".orc.tmp", defer_publish=defer_publish, s3=s3, write_behind=write_behind)
+
+        from pyarrow import orc
+
+        kwargs = {"compression": ORC_COMPRESSIONS[compression or "snappy"]}  # type: dict
+        if row_group_size is not None:
+            kwargs["batch_size"] = row_group_size
+        self._rows = 0
+        self._unreleased_bytes = 0
+        self._writer = None
+        try:
+            self._writer = orc.ORCWriter(self._sink, **kwargs)
+        except Exception:
+            self.abort()
+            raise
+
+    @property
+    def rows_written(self):
+        # type: () -> int
+        """Rows written so far."""
+        return self._rows
+
+    def write_batch(self, batch):
+        # type: (pa.RecordBatch) -> None
+        """Write a RecordBatch to the ORC file."""
+        if self._closed:
+            raise RuntimeError("Writer is already closed")
+        table = pa.Table.from_batches([batch])
+        if not table.schema.equals(self._file_schema):
+            table = self._conform(table, self._file_schema)
+        if self._sort_by:
+            table = sort_table(table, self._sort_by)
+        self._writer.write(table)
+        self._rows += table.num_rows
+        self._written()
+        self._unreleased_bytes += batch.nbytes
+        if self._unreleased_bytes >= RELEASE_INTERVAL_BYTES:
+            self._unreleased_bytes = 0
+            release_unused(self._output_path)
+
+    def _finish(self):
+        # type: () -> None
+        if self._rows == 0:
+            # The ORC writer only records the schema with the first table
+            self._writer.write(self._file_schema.empty_table())
+        self._writer.close()
+
+    def _discard(self):
+        # type: () -> None
+        if self._writer is not None:
+            self._writer.close()
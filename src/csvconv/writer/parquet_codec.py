@@ -0,0 +1,203 @@
+"""Parquet codec autotuning for --compression auto.
+
+A sample of the first blocks is written in memory with every CANDIDATES
+codec/level; encode throughput (Arrow bytes per second) and compression
+ratio are measured and the winner depends on the objective:
+
+  - speed     highest throughput
+  - size      smallest output
+  - balanced  smallest output among candidates at least BALANCED_FRACTION
+              as fast as the fastest
+
+Candidates slower than min_throughput_mbps are discarded first (if none is
+fast enough the fastest is used). The choice is cached per schema
+fingerprint and objective in $XDG_CACHE_HOME/csvconv/codecs.json, so later
+runs of the same feed skip the trial. Writers hold an flock on a sidecar
+lock file while merging their entry, so parallel workers do not drop each
+other's choices.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional  # noqa: F401
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from csvconv.report import atomic_write_text
+
+logger = logging.getLogger("csvconv")
+
+OBJECTIVES = ("speed", "size", "balanced")
+
+# (codec, level); None leaves the codec's default level
+CANDIDATES = (
+    ("snappy", None),
+    ("lz4", None),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 9),
+    ("gzip", 6),
+    ("brotli", 1),
+    ("brotli", 5),
+)
+
+BALANCED_FRACTION = 0.5
+
+TRIAL_SAMPLE_BYTES = 4 * 1024 * 1024
+
+_MB = 1024.0 * 1024.0
+
+
+class CodecChoice:
+    """A codec/level and the throughput and ratio it reached on the sample."""
+
+    def __init__(self, compression, level, mb_per_s, ratio, cached=False):
+        # type: (str, int, float, float, bool) -> None
+        self.compression = compression
+        self.level = level
+        self.mb_per_s = mb_per_s
+        self.ratio = ratio
+        self.cached = cached
+
+    def as_dict(self):
+        # type: () -> dict
+        return {
+            "compression": self.compression,
+            "level": self.level,
+            "mb_per_s": self.mb_per_s,
+            "ratio": self.ratio,
+        }
+
+    def __repr__(self):
+        level = "" if self.level is None else "({})".format(self.level)
+        return "{}{}".format(self.compression, level)
+
+
+def default_cache_path():
+    # type: () -> str
+    """Location of the codec choice cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "csvconv", "codecs.json")
+
+
+def schema_fingerprint(schema):
+    # type: (pa.Schema) -> str
+    """Stable hash of column names and types (metadata ignored)."""
+    text = "\n".join("{}:{}".format(field.name, field.type) for field in schema)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_key(schema, optimize, min_throughput_mbps):
+    return "{}:{}:{}".format(schema_fingerprint(schema), optimize, min_throughput_mbps or 0)
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+@contextlib.contextmanager
+def _locked(path):
+    """Hold an exclusive flock on path + ".lock" (no-op without fcntl)."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _store(path, key, entry):
+    # type: (str, str, dict) -> None
+    """Add one entry to the cache, keeping those written by other processes."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _locked(path):
+        cache = _load_cache(path)
+        cache[key] = entry
+        atomic_write_text(path, json.dumps(cache, indent=2, sort_keys=True) + "\n")
+
+
+def trial(sample, compression, level):
+    # type: (pa.Table, str, int) -> tuple
+    """Write sample with one codec in memory; return (mb_per_s, ratio)."""
+    sink = pa.BufferOutputStream()
+    start = time.perf_counter()
+    pq.write_table(sample, sink, compression=compression, compression_level=level)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    size = sink.getvalue().size
+    return sample.nbytes / _MB / elapsed, sample.nbytes / float(size)
+
+
+def pick(results, optimize="balanced", min_throughput_mbps=None):
+    # type: (list, str, Optional[float]) -> CodecChoice
+    """Select from trial results ([CodecChoice]) by objective and constraint."""
+    if optimize not in OBJECTIVES:
+        raise ValueError("Unknown optimization objective: {}".format(optimize))
+    fastest = max(results, key=lambda r: r.mb_per_s)
+    eligible = results
+    if min_throughput_mbps:
+        eligible = [r for r in results if r.mb_per_s >= min_throughput_mbps]
+        if not eligible:
+            logger.warning(
+                "No codec reaches %.1f MB/s; using the fastest, %r (%.1f MB/s)",
+                min_throughput_mbps,
+                fastest,
+                fastest.mb_per_s,
+            )
+            return fastest
+    if optimize == "speed":
+        return max(eligible, key=lambda r: r.mb_per_s)
+    if optimize == "balanced":
+        floor = BALANCED_FRACTION * max(r.mb_per_s for r in eligible)
+        eligible = [r for r in eligible if r.mb_per_s >= floor]
+    return max(eligible, key=lambda r: r.ratio)
+
+
+def choose_codec(sample, optimize="balanced", min_throughput_mbps=None, cache_path=None):
+    # type: (pa.Table, str, Optional[float], Optional[str]) -> CodecChoice
+    """Return the codec for files with sample's schema, trialling if not cached.
+
+    Args:
+        sample: Table of the first blocks of the input.
+        optimize: "speed", "size" or "balanced".
+        min_throughput_mbps: Optional minimum encode throughput.
+        cache_path: Cache file (default: default_cache_path()).
+    """
+    if cache_path is None:
+        cache_path = default_cache_path()
+    key = _cache_key(sample.schema, optimize, min_throughput_mbps)
+    entry = _load_cache(cache_path).get(key)
+    if isinstance(entry, dict) and entry.get("compression"):
+        choice = CodecChoice(
+            entry["compression"], entry.get("level"), entry.get("mb_per_s"), entry.get("ratio"), cached=True
+        )
+        logger.info("Codec autotune: %r (cached for schema %s)", choice, key.split(":")[0])
+        return choice
+
+    results = []
+    for compression, level in CANDIDATES:
+        mb_per_s, ratio = trial(sample, compression, level)
+        results.append(CodecChoice(compression, level, round(mb_per_s, 1), round(ratio, 3)))
+        logger.debug("Codec trial %r: %.1f MB/s, ratio %.2f", results[-1], mb_per_s, ratio)
+    choice = pick(results, optimize, min_throughput_mbps)
+    logger.info("Codec autotune (%s): %r at %.1f MB/s, ratio %.2f", optimize, choice, choice.mb_per_s, choice.ratio)
+
+    try:
+        _store(cache_path, key, dict(choice.as_dict(), created_at=time.time()))
+    except OSError as e:
+        logger.warning("Cannot write codec cache %s: %s", cache_path, e)
+    return choice
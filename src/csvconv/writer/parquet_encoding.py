@@ -0,0 +1,153 @@
+"""Per-column Parquet encoding selection from a profiled sample.
+
+PyArrow writes every column dictionary-encoded with a PLAIN fallback. That
+is right for low-cardinality data but wastes a dictionary attempt on unique
+values, and PLAIN stores sorted IDs, timestamps and floats far larger than
+the specialised encodings do. choose_encodings() profiles a sample (the
+first row group) and picks, per column:
+
+  - dictionary       distinct values <= DICTIONARY_RATIO of the rows
+  - DELTA_BINARY_PACKED  integers, dates and timestamps that are sorted or
+                     whose range needs at most half the physical width
+  - BYTE_STREAM_SPLIT    floats
+  - DELTA_BYTE_ARRAY     sorted strings (shared prefixes)
+  - PLAIN            anything else with high cardinality
+
+Each candidate is checked by writing the sample column both ways in memory
+with the file's codec; a column keeps PyArrow's default unless its
+candidate is actually smaller.
+"""
+
+from typing import Optional  # noqa: F401
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+ENCODING_MODES = ("default", "auto")
+
+DICTIONARY = "DICTIONARY"
+
+# Column left to PyArrow's own choice (dictionary with PLAIN fallback, or
+# RLE for booleans)
+DEFAULT = "default"
+
+DICTIONARY_RATIO = 0.1
+
+
+class EncodingChoice:
+    """Encodings chosen for a file and the bytes they saved on the sample."""
+
+    def __init__(self, encodings, sample_rows, sample_saved_bytes):
+        # type: (dict, int, int) -> None
+        self.encodings = encodings
+        self.sample_rows = sample_rows
+        self.sample_saved_bytes = sample_saved_bytes
+
+    def writer_kwargs(self):
+        # type: () -> dict
+        """ParquetWriter use_dictionary/column_encoding arguments."""
+        column_encoding = {
+            name: encoding for name, encoding in self.encodings.items() if encoding not in (DICTIONARY, DEFAULT)
+        }
+        if not column_encoding:
+            return {}
+        return {
+            "use_dictionary": [name for name, encoding in self.encodings.items() if name not in column_encoding],
+            "column_encoding": column_encoding,
+        }
+
+    def estimated_saved_bytes(self, rows):
+        # type: (int) -> int
+        """Sample saving scaled to a file of rows rows."""
+        if not self.sample_rows:
+            return 0
+        return int(self.sample_saved_bytes * rows / self.sample_rows)
+
+
+def _is_sorted(array):
+    values = array.drop_null()
+    if len(values) < 2:
+        return True
+    return pc.all(pc.greater_equal(values[1:], values[:-1])).as_py()
+
+
+def _bits(span):
+    return max(1, int(span).bit_length())
+
+
+def _candidate(array):
+    # type: (pa.Array) -> Optional[str]
+    """Encoding suggested by the profile of one sample column, or None."""
+    type_ = array.type
+    if not (
+        pa.types.is_integer(type_)
+        or pa.types.is_temporal(type_)
+        or pa.types.is_floating(type_)
+        or pa.types.is_string(type_)
+        or pa.types.is_binary(type_)
+    ):
+        return None
+    non_null = len(array) - array.null_count
+    if not non_null:
+        return None
+    if pc.count_distinct(array).as_py() <= DICTIONARY_RATIO * non_null:
+        return DICTIONARY
+
+    if pa.types.is_integer(type_) or pa.types.is_temporal(type_):
+        if _is_sorted(array):
+            return "DELTA_BINARY_PACKED"
+        physical = array
+        if pa.types.is_temporal(type_):
+            physical = array.view(pa.int64() if type_.bit_width == 64 else pa.int32())
+        bounds = pc.min_max(physical)
+        span = bounds["max"].as_py() - bounds["min"].as_py()
+        if _bits(span) * 2 <= type_.bit_width:
+            return "DELTA_BINARY_PACKED"
+        return "PLAIN"
+    if pa.types.is_floating(type_):
+        return "BYTE_STREAM_SPLIT" if type_.bit_width in (32, 64) else None
+    return "DELTA_BYTE_ARRAY" if _is_sorted(array) else "PLAIN"
+
+
+def _encoded_size(column, name, compression, encoding=None):
+    # type: (pa.ChunkedArray, str, Optional[str], Optional[str]) -> int
+    """Parquet size of column alone, with encoding or PyArrow's default."""
+    kwargs = {"compression": compression or "snappy"}  # type: dict
+    if encoding is not None:
+        kwargs["use_dictionary"] = False
+        kwargs["column_encoding"] = {name: encoding}
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.table({name: column}), sink, **kwargs)
+    return sink.getvalue().size
+
+
+def choose_encodings(sample, compression=None):
+    # type: (pa.Table, Optional[str]) -> EncodingChoice
+    """Profile sample and choose an encoding per column.
+
+    Args:
+        sample: Table holding the first row group.
+        compression: Parquet codec the file is written with.
+
+    Returns:
+        EncodingChoice with {column: encoding} (DICTIONARY for columns left
+        dictionary-encoded, DEFAULT for columns left to PyArrow) and the
+        bytes saved on the sample.
+    """
+    encodings = {}
+    saved = 0
+    for name in sample.schema.names:
+        column = sample.column(name)
+        candidate = _candidate(column.combine_chunks())
+        if candidate is None or candidate == DICTIONARY:
+            encodings[name] = candidate or DEFAULT
+            continue
+        default_size = _encoded_size(column, name, compression)
+        candidate_size = _encoded_size(column, name, compression, candidate)
+        if candidate_size < default_size:
+            encodings[name] = candidate
+            saved += default_size - candidate_size
+        else:
+            encodings[name] = DEFAULT
+    return EncodingChoice(encodings, sample.num_rows, saved)
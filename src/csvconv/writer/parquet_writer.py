@@ -1,53 +1,112 @@
 """Incremental Parquet writer using PyArrow."""
 
 import os
-import tempfile
+from typing import Any, Optional  # noqa: F401
 
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+from csvconv.memory import RELEASE_INTERVAL_BYTES, release_unused
+from csvconv.writer.atomic import AtomicFileWriter, publish_all  # noqa: F401
+from csvconv.writer.parts import part_path
+from csvconv.writer.sorting import check_sort_columns, sort_table, sorting_columns
 
-class IncrementalParquetWriter:
+
+class IncrementalParquetWriter(AtomicFileWriter):
     """Write RecordBatches incrementally to a Parquet file.
 
-    Uses row_group_size to control flush frequency.
+    Uses row_group_size to control flush frequency and compression to pick
+    the Parquet codec (PyArrow's default when None) at compression_level
+    (the codec's default when None). Dictionary-encoded
+    columns in schema are written from their dictionaries; batches whose
+    columns differ from schema only in dictionary encoding are cast to it.
+    With encoding="auto" the first row group is profiled to pick each
+    column's encoding (see parquet_encoding), and the choice holds for the
+    whole file. With sort_by, each row group is sorted by those columns
+    before it is written and the order is recorded as sorting_columns in
+    the footer. Cached free memory of the Arrow pool is released after
+    every RELEASE_INTERVAL_BYTES written.
     Implements NFS-safe atomic write pattern: write to temp file,
-    fsync, then os.replace.
+    fsync, then os.replace (see AtomicFileWriter, which also covers
+    defer_publish, S3 output and write_behind).
     """
 
-    def __init__(self, output_path, schema, row_group_size=None):
-        # type: (str, pa.Schema, int) -> None
-        self._output_path = output_path
+    format_name = "Parquet"
+
+    def __init__(self, output_path, schema, row_group_size=None, compression=None,
+                 encoding=None, compression_level=None, sort_by=None, defer_publish=False,
+                 s3=None, write_behind=False):
+        # type: (str, pa.Schema, Optional[int], Optional[str], Optional[str], Optional[int], Optional[list], bool, S3Settings, bool) -> None
         self._schema = schema
         self._row_group_size = row_group_size
+        self._compression = compression
+        self._sort_by = list(sort_by) if sort_by else None
+        if self._sort_by:
+            check_sort_columns(schema, self._sort_by)
+        super().__init__(output_path, suffix=".parquet.tmp", defer_publish=defer_publish, s3=s3,
+                         write_behind=write_behind)
 
-        # Validate output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.isdir(output_dir):
-            raise FileNotFoundError(
-                "Output directory does not exist: {}".format(output_dir)
-            )
-
-        # Write to temp file for NFS-safe atomic write
-        self._output_dir = output_dir or "."
-        self._tmp_fd, self._tmp_path = tempfile.mkstemp(
-            dir=self._output_dir, suffix=".parquet.tmp"
-        )
-        os.close(self._tmp_fd)
-
-        writer_kwargs = {}
+        self._writer_kwargs = {}  # type: dict
         if row_group_size is not None:
-            writer_kwargs["write_batch_size"] = row_group_size  # PyArrow 16.x parameter name
+            self._writer_kwargs["write_batch_size"] = row_group_size  # PyArrow 16.x parameter name
+        if compression is not None:
+            self._writer_kwargs["compression"] = compression
+        if compression_level is not None:
+            self._writer_kwargs["compression_level"] = compression_level
+        if self._sort_by:
+            self._writer_kwargs["sorting_columns"] = sorting_columns(schema, self._sort_by)
+
+        self._writer = None
+        self._encoding_choice = None
+        self._rows = 0
+        # With encoding="auto" the file is opened once the first row group
+        # has been profiled
+        self._auto_encoding = encoding == "auto"
+        if not self._auto_encoding:
+            self._open_writer()
+
+        self._unreleased_bytes = 0
+
+    def _open_writer(self, sample=None):
+        # type: (pa.Table) -> None
+        kwargs = dict(self._writer_kwargs)
+        if sample is not None:
+            from csvconv.writer.parquet_encoding import choose_encodings
 
+            self._encoding_choice = choose_encodings(sample, self._compression)
+            kwargs.update(self._encoding_choice.writer_kwargs())
         try:
-            self._writer = pq.ParquetWriter(self._tmp_path, schema, **writer_kwargs)
+            self._writer = pq.ParquetWriter(self._sink, self._schema, **kwargs)
         except Exception:
             # Clean up temp file on failure
-            if os.path.exists(self._tmp_path):
-                os.unlink(self._tmp_path)
+            self._remove_temp()
             raise
 
-        self._closed = False
+    @property
+    def encodings(self):
+        # type: () -> Optional[dict]
+        """{column: encoding} chosen by encoding="auto", else None."""
+        if self._encoding_choice is None:
+            return None
+        return dict(self._encoding_choice.encodings)
+
+    @property
+    def encoding_saved_bytes(self):
+        # type: () -> Optional[int]
+        """Estimated bytes saved by encoding="auto" over PyArrow's defaults.
+
+        Measured on the profiled first row group and scaled to the rows
+        written; None when encodings were not chosen.
+        """
+        if self._encoding_choice is None:
+            return None
+        return self._encoding_choice.estimated_saved_bytes(self._rows)
+
+    @property
+    def rows_written(self):
+        # type: () -> int
+        """Rows written so far."""
+        return self._rows
 
     def write_batch(self, batch):
         # type: (pa.RecordBatch) -> None
@@ -55,36 +114,149 @@ class IncrementalParquetWriter:
         if self._closed:
             raise RuntimeError("Writer is already closed")
         table = pa.Table.from_batches([batch])
+        if not table.schema.equals(self._schema):
+            table = self._conform(table, self._schema)
+        if self._sort_by:
+            table = sort_table(table, self._sort_by)
+        if self._writer is None:
+            self._open_writer(sample=table)
         self._writer.write_table(table)
+        self._rows += table.num_rows
+        self._written()
+        self._unreleased_bytes += batch.nbytes
+        if self._unreleased_bytes >= RELEASE_INTERVAL_BYTES:
+            self._unreleased_bytes = 0
+            release_unused(self._output_path)
+
+    def _finish(self):
+        # type: () -> None
+        if self._writer is None:
+            self._open_writer()
+        self._writer.close()
+
+    def _discard(self):
+        # type: () -> None
+        if self._writer is not None:
+            self._writer.close()
+
+
+class RollingParquetWriter:
+    """Write RecordBatches into numbered part files of bounded size.
+
+    A part is closed (atomically, by IncrementalParquetWriter) once it
+    holds max_file_rows rows or has reached max_file_bytes, and the next
+    batch opens the next part. Parts are named with parts.part_path, so
+    out.parquet becomes out-part-00000.parquet, out-part-00001.parquet, ...
+    Rows are split exactly at max_file_rows; max_file_bytes is checked
+    after every batch, so a part may exceed it by one row group.
+    """
+
+    def __init__(self, output_path, schema, max_file_rows=None, max_file_bytes=None,
+                 **writer_kwargs):
+        # type: (str, pa.Schema, Optional[int], Optional[int], **Any) -> None
+        self._output_path = output_path
+        self._schema = schema
+        self._max_file_rows = max_file_rows
+        self._max_file_bytes = max_file_bytes
+        self._writer_kwargs = writer_kwargs
+        self._current = None
+        self._parts = []  # type: list
+        self._encodings = None
+        self._encoding_saved_bytes = None
+        self._closed = False
+
+    @property
+    def parts(self):
+        # type: () -> list
+        """[{"path", "rows", "bytes"}] of the finished parts, in order."""
+        return [dict(part) for part in self._parts]
+
+    @property
+    def encodings(self):
+        # type: () -> Optional[dict]
+        """Encodings chosen for the first part with encoding="auto", else None."""
+        return self._encodings
+
+    @property
+    def encoding_saved_bytes(self):
+        # type: () -> Optional[int]
+        """Estimated bytes saved by encoding="auto" over all parts."""
+        return self._encoding_saved_bytes
+
+    def _open_next(self):
+        # type: () -> None
+        path = part_path(self._output_path, len(self._parts))
+        self._current = IncrementalParquetWriter(path, self._schema, **self._writer_kwargs)
+        self._current_path = path
+
+    def _finish_current(self):
+        # type: () -> None
+        writer = self._current
+        self._current = None
+        writer.close()
+        if writer.encodings is not None:
+            if self._encodings is None:
+                self._encodings = writer.encodings
+            self._encoding_saved_bytes = (self._encoding_saved_bytes or 0) + writer.encoding_saved_bytes
+        self._parts.append({
+            "path": self._current_path,
+            "rows": writer.rows_written,
+            "bytes": os.path.getsize(self._current_path),
+        })
+
+    def _full(self):
+        # type: () -> bool
+        writer = self._current
+        if self._max_file_rows and writer.rows_written >= self._max_file_rows:
+            return True
+        return bool(self._max_file_bytes) and writer.bytes_written >= self._max_file_bytes
+
+    def write_batch(self, batch):
+        # type: (pa.RecordBatch) -> None
+        """Write a RecordBatch, splitting it across parts as needed."""
+        if self._closed:
+            raise RuntimeError("Writer is already closed")
+        offset = 0
+        while offset < batch.num_rows:
+            if self._current is None:
+                self._open_next()
+            length = batch.num_rows - offset
+            if self._max_file_rows:
+                length = min(length, self._max_file_rows - self._current.rows_written)
+            self._current.write_batch(batch.slice(offset, length))
+            offset += length
+            if self._full():
+                self._finish_current()
 
     def close(self):
         # type: () -> None
-        """Close the writer and atomically move to final path."""
+        """Finish the last part (an empty input still yields one part)."""
         if self._closed:
             return
-        self._writer.close()
+        if self._current is None and not self._parts:
+            self._open_next()
+        if self._current is not None:
+            self._finish_current()
         self._closed = True
 
-        # fsync for NFS safety
-        fd = os.open(self._tmp_path, os.O_RDONLY)
-        try:
-            os.fsync(fd)
-        finally:
-            os.close(fd)
-
-        # Atomic rename
-        os.replace(self._tmp_path, self._output_path)
+    def abort(self):
+        # type: () -> None
+        """Discard the open part and remove the parts already finished."""
+        if self._current is not None:
+            self._current.abort()
+            self._current = None
+        for part in self._parts:
+            if os.path.exists(part["path"]):
+                os.unlink(part["path"])
+        self._parts = []
+        self._closed = True
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is not None:
-            # On error, clean up temp file
-            self._writer.close()
-            self._closed = True
-            if os.path.exists(self._tmp_path):
-                os.unlink(self._tmp_path)
+            self.abort()
         else:
             self.close()
         return False
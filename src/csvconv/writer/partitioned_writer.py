@@ -0,0 +1,267 @@
+"""Hive-partitioned Parquet dataset writer.
+
+Rows are routed by the values of the partition columns into
+``col1=value/col2=value/`` directories below the dataset root, in the
+layout pyarrow.dataset and most query engines read with hive partitioning.
+Partition columns are encoded in the path and dropped from the files.
+
+Each partition gets its own IncrementalParquetWriter, fed in row groups of
+up to BUFFER_BYTES. At most max_open_writers are open at a time; when a new
+partition needs a writer, the least recently used one is finalized and the
+partition continues in a new part file if it shows up again. Buffered rows
+are capped at max_open_writers * BUFFER_BYTES in total (the largest buffer
+is flushed first), so memory and file descriptors stay bounded by
+max_open_writers regardless of the number of partitions.
+"""
+
+import collections
+import os
+from typing import Any, Iterator, Optional  # noqa: F401
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from csvconv.errors import InputValidationError
+from csvconv.writer.parquet_writer import IncrementalParquetWriter
+from csvconv.writer.sorting import check_sort_columns
+
+DEFAULT_MAX_OPEN_WRITERS = 32
+
+BUFFER_BYTES = 4 * 1024 * 1024
+
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def partition_path(partition_by, values):
+    # type: (list, tuple) -> str
+    """Relative ``key=value/...`` directory for a partition."""
+    parts = []
+    for name, value in zip(partition_by, values):
+        text = NULL_PARTITION if value is None else quote(str(value), safe="")
+        parts.append("{}={}".format(quote(name, safe=""), text))
+    return os.path.join(*parts)
+
+
+def split_by_keys(table, keys, columns=None):
+    # type: (pa.Table, list, Optional[list]) -> Iterator[tuple]
+    """Yield (key values, rows) for each distinct combination of keys.
+
+    The keys are sorted once and each group is taken from table as a
+    contiguous run of the sort order, so the split is vectorized whatever
+    the number of partitions. Every rows table owns its buffers (it is not
+    a slice of a shared one), so buffering it keeps nothing else alive.
+
+    Args:
+        table: Rows to split.
+        keys: Column names to group by.
+        columns: Columns to keep in the yielded rows (default: all).
+    """
+    key_table = pa.table(
+        {
+            name: (column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column)
+            for name, column in ((name, table.column(name)) for name in keys)
+        }
+    )
+    order = pc.sort_indices(key_table, [(name, "ascending") for name in keys])
+    groups = key_table.take(order).group_by(keys, use_threads=False).aggregate([([], "count_all")])
+    if columns is not None:
+        table = table.select(columns)
+    values = [groups.column(name).to_pylist() for name in keys]
+    offset = 0
+    for key, count in zip(zip(*values), groups.column("count_all").to_pylist()):
+        yield key, table.take(order.slice(offset, count))
+        offset += count
+
+
+class _Partition:
+    """Buffered rows and the open writer (if any) of one partition."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.writer = None
+        self.path = None
+        self.pending = []
+        self.pending_bytes = 0
+        self.parts = 0
+
+
+class PartitionedParquetWriter:
+    """Write RecordBatches into a hive-partitioned Parquet dataset.
+
+    Part files are named ``{prefix}-part-NNNNN.parquet`` so several inputs
+    can share a dataset root. Each part file is written atomically by
+    IncrementalParquetWriter; if the writer exits with an error, every part
+    it wrote is removed again.
+    """
+
+    def __init__(
+        self,
+        output_dir,
+        schema,
+        partition_by,
+        prefix="data",
+        max_open_writers=DEFAULT_MAX_OPEN_WRITERS,
+        max_file_rows=None,
+        max_file_bytes=None,
+        **writer_kwargs,
+    ):
+        # type: (str, pa.Schema, list, str, int, Optional[int], Optional[int], **Any) -> None
+        """
+        Args:
+            output_dir: Dataset root directory (created if missing).
+            schema: Schema of the incoming batches, partition columns included.
+            partition_by: Partition column names, outermost first.
+            prefix: Part file name prefix.
+            max_open_writers: Most part files open at the same time.
+            max_file_rows: Start a new part once a part holds this many rows
+                           (checked per row group).
+            max_file_bytes: Start a new part once a part reaches this size.
+            writer_kwargs: Passed to every IncrementalParquetWriter. Partition
+                           columns are dropped from sort_by (they are
+                           constant within a file).
+
+        Raises:
+            InputValidationError: If a partition column is missing or no data
+                                  columns would be left.
+        """
+        missing = [name for name in partition_by if name not in schema.names]
+        if missing:
+            raise InputValidationError("Partition column(s) not in the schema: {}".format(", ".join(missing)))
+        if len(set(partition_by)) == len(schema.names):
+            raise InputValidationError("Cannot partition by every column")
+        if writer_kwargs.get("sort_by"):
+            check_sort_columns(schema, writer_kwargs["sort_by"])
+            writer_kwargs["sort_by"] = [name for name in writer_kwargs["sort_by"] if name not in partition_by] or None
+
+        self._output_dir = output_dir
+        self._partition_by = list(partition_by)
+        self._file_schema = schema
+        for name in self._partition_by:
+            self._file_schema = self._file_schema.remove(self._file_schema.get_field_index(name))
+        self._prefix = prefix
+        self._max_open_writers = max(1, max_open_writers)
+        self._max_file_rows = max_file_rows
+        self._max_file_bytes = max_file_bytes
+        self._writer_kwargs = writer_kwargs
+        self._partitions = {}  # type: dict
+        self._open = collections.OrderedDict()  # type: collections.OrderedDict
+        self._written = []  # type: list
+        self._pending_bytes = 0
+        self._closed = False
+        os.makedirs(output_dir, exist_ok=True)
+
+    @property
+    def partitions(self):
+        # type: () -> int
+        """Number of distinct partitions seen."""
+        return len(self._partitions)
+
+    @property
+    def files(self):
+        # type: () -> list
+        """Paths of the finalized part files."""
+        return list(self._written)
+
+    @property
+    def output_bytes(self):
+        # type: () -> int
+        """Total size of the finalized part files."""
+        return sum(os.path.getsize(path) for path in self._written if os.path.isfile(path))
+
+    def write_batch(self, batch):
+        # type: (pa.RecordBatch) -> None
+        """Split a RecordBatch by partition and buffer or write each slice."""
+        if self._closed:
+            raise RuntimeError("Writer is already closed")
+        if batch.num_rows == 0:
+            return
+        table = pa.Table.from_batches([batch])
+        for values, rows in split_by_keys(table, self._partition_by, self._file_schema.names):
+            partition = self._partitions.get(values)
+            if partition is None:
+                partition = _Partition(os.path.join(self._output_dir, partition_path(self._partition_by, values)))
+                self._partitions[values] = partition
+            partition.pending.append(rows)
+            partition.pending_bytes += rows.nbytes
+            self._pending_bytes += rows.nbytes
+            if partition.pending_bytes >= BUFFER_BYTES:
+                self._flush(partition)
+        while self._pending_bytes > self._max_open_writers * BUFFER_BYTES:
+            self._flush(max(self._partitions.values(), key=lambda p: p.pending_bytes))
+
+    def _flush(self, partition):
+        # type: (_Partition) -> None
+        """Write the buffered rows of a partition as one row group."""
+        if not partition.pending:
+            return
+        if partition.writer is None:
+            self._open_writer(partition)
+        else:
+            self._open.move_to_end(id(partition))
+        table = pa.concat_tables(partition.pending).combine_chunks()
+        self._pending_bytes -= partition.pending_bytes
+        partition.pending = []
+        partition.pending_bytes = 0
+        for batch in table.to_batches():
+            partition.writer.write_batch(batch)
+        writer = partition.writer
+        if (self._max_file_rows and writer.rows_written >= self._max_file_rows) or (
+            self._max_file_bytes and writer.bytes_written >= self._max_file_bytes
+        ):
+            del self._open[id(partition)]
+            self._finalize(partition)
+
+    def _open_writer(self, partition):
+        # type: (_Partition) -> None
+        while len(self._open) >= self._max_open_writers:
+            _, evicted = self._open.popitem(last=False)
+            self._finalize(evicted)
+        os.makedirs(partition.directory, exist_ok=True)
+        path = os.path.join(partition.directory, "{}-part-{:05d}.parquet".format(self._prefix, partition.parts))
+        partition.parts += 1
+        partition.writer = IncrementalParquetWriter(path, self._file_schema, **self._writer_kwargs)
+        partition.path = path
+        self._open[id(partition)] = partition
+
+    def _finalize(self, partition):
+        # type: (_Partition) -> None
+        """Close a partition's writer into its part file."""
+        partition.writer.close()
+        partition.writer = None
+        self._written.append(partition.path)
+
+    def close(self):
+        # type: () -> None
+        """Flush every partition and finalize all part files."""
+        if self._closed:
+            return
+        for partition in self._partitions.values():
+            self._flush(partition)
+        while self._open:
+            _, partition = self._open.popitem(last=False)
+            self._finalize(partition)
+        self._closed = True
+
+    def abort(self):
+        # type: () -> None
+        """Discard open writers and remove the part files already written."""
+        for partition in self._open.values():
+            partition.writer.abort()
+            partition.writer = None
+        self._open.clear()
+        for path in self._written:
+            if os.path.exists(path):
+                os.unlink(path)
+        self._written = []
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
@@ -0,0 +1,17 @@
+"""Deterministic part file naming for rolling output."""
+
+import os
+
+
+def part_path(output_path, index):
+    # type: (str, int) -> str
+    """Path of part index of output_path.
+
+    The part number goes before the extension, so out.parquet becomes
+    out-part-00000.parquet and out.csv.gz becomes out-part-00000.csv.gz.
+    """
+    base, ext = os.path.splitext(output_path)
+    if ext == ".gz":
+        base, inner = os.path.splitext(base)
+        ext = inner + ext
+    return "{}-part-{:05d}{}".format(base, index, ext)
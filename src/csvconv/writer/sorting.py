@@ -0,0 +1,253 @@
+"""Sorting of output rows by key columns for clustered Parquet files.
+
+With --sort-by every row group is sorted in memory before it is written,
+so each row group's min/max statistics cover a narrow key range. The
+global mode (ExternalSorter) sorts the whole input: blocks are buffered up
+to half the memory budget, sorted and spilled as Arrow IPC runs to a
+temporary directory, then the runs are merged into one sorted stream.
+
+The merge is vectorized rather than row-by-row: every run contributes its
+next RUN_BATCH_BYTES batch, the rows in flight are sorted together, and
+every row up to the first "bound" (the last loaded row of a run that has
+more batches) is emitted, since no row still on disk can sort before it.
+Runs whose rows in flight fall under half a batch are refilled, so memory
+stays at about 1.5 batches per run.
+
+Keys sort ascending with nulls last; ties keep input order (the sort is
+stable).
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Iterator, Optional  # noqa: F401
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from csvconv.errors import InputValidationError
+from csvconv.schema.validation import validate_batch_schema
+
+DEFAULT_SORT_MEMORY_MB = 256
+
+RUN_BATCH_BYTES = 1024 * 1024
+
+_RUN = "__csvconv_run"
+_BOUND = "__csvconv_bound"
+
+
+def check_sort_columns(schema, sort_by):
+    # type: (pa.Schema, list) -> None
+    """Raise InputValidationError if a sort column is not in schema."""
+    missing = [name for name in sort_by if name not in schema.names]
+    if missing:
+        raise InputValidationError("Sort column(s) not in the schema: {}".format(", ".join(missing)))
+
+
+def sort_indices(table, sort_by):
+    # type: (pa.Table, list) -> pa.UInt64Array
+    """Indices that stably sort table by the sort_by columns."""
+    keys = pa.table(
+        {
+            name: (column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column)
+            for name, column in ((name, table.column(name)) for name in sort_by)
+        }
+    )
+    return pc.sort_indices(keys, [(name, "ascending") for name in sort_by], null_placement="at_end")
+
+
+def sort_table(table, sort_by):
+    # type: (pa.Table, list) -> pa.Table
+    """table sorted by the sort_by columns."""
+    return table.take(sort_indices(table, sort_by))
+
+
+def sorting_columns(schema, sort_by):
+    # type: (pa.Schema, list) -> list
+    """Parquet footer sorting_columns matching sort_table's order."""
+    return [pq.SortingColumn(schema.get_field_index(name), descending=False, nulls_first=False) for name in sort_by]
+
+
+def _batch_rows(table):
+    # type: (pa.Table) -> int
+    """Rows per batch so that a batch of table is about RUN_BATCH_BYTES."""
+    if not table.num_rows or not table.nbytes:
+        return max(1, table.num_rows)
+    return max(1, table.num_rows * RUN_BATCH_BYTES // table.nbytes)
+
+
+class ExternalSorter:
+    """Sort batches of any total size within a memory budget.
+
+    Usage::
+
+        with ExternalSorter(schema, ["ts"], memory_bytes) as sorter:
+            for batch in batches:
+                sorter.add(batch)
+            for batch in sorter.merged():
+                ...
+
+    Input that fits in half the budget is sorted in memory without
+    spilling. Spill runs go to a private directory below tmp_dir (the
+    system default if None) that is removed on exit.
+    """
+
+    def __init__(self, schema, sort_by, memory_bytes=DEFAULT_SORT_MEMORY_MB * 1024 * 1024, tmp_dir=None):
+        # type: (pa.Schema, list, int, Optional[str]) -> None
+        check_sort_columns(schema, sort_by)
+        self._schema = schema
+        self._sort_by = list(sort_by)
+        self._run_bytes = max(1, memory_bytes // 2)
+        self._tmp_dir = tmp_dir
+        self._spill_dir = None  # type: Optional[str]
+        self._runs = []  # type: list
+        self._buffered = []  # type: list
+        self._buffered_bytes = 0
+
+    @property
+    def runs(self):
+        # type: () -> int
+        """Number of runs spilled to disk."""
+        return len(self._runs)
+
+    def add(self, batch):
+        # type: (pa.RecordBatch) -> None
+        """Buffer a batch, spilling a sorted run once the buffer is full.
+
+        Raises:
+            SchemaMismatchError: If batch does not match the sorter's schema.
+        """
+        validate_batch_schema(batch, self._schema)
+        if batch.num_rows == 0:
+            return
+        self._buffered.append(batch)
+        self._buffered_bytes += batch.nbytes
+        if self._buffered_bytes >= self._run_bytes:
+            self._spill()
+
+    def _take_buffered(self):
+        # type: () -> pa.Table
+        table = pa.Table.from_batches(self._buffered, schema=self._schema)
+        self._buffered = []
+        self._buffered_bytes = 0
+        return sort_table(table, self._sort_by)
+
+    def _spill(self):
+        # type: () -> None
+        """Sort the buffered batches and write them as one IPC run."""
+        if not self._buffered:
+            return
+        table = self._take_buffered()
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="csvconv-sort-", dir=self._tmp_dir)
+        path = os.path.join(self._spill_dir, "run-{:05d}.arrows".format(len(self._runs)))
+        # The stream format allows the per-batch dictionaries the file format does not
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_stream(sink, self._schema) as writer:
+            writer.write_table(table, max_chunksize=_batch_rows(table))
+        self._runs.append(path)
+
+    def merged(self):
+        # type: () -> Iterator[pa.RecordBatch]
+        """Yield every added row in sorted order (may be called once)."""
+        if not self._runs:
+            if self._buffered:
+                table = self._take_buffered()
+                for batch in table.to_batches(max_chunksize=_batch_rows(table)):
+                    yield batch
+            return
+        self._spill()
+        for batch in self._merge_runs():
+            yield batch
+
+    def _merge_runs(self):
+        # type: () -> Iterator[pa.RecordBatch]
+        readers = [pa.ipc.open_stream(pa.memory_map(path)) for path in self._runs]
+        peeked = [_read_next(reader) for reader in readers]
+        in_flight = [0] * len(readers)
+        batch_rows = [0] * len(readers)
+        pending = []
+        carry = None
+
+        def load(run):
+            batch = peeked[run]
+            peeked[run] = _read_next(readers[run])
+            rows = batch.num_rows
+            in_flight[run] += rows
+            batch_rows[run] = rows
+            # Only the last row of a batch with more to follow bounds the output
+            bound = pa.concat_arrays(
+                [
+                    pa.repeat(pa.scalar(-1, pa.int32()), rows - 1),
+                    pa.array([run if peeked[run] is not None else -1], pa.int32()),
+                ]
+            )
+            run_ids = pa.repeat(pa.scalar(run, pa.int32()), rows)
+            return pa.Table.from_batches([batch]).append_column(_RUN, run_ids).append_column(_BOUND, bound)
+
+        refill = [run for run in range(len(readers)) if peeked[run] is not None]
+        while True:
+            if carry is not None and refill:
+                # A refilled run's previous bound is superseded by its new last row
+                stale = pc.is_in(carry.column(_BOUND), pa.array(refill, pa.int32()))
+                carry = carry.set_column(
+                    carry.schema.get_field_index(_BOUND),
+                    _BOUND,
+                    pc.if_else(stale, pa.scalar(-1, pa.int32()), carry.column(_BOUND)),
+                )
+            tables = ([carry] if carry is not None else []) + [load(run) for run in refill]
+            # Runs hold consecutive input, so run order breaks ties stably
+            table = sort_table(pa.concat_tables(tables), self._sort_by + [_RUN])
+            position = pc.index(pc.greater_equal(table.column(_BOUND), 0), True).as_py()
+            if position < 0:
+                pending.append(table)
+                break
+            emitted = table.slice(0, position + 1)
+            carry = table.slice(position + 1)
+            pending.append(emitted)
+            counts = emitted.group_by(_RUN, use_threads=False).aggregate([([], "count_all")])
+            for run, count in zip(counts.column(_RUN).to_pylist(), counts.column("count_all").to_pylist()):
+                in_flight[run] -= count
+            refill = [
+                run for run in range(len(readers)) if peeked[run] is not None and in_flight[run] * 2 < batch_rows[run]
+            ]
+            if sum(t.nbytes for t in pending) >= RUN_BATCH_BYTES:
+                for batch in self._flush(pending):
+                    yield batch
+                pending = []
+        for batch in self._flush(pending):
+            yield batch
+
+    def _flush(self, tables):
+        # type: (list) -> Iterator[pa.RecordBatch]
+        table = pa.concat_tables(tables).drop_columns([_RUN, _BOUND])
+        for batch in table.combine_chunks().to_batches():
+            yield batch
+
+    def cleanup(self):
+        # type: () -> None
+        """Remove the spill directory and drop buffered rows."""
+        self._buffered = []
+        self._buffered_bytes = 0
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+        return False
+
+
+def _read_next(reader):
+    # type: (pa.ipc.RecordBatchStreamReader) -> pa.RecordBatch
+    """Next non-empty batch of reader, or None at the end of the run."""
+    while True:
+        try:
+            batch = reader.read_next_batch()
+        except StopIteration:
+            return None
+        if batch.num_rows:
+            return batch
@@ -0,0 +1,123 @@
+"""Write-behind flushing of large output files.
+
+Without it, a multi-GB output sits in the page cache as dirty pages until
+the fsync before publication, which then stalls for as long as the disk
+needs to write all of it, and the dirty pages push the cached files of
+co-located services out of memory. With write-behind enabled, every
+WRITE_BEHIND_CHUNK_SIZE bytes appended to an output start their writeback
+(sync_file_range SYNC_FILE_RANGE_WRITE), the previous chunk is waited for
+and then dropped from the page cache (POSIX_FADV_DONTNEED). Writeback thus
+keeps pace with the writer, at most two chunks are dirty at a time and the
+final fsync only flushes the tail and the metadata.
+
+sync_file_range is Linux-only and not exposed by the os module, so it is
+called through libc; elsewhere each chunk is flushed with fdatasync
+instead. Write-behind is off unless a writer is opened with
+write_behind=True.
+"""
+
+import os
+from typing import Optional  # noqa: F401
+
+WRITE_BEHIND_CHUNK_SIZE = 8 * 1024 * 1024
+
+_SYNC_FILE_RANGE_WAIT_BEFORE = 1
+_SYNC_FILE_RANGE_WRITE = 2
+_SYNC_FILE_RANGE_WAIT_AFTER = 4
+
+# Defaults of new WriteBehind trackers
+config = {
+    "chunk_size": WRITE_BEHIND_CHUNK_SIZE,
+}
+
+_sync_file_range = None
+
+
+def _libc_sync_file_range():
+    """libc's sync_file_range, or False where it is not available."""
+    global _sync_file_range
+    if _sync_file_range is None:
+        _sync_file_range = False
+        if hasattr(os, "posix_fadvise"):
+            import ctypes
+            import ctypes.util
+
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                function = libc.sync_file_range
+            except (OSError, AttributeError):
+                pass
+            else:
+                function.argtypes = [ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint]
+                function.restype = ctypes.c_int
+                _sync_file_range = function
+    return _sync_file_range
+
+
+def open_write_behind(path, enabled):
+    # type: (str, bool) -> Optional[WriteBehind]
+    """WriteBehind for the file at path if enabled, else None."""
+    if not enabled:
+        return None
+    return WriteBehind(path)
+
+
+class WriteBehind:
+    """Flush and evict the completed chunks of a file while it is written.
+
+    update() is called after each write to the file (by any writer: the
+    file is tracked through its own read-only descriptor and its size on
+    disk). Bytes still buffered by the writer are handled on a later call
+    or by the final fsync.
+    """
+
+    def __init__(self, path, chunk_size=None):
+        # type: (str, Optional[int]) -> None
+        self._fd = os.open(path, os.O_RDONLY)
+        self._chunk_size = chunk_size or config["chunk_size"]
+        # End of the chunks whose writeback was started
+        self._started = 0
+        self._sync_file_range = _libc_sync_file_range()
+
+    def update(self):
+        # type: () -> None
+        """Write back the chunks completed since the previous call."""
+        size = os.fstat(self._fd).st_size
+        while size - self._started >= self._chunk_size:
+            start = self._started
+            previous = start - self._chunk_size
+            if self._sync_range(start, _SYNC_FILE_RANGE_WRITE):
+                if previous >= 0:
+                    self._sync_range(
+                        previous, _SYNC_FILE_RANGE_WAIT_BEFORE | _SYNC_FILE_RANGE_WRITE | _SYNC_FILE_RANGE_WAIT_AFTER
+                    )
+                    self._drop(previous)
+            else:
+                if hasattr(os, "fdatasync"):
+                    os.fdatasync(self._fd)
+                else:
+                    os.fsync(self._fd)
+                self._drop(start)
+            self._started += self._chunk_size
+
+    def _sync_range(self, offset, flags):
+        # type: (int, int) -> bool
+        """sync_file_range on one chunk; False if unavailable for this file."""
+        if not self._sync_file_range:
+            return False
+        if self._sync_file_range(self._fd, offset, self._chunk_size, flags) != 0:
+            # Not supported by this file system: fall back to fdatasync
+            self._sync_file_range = False
+            return False
+        return True
+
+    def _drop(self, offset):
+        # type: (int) -> None
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(self._fd, offset, self._chunk_size, os.POSIX_FADV_DONTNEED)
+
+    def close(self):
+        # type: () -> None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -6,6 +6,10 @@ All test data is generated programmatically - no static fixture files.
 import csv
 import io
 import tarfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
 
 import pytest
 
@@ -140,3 +144,151 @@ def empty_targz(tmp_path):
         info.size = len(data)
         tar.addfile(info, io.BytesIO(data))
     return str(tar_path)
+
+
+class _S3StandIn:
+    """In-process stand-in for an S3-compatible store (MinIO-style, path-style URLs).
+
+    Implements PUT/GET/HEAD/DELETE of objects (GET with a Range header),
+    the multipart upload calls and checks every request's Signature Version 4 against the test credentials.
+    objects maps "bucket/key" to the published bytes, uploads holds the
+    parts of unfinished multipart uploads, and fail_parts lists part numbers
+    to answer with HTTP 500.
+    """
+
+    access_key = "csvconv-test"
+    secret_key = "csvconv-secret"
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []
+        self.fail_parts = []
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=b"", headers=None):
+                self.send_response(status)
+                headers = headers or {}
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if "Content-Length" not in headers:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                url = urlsplit(self.path)
+                query = dict(parse_qsl(url.query, keep_blank_values=True))
+                if not stand_in.signature_valid(self, url.path, query, body):
+                    return self._reply(403, b"<Error><Code>SignatureDoesNotMatch</Code></Error>")
+                name = unquote(url.path[1:])
+                with stand_in.lock:
+                    stand_in.requests.append((self.command, name, query))
+                    return self._reply(*stand_in.respond(self.command, name, query, body, self.headers))
+
+            do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def signature_valid(self, request, path, query, body):
+        import hashlib
+
+        from csvconv.s3.client import sign_v4
+
+        payload_hash = request.headers.get("x-amz-content-sha256")
+        if payload_hash != hashlib.sha256(body).hexdigest():
+            return False
+        authorization = request.headers.get("Authorization", "")
+        signed = authorization.partition("SignedHeaders=")[2].partition(",")[0].split(";")
+        headers = {name: request.headers[name] for name in signed if name != "host"}
+        expected = sign_v4(
+            request.command,
+            request.headers["Host"],
+            path,
+            query,
+            headers,
+            payload_hash,
+            self.access_key,
+            self.secret_key,
+            "us-east-1",
+            request.headers["x-amz-date"],
+        )
+        return authorization == expected
+
+    def respond(self, method, name, query, body, headers):
+        if "uploads" in query and method == "POST":
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {"name": name, "parts": {}}
+            return 200, "<InitiateMultipartUploadResult><UploadId>{}</UploadId></InitiateMultipartUploadResult>".format(
+                upload_id
+            ).encode()
+        if "uploadId" in query:
+            upload = self.uploads.get(query["uploadId"])
+            if upload is None:
+                return 404, b"<Error><Code>NoSuchUpload</Code></Error>"
+            if method == "PUT":
+                number = int(query["partNumber"])
+                if number in self.fail_parts:
+                    return 500, b"<Error><Code>InternalError</Code></Error>"
+                etag = '"{}"'.format(uuid.uuid4().hex)
+                upload["parts"][number] = (etag, body)
+                return 200, b"", {"ETag": etag}
+            if method == "DELETE":
+                del self.uploads[query["uploadId"]]
+                return 204, b""
+            if method == "POST":
+                import re
+
+                listed = re.findall(rb"<PartNumber>(\d+)</PartNumber><ETag>([^<]+)</ETag>", body)
+                parts = upload["parts"]
+                if [(int(n), e.decode()) for n, e in listed] != [(n, parts[n][0]) for n in sorted(parts)]:
+                    return 400, b"<Error><Code>InvalidPart</Code></Error>"
+                self.objects[name] = b"".join(parts[n][1] for n in sorted(parts))
+                del self.uploads[query["uploadId"]]
+                return 200, b"<CompleteMultipartUploadResult/>"
+        if method == "PUT":
+            self.objects[name] = body
+            return 200, b""
+        if method in ("GET", "HEAD"):
+            if name not in self.objects:
+                return 404, b"<Error><Code>NoSuchKey</Code></Error>"
+            data = self.objects[name]
+            if method == "HEAD":
+                return 200, b"", {"Content-Length": str(len(data))}
+            if "Range" in headers:
+                start, _, end = headers["Range"][len("bytes=") :].partition("-")
+                return 206, data[int(start) : int(end) + 1]
+            return 200, data
+        if method == "DELETE":
+            self.objects.pop(name, None)
+            return 204, b""
+        return 400, b"<Error><Code>InvalidRequest</Code></Error>"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def s3_server(monkeypatch):
+    """S3 stand-in with csvconv's environment and endpoint pointed at it."""
+    server = _S3StandIn()
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", server.access_key)
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", server.secret_key)
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.delenv("AWS_SESSION_TOKEN", raising=False)
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    monkeypatch.setenv("AWS_ENDPOINT_URL_S3", server.endpoint)
+    yield server
+    server.close()
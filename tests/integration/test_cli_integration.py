@@ -121,3 +121,37 @@ class TestCliIntegration:
         )
         assert result.returncode == 0
         assert "usage" in result.stdout.lower() or "csvconv" in result.stdout
+
+    def test_cli_serve_and_connect_subprocess(self, sample_csv, tmp_path):
+        """A serve daemon should handle --connect requests and stop on SIGTERM."""
+        import shutil
+        import signal
+        import tempfile
+        import time
+
+        sock_dir = tempfile.mkdtemp(prefix="csvd")
+        sock_path = os.path.join(sock_dir, "d.sock")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "csvconv", "serve", "--socket", sock_path, "--workers", "1"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        try:
+            deadline = time.time() + 30
+            while not os.path.exists(sock_path) and time.time() < deadline:
+                time.sleep(0.05)
+
+            output = str(tmp_path / "output.parquet")
+            result = subprocess.run(
+                [sys.executable, "-m", "csvconv", "--connect", sock_path,
+                 "--input", sample_csv, "--output", output],
+                capture_output=True, text=True,
+            )
+            assert result.returncode == 0, "stderr: {}".format(result.stderr)
+            assert "Success: 1" in result.stdout
+            assert pq.read_table(output).num_rows == 100
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+            shutil.rmtree(sock_dir, ignore_errors=True)
+        assert server.returncode == 0
+        assert not os.path.exists(sock_path)
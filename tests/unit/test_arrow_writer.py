@@ -0,0 +1,82 @@
+"""Unit tests for csvconv incremental Arrow IPC writer."""
+
+import os
+
+import pyarrow as pa
+import pytest
+
+from csvconv.errors import InputValidationError, SchemaMismatchError
+from csvconv.writer.arrow_writer import IncrementalArrowWriter
+
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+
+@pytest.fixture
+def test_schema():
+    return pa.schema([("id", pa.int64()), ("tag", DICTIONARY)])
+
+
+def _make_batch(schema, ids, tags):
+    """Create a test RecordBatch with its own dictionary, like a CSV block."""
+    return pa.record_batch(
+        [pa.array(ids, pa.int64()), pa.array(tags).dictionary_encode().cast(DICTIONARY)],
+        schema=schema,
+    )
+
+
+def _read(path):
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+class TestIncrementalArrowWriter:
+    """Tests for IncrementalArrowWriter."""
+
+    @pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+    def test_batches_with_own_dictionaries(self, tmp_path, test_schema, compression):
+        output = str(tmp_path / "out.arrow")
+        with IncrementalArrowWriter(output, test_schema, compression=compression) as writer:
+            writer.write_batch(_make_batch(test_schema, [1, 2], ["a", "b"]))
+            writer.write_batch(_make_batch(test_schema, [3, 4], ["c", "a"]))
+        table = _read(output)
+        assert table.schema.equals(test_schema)
+        assert table.column("tag").to_pylist() == ["a", "b", "c", "a"]
+        # Later dictionaries extend the first one as deltas
+        assert table.column("tag").chunk(1).dictionary.to_pylist() == ["a", "b", "c"]
+        assert writer.rows_written == 4
+        assert os.listdir(str(tmp_path)) == ["out.arrow"]
+
+    def test_plain_batches_cast_to_dictionary_schema(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.arrow")
+        with IncrementalArrowWriter(output, test_schema) as writer:
+            writer.write_batch(pa.record_batch({"id": [1], "tag": ["x"]}))
+        assert _read(output).column("tag").to_pylist() == ["x"]
+
+    def test_row_group_size_caps_batch_rows(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.arrow")
+        with IncrementalArrowWriter(output, test_schema, row_group_size=40) as writer:
+            writer.write_batch(_make_batch(test_schema, list(range(100)), ["a"] * 100))
+        assert pa.ipc.open_file(output).num_record_batches == 3
+
+    def test_sort_by_sorts_each_batch(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.arrow")
+        with IncrementalArrowWriter(output, test_schema, sort_by=["id"]) as writer:
+            writer.write_batch(_make_batch(test_schema, [3, 1, 2], ["a", "b", "c"]))
+        assert _read(output).column("id").to_pylist() == [1, 2, 3]
+
+    def test_empty_file_keeps_schema(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.arrow")
+        with IncrementalArrowWriter(output, test_schema):
+            pass
+        table = _read(output)
+        assert table.num_rows == 0 and table.schema.equals(test_schema)
+
+    def test_unsupported_compression_rejected(self, tmp_path, test_schema):
+        with pytest.raises(InputValidationError, match="snappy"):
+            IncrementalArrowWriter(str(tmp_path / "out.arrow"), test_schema, compression="snappy")
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_incompatible_batch_leaves_no_file(self, tmp_path, test_schema):
+        with pytest.raises(SchemaMismatchError):
+            with IncrementalArrowWriter(str(tmp_path / "out.arrow"), test_schema) as writer:
+                writer.write_batch(pa.record_batch({"id": ["1"], "tag": ["x"]}))
+        assert os.listdir(str(tmp_path)) == []
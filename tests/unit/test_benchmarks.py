@@ -0,0 +1,77 @@
+"""Tests for the benchmark data generator and regression comparison."""
+
+import csv
+import importlib.util
+import os
+import tarfile
+
+import pytest
+
+BENCH_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks")
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BENCH_DIR, name + ".py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def datagen():
+    return _load("datagen")
+
+
+@pytest.fixture(scope="module")
+def bench_convert():
+    return _load("bench_convert")
+
+
+class TestDatagen:
+    def test_csv_is_deterministic(self, datagen, tmp_path):
+        columns = datagen.make_columns(6, ("int", "float", "string", "bool", "timestamp"), 12)
+        first, second = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+        datagen.generate_csv(first, 10000, columns, seed=7)
+        datagen.generate_csv(second, 10000, columns, seed=7)
+        with open(first, "rb") as a, open(second, "rb") as b:
+            assert a.read() == b.read()
+
+        with open(first, newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == [name for name, _, _ in columns]
+        assert len(rows) == 10001
+        assert [int(r[0]) for r in rows[1:]] == list(range(10000))
+        assert all(len(r[3]) == 12 for r in rows[1:])
+
+    def test_targz_members(self, datagen, tmp_path):
+        path = str(tmp_path / "a.tar.gz")
+        datagen.generate_targz(path, 3, 50, datagen.make_columns(4))
+        with tarfile.open(path, "r:gz") as tar:
+            names = tar.getnames()
+            last = tar.extractfile(names[-1]).read().decode().splitlines()
+        assert names == ["data/part-00000.csv", "data/part-00001.csv", "data/part-00002.csv"]
+        assert last[1].startswith("100,")
+
+    def test_unknown_type(self, datagen):
+        with pytest.raises(ValueError):
+            datagen.make_columns(3, ("decimal",))
+
+
+class TestCompare:
+    def test_flags_regressions(self, bench_convert):
+        baseline = {"scenarios": {"s": {"mb_per_s": 100.0, "peak_rss_mb": 100.0, "output_mb": 10.0}}}
+        results = {"scenarios": {"s": {"mb_per_s": 80.0, "peak_rss_mb": 105.0, "output_mb": 12.0}}}
+        regressions = bench_convert.compare(results, baseline, threshold=0.10)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("s: mb_per_s")
+        assert regressions[1].startswith("s: output_mb")
+
+    def test_improvements_and_new_scenarios_pass(self, bench_convert):
+        baseline = {"scenarios": {"s": {"mb_per_s": 100.0, "peak_rss_mb": 100.0, "output_mb": 10.0}}}
+        results = {
+            "scenarios": {
+                "s": {"mb_per_s": 150.0, "peak_rss_mb": 90.0, "output_mb": 9.0},
+                "new": {"mb_per_s": 1.0, "peak_rss_mb": 1.0, "output_mb": 1.0},
+            }
+        }
+        assert bench_convert.compare(results, baseline) == []
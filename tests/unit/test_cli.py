@@ -22,6 +22,40 @@ class TestParseArgs:
         assert args.gzip is False
         assert args.log_level == "INFO"
 
+    def test_columnar_output_types(self):
+        for output_type in ("arrow", "orc"):
+            args = parse_args(["--input", "in.csv", "--output", "out", "--output-type", output_type])
+            assert args.output_type == output_type
+
+    def test_s3_options(self):
+        from csvconv.cli import convert_kwargs
+
+        args = parse_args([
+            "--input", "in.csv", "--output", "s3://bucket/out.parquet",
+            "--s3-endpoint", "http://minio:9000", "--s3-part-size-mb", "8",
+            "--s3-upload-threads", "6", "--s3-read-ahead-mb", "32",
+        ])
+        kwargs = convert_kwargs(args)
+        assert kwargs["s3_endpoint"] == "http://minio:9000"
+        assert kwargs["s3_part_size_mb"] == 8 and kwargs["s3_upload_threads"] == 6
+        assert kwargs["s3_read_ahead_mb"] == 32
+
+    def test_read_ahead_depth(self):
+        from csvconv.cli import convert_kwargs
+
+        args = parse_args(["--input", "in.csv", "--output", "out", "--read-ahead-depth", "0"])
+        assert convert_kwargs(args)["read_ahead_depth"] == 0
+        with pytest.raises(SystemExit):
+            parse_args(["--input", "in.csv", "--output", "out", "--read-ahead-depth", "-1"])
+
+    def test_write_behind(self):
+        from csvconv.cli import convert_kwargs
+
+        args = parse_args(["--input", "in.csv", "--output", "out", "--write-behind"])
+        assert convert_kwargs(args)["write_behind"] is True
+        args = parse_args(["--input", "in.csv", "--output", "out"])
+        assert convert_kwargs(args)["write_behind"] is None
+
     def test_parse_args_all_options(self):
         """All options explicitly set should be parsed correctly."""
         args = parse_args([
@@ -177,6 +211,58 @@ class TestParseArgs:
         assert args.gzip is False
 
 
+    def test_parse_args_conversion_options(self):
+        """Codec, column types and member filters should be parsed."""
+        args = parse_args([
+            "--input", "a.tar.gz",
+            "--output", "out/",
+            "--compression", "zstd",
+            "--column-type", "id=int64",
+            "--column-type", "ts=timestamp[ms]",
+            "--include", "2024-*.csv",
+        ])
+        assert args.compression == "zstd"
+        assert args.column_types == {"id": "int64", "ts": "timestamp[ms]"}
+        assert args.include == ["2024-*.csv"]
+
+    def test_parse_args_column_type_invalid(self):
+        """Column types not of the form NAME=TYPE should cause SystemExit."""
+        with pytest.raises(SystemExit):
+            parse_args(["--input", "a.csv", "--output", "o", "--column-type", "id"])
+
+    def test_parse_args_max_memory_mb(self):
+        """--max-memory-mb should be parsed and must be > 0."""
+        args = parse_args(["--input", "a.csv", "--output", "o", "--max-memory-mb", "512"])
+        assert args.max_memory_mb == 512.0
+        with pytest.raises(SystemExit):
+            parse_args(["--input", "a.csv", "--output", "o", "--max-memory-mb", "0"])
+
+    def test_parse_args_output_layout(self):
+        """--partition-by takes a column list and --max-file-bytes a size with suffix."""
+        args = parse_args([
+            "--input", "a.csv", "--output", "o",
+            "--partition-by", "day,region",
+            "--max-file-rows", "1000000",
+            "--max-file-bytes", "512M",
+        ])
+        assert args.partition_by == ["day", "region"]
+        assert args.max_file_rows == 1000000
+        assert args.max_file_bytes == 512 * 1024 * 1024
+        with pytest.raises(SystemExit):
+            parse_args(["--input", "a.csv", "--output", "o", "--max-file-bytes", "lots"])
+        with pytest.raises(SystemExit):
+            parse_args(["--input", "a.csv", "--output", "o", "--partition-by", "day,"])
+
+    def test_parse_args_sort(self):
+        """--sort-by takes a column list; --global-sort and --sort-memory-mb are optional."""
+        args = parse_args(["--input", "a.csv", "--output", "o", "--sort-by", "ts,id"])
+        assert args.sort_by == ["ts", "id"]
+        assert args.global_sort is False and args.sort_memory_mb is None
+        args = parse_args(["--input", "a.csv", "--output", "o", "--sort-by", "ts",
+                           "--global-sort", "--sort-memory-mb", "64"])
+        assert args.global_sort is True and args.sort_memory_mb == 64
+
+
 class TestMain:
     """Tests for main() function."""
 
@@ -192,3 +278,4 @@ class TestMain:
         output = str(tmp_path / "output.parquet")
         result = main(["--input", nonexistent, "--output", output])
         assert result == 1
+
@@ -1,9 +1,13 @@
 """Unit tests for csvconv converter dispatch."""
 
+import os
+
+import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
 
 from csvconv.converter import convert
+from csvconv.errors import InputValidationError
 
 
 class TestConverterCsvToParquet:
@@ -50,3 +54,251 @@ class TestConverterCsvToParquet:
         table = pq.read_table(output)
         assert table.num_rows == 50000
         assert result.total_success == 1
+
+
+class TestConverterOptions:
+    """Tests for codec, column type and member filter options."""
+
+    def test_compression_and_column_types(self, sample_csv, tmp_path):
+        output = str(tmp_path / "output.parquet")
+        convert(sample_csv, output, compression="gzip", column_types={"id": "int16"})
+        pf = pq.ParquetFile(output)
+        assert pf.schema_arrow.field("id").type == pa.int16()
+        assert pf.metadata.row_group(0).column(0).compression == "GZIP"
+
+    def test_unknown_column_type_raises(self, sample_csv, tmp_path):
+        with pytest.raises(InputValidationError):
+            convert(sample_csv, str(tmp_path / "o.parquet"), column_types={"id": "nonsense"})
+
+    def test_include_filters_tar_members(self, sample_targz, tmp_path):
+        output_dir = str(tmp_path / "out")
+        summary = convert(
+            sample_targz,
+            output_dir,
+            input_type="tar.gz",
+            output_type="csv",
+            include=["data_1.*"],
+        )
+        assert summary.successes == ["data_1.csv"]
+
+
+class TestDictionaryEncoding:
+    """Tests for dictionary-encoded low-cardinality string columns."""
+
+    @staticmethod
+    def _write_csv(path, rows):
+        with open(path, "w") as f:
+            f.write("id,status,label\n")
+            for i in range(rows):
+                f.write("{},{},label_{}\n".format(i, ("ok", "failed", "retry")[i % 3], i))
+
+    def test_csv_to_parquet_dict_encode(self, tmp_path):
+        source = str(tmp_path / "in.csv")
+        self._write_csv(source, 1000)
+        output = str(tmp_path / "out.parquet")
+        convert(source, output, dict_encode=True)
+        table = pq.read_table(output)
+        assert pa.types.is_dictionary(table.schema.field("status").type)
+        assert table.schema.field("label").type == pa.string()
+        assert table.column("status").to_pylist()[:3] == ["ok", "failed", "retry"]
+
+    def test_dict_encode_off_by_default(self, sample_csv, tmp_path):
+        output = str(tmp_path / "out.parquet")
+        convert(sample_csv, output)
+        assert not any(pa.types.is_dictionary(f.type) for f in pq.read_schema(output))
+
+    def test_targz_members_share_dictionary_schema(self, tmp_path):
+        import io
+        import tarfile
+
+        tar_path = str(tmp_path / "in.tar.gz")
+        with tarfile.open(tar_path, "w:gz") as tar:
+            for n, statuses in enumerate((["ok", "failed"], ["ok", "new_1", "new_2"])):
+                body = "id,status\n" + "".join("{},{}\n".format(i, s) for i, s in enumerate(statuses))
+                data = body.encode("utf-8")
+                info = tarfile.TarInfo("part_{}.csv".format(n))
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+        output_dir = str(tmp_path / "out")
+        summary = convert(tar_path, output_dir, input_type="tar.gz", dict_encode=True, dict_max_cardinality=2)
+        assert summary.total_failure == 0
+        second = pq.read_table(os.path.join(output_dir, "part_1.parquet"))
+        assert pa.types.is_dictionary(second.schema.field("status").type)
+        assert second.column("status").to_pylist() == ["ok", "new_1", "new_2"]
+
+
+class TestAutoEncoding:
+    """Tests for encoding="auto"."""
+
+    def test_summary_records_encodings(self, sample_csv, tmp_path):
+        summary = convert(sample_csv, str(tmp_path / "out.parquet"), encoding="auto")
+        record = summary.files[0]
+        assert set(record["encodings"]) == {"id", "value", "name"}
+        assert record["encoding_saved_bytes"] >= 0
+        assert "Auto encoding" in summary.get_report()
+
+    def test_unknown_encoding_mode_raises(self, sample_csv, tmp_path):
+        with pytest.raises(InputValidationError):
+            convert(sample_csv, str(tmp_path / "out.parquet"), encoding="fancy")
+
+
+class TestRollingOutput:
+    """Tests for max_file_rows / max_file_bytes."""
+
+    def test_csv_to_parquet_parts_in_summary(self, sample_csv, tmp_path):
+        output = str(tmp_path / "out.parquet")
+        summary = convert(sample_csv, output, max_file_rows=40)
+        record = summary.files[0]
+        assert [p["rows"] for p in record["parts"]] == [40, 40, 20]
+        assert record["output_bytes"] == sum(p["bytes"] for p in record["parts"])
+        assert all(os.path.isfile(p["path"]) for p in record["parts"])
+
+    def test_targz_to_csv_parts(self, sample_targz, tmp_path):
+        summary = convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz", output_type="csv", max_file_rows=20)
+        assert len(summary.files) == 3
+        for record in summary.files:
+            assert [p["rows"] for p in record["parts"]] == [20, 20, 10]
+            assert all("-part-" in p["path"] for p in record["parts"])
+
+
+class TestMerge:
+    """Tests for merge=True (one Parquet output per archive)."""
+
+    def test_members_merged_with_source_column(self, sample_targz, tmp_path):
+        output = str(tmp_path / "merged.parquet")
+        summary = convert(sample_targz, output, input_type="tar.gz", merge=True)
+        table = pq.read_table(output)
+        assert table.num_rows == 150
+        assert table.schema.field("_source_file").type == pa.dictionary(pa.int32(), pa.string())
+        assert table.column("_source_file").to_pylist() == (
+            ["data_0.csv"] * 50 + ["data_1.csv"] * 50 + ["data_2.csv"] * 50
+        )
+        # The tiny members are coalesced into one row group
+        assert pq.ParquetFile(output).metadata.num_row_groups == 1
+        assert summary.total_success == 1
+        record = summary.files[0]
+        assert record["file"] == "sample.tar.gz"
+        assert record["rows"] == 150
+        assert record["members"] == ["data_0.csv", "data_1.csv", "data_2.csv"]
+
+    def test_failed_member_left_out(self, schema_mismatch_targz, tmp_path):
+        output = str(tmp_path / "merged.parquet")
+        summary = convert(schema_mismatch_targz, output, input_type="tar.gz", merge=True)
+        assert summary.total_failure == 1
+        assert summary.failures[0]["file"] == "file2.csv"
+        table = pq.read_table(output)
+        assert table.column("_source_file").to_pylist() == ["file1.csv"] * 2 + ["file3.csv"] * 2
+        assert summary.files[-1]["members"] == ["file1.csv", "file3.csv"]
+
+    def test_merge_with_rolling_parts(self, sample_targz, tmp_path):
+        output = str(tmp_path / "merged.parquet")
+        summary = convert(sample_targz, output, input_type="tar.gz", merge=True, max_file_rows=100)
+        record = summary.files[0]
+        assert [p["rows"] for p in record["parts"]] == [100, 50]
+
+
+class TestSmallMembers:
+    """Tests for the small-member path of tar.gz -> parquet."""
+
+    def test_published_in_groups(self, sample_targz, tmp_path, monkeypatch):
+        import csvconv.converter as converter
+        import csvconv.writer.atomic as atomic
+
+        monkeypatch.setattr(converter, "SMALL_MEMBER_GROUP", 2)
+        groups = []
+        publish_all = atomic.publish_all
+
+        def _spy(writers):
+            groups.append(len(writers))
+            return publish_all(writers)
+
+        monkeypatch.setattr(atomic, "publish_all", _spy)
+        output = str(tmp_path / "out")
+        summary = convert(sample_targz, output, input_type="tar.gz")
+        assert groups == [2, 1]
+        assert summary.total_success == 3
+        assert sorted(os.listdir(output)) == ["data_0.parquet", "data_1.parquet", "data_2.parquet"]
+        assert all(f["output_bytes"] > 0 for f in summary.files)
+
+    def test_failed_rename_fails_only_its_member(self, sample_targz, tmp_path, monkeypatch):
+        import csvconv.writer.atomic as atomic
+
+        replace = os.replace
+
+        def _replace(src, dst):
+            if dst.endswith("data_1.parquet"):
+                raise OSError("rename failed")
+            replace(src, dst)
+
+        monkeypatch.setattr(atomic.os, "replace", _replace)
+        output = str(tmp_path / "out")
+        summary = convert(sample_targz, output, input_type="tar.gz")
+        assert [(f["file"], f["status"]) for f in summary.files] == [
+            ("data_0.csv", "success"),
+            ("data_1.csv", "failure"),
+            ("data_2.csv", "success"),
+        ]
+        assert sorted(os.listdir(output)) == ["data_0.parquet", "data_2.parquet"]
+
+    def test_failed_member_does_not_block_group(self, schema_mismatch_targz, tmp_path):
+        output = str(tmp_path / "out")
+        summary = convert(schema_mismatch_targz, output, input_type="tar.gz")
+        assert summary.total_success == 2 and summary.total_failure == 1
+        assert sorted(os.listdir(output)) == ["file1.parquet", "file3.parquet"]
+
+
+class TestArrowAndOrcOutput:
+    """Tests for output_type="arrow" and "orc"."""
+
+    def test_csv_to_arrow_with_dictionary_columns(self, tmp_path):
+        path = tmp_path / "in.csv"
+        path.write_text("id,tag\n" + "".join("{},t{}\n".format(i, i % 7) for i in range(5000)))
+        output = str(tmp_path / "out.arrow")
+        summary = convert(
+            str(path), output, output_type="arrow", compression="zstd", block_size_mb=0.01, dict_encode=True
+        )
+        reader = pa.ipc.open_file(pa.memory_map(output))
+        table = reader.read_all()
+        assert reader.num_record_batches > 1
+        assert pa.types.is_dictionary(table.schema.field("tag").type)
+        assert table.column("tag").to_pylist() == ["t{}".format(i % 7) for i in range(5000)]
+        assert summary.files[0]["output_bytes"] == os.path.getsize(output)
+
+    def test_csv_to_orc(self, sample_csv, tmp_path):
+        import pyarrow.orc as orc
+
+        output = str(tmp_path / "out.orc")
+        summary = convert(sample_csv, output, output_type="orc", compression="gzip")
+        assert orc.read_table(output).num_rows == 100
+        assert summary.total_success == 1
+
+    @pytest.mark.parametrize("output_type", ["arrow", "orc"])
+    def test_targz_per_member(self, schema_mismatch_targz, tmp_path, output_type):
+        output = str(tmp_path / "out")
+        summary = convert(schema_mismatch_targz, output, input_type="tar.gz", output_type=output_type)
+        assert summary.total_success == 2 and summary.total_failure == 1
+        assert sorted(os.listdir(output)) == ["file1." + output_type, "file3." + output_type]
+
+    def test_targz_merged_to_arrow(self, sample_targz, tmp_path):
+        output = str(tmp_path / "all.arrow")
+        convert(sample_targz, output, input_type="tar.gz", output_type="arrow", merge=True)
+        table = pa.ipc.open_file(output).read_all()
+        assert sorted(set(table.column("_source_file").to_pylist())) == [
+            "data_0.csv",
+            "data_1.csv",
+            "data_2.csv",
+        ]
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"compression": "auto"},
+            {"encoding": "auto"},
+            {"partition_by": ["id"]},
+            {"max_file_rows": 10},
+        ],
+    )
+    def test_parquet_only_options_rejected(self, sample_csv, tmp_path, options):
+        with pytest.raises(InputValidationError, match="arrow"):
+            convert(sample_csv, str(tmp_path / "out.arrow"), output_type="arrow", **options)
@@ -69,3 +69,21 @@ class TestReadStreaming:
         rows_1 = sum(b.num_rows for b in batches_1)
         rows_2 = sum(b.num_rows for b in batches_2)
         assert rows_1 == rows_2 == 100
+
+    def test_read_streaming_dictionary_beyond_first_block(self, tmp_path):
+        """Dictionary columns keep growing past the cardinality of the first block."""
+        path = str(tmp_path / "grow.csv")
+        with open(path, "w") as f:
+            f.write("status,n\n")
+            for i in range(50000):
+                f.write("{},{}\n".format("s{}".format(i % 3 if i < 5000 else i), i))
+        batches = list(read_streaming(path, block_size_mb=0.01, dict_max_cardinality=10))
+        assert len(batches) > 1
+        assert all(pa.types.is_dictionary(b.schema.field("status").type) for b in batches)
+        assert sum(b.num_rows for b in batches) == 50000
+
+    def test_read_streaming_dictionary_from_file_object(self, sample_csv):
+        with open(sample_csv, "rb") as f:
+            batches = list(read_streaming(f, dict_max_cardinality=1000))
+        assert sum(b.num_rows for b in batches) == 100
+        assert pa.types.is_dictionary(batches[0].schema.field("name").type)
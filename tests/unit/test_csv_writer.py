@@ -9,7 +9,7 @@ import pyarrow as pa
 import pyarrow.csv as pcsv
 import pytest
 
-from csvconv.writer.csv_writer import extract_stream, write_csv
+from csvconv.writer.csv_writer import extract_stream, extract_stream_rolling, write_csv
 
 
 def _make_batch(num_rows=100):
@@ -185,3 +185,39 @@ class TestNfsSafePattern:
 
         assert len(calls) == 1
         assert calls[0].get("dir") == str(tmp_path)
+
+
+class TestExtractStreamRolling:
+    """Tests for extract_stream_rolling."""
+
+    def test_rolls_by_rows_with_header(self, tmp_path):
+        data = b"id,name\n" + b"".join(b"%d,n%d\n" % (i, i) for i in range(10))
+        parts = extract_stream_rolling(io.BytesIO(data), str(tmp_path / "m.csv"), max_file_rows=4)
+        assert [os.path.basename(p["path"]) for p in parts] == [
+            "m-part-00000.csv", "m-part-00001.csv", "m-part-00002.csv",
+        ]
+        assert [p["rows"] for p in parts] == [4, 4, 2]
+        contents = [open(p["path"], "rb").read() for p in parts]
+        assert all(c.startswith(b"id,name\n") for c in contents)
+        assert b"id,name\n" + b"".join(c[len(b"id,name\n"):] for c in contents) == data
+
+    def test_keeps_quoted_newlines_together(self, tmp_path):
+        data = b'id,note\n1,"two\nlines"\n2,plain\n3,"a ""quote""\nhere"\n'
+        parts = extract_stream_rolling(io.BytesIO(data), str(tmp_path / "q.csv"), max_file_rows=1)
+        assert [p["rows"] for p in parts] == [1, 1, 1]
+        for part in parts:
+            table = pcsv.read_csv(part["path"])
+            assert table.num_rows == 1
+
+    def test_rolls_gzip_by_bytes(self, tmp_path):
+        rows = b"".join(b"%d,%s\n" % (i, os.urandom(16).hex().encode()) for i in range(5000))
+        parts = extract_stream_rolling(io.BytesIO(b"id,v\n" + rows), str(tmp_path / "g.csv.gz"),
+                                       gzip_compress=True, max_file_bytes=32 * 1024)
+        assert len(parts) > 1
+        assert parts[0]["path"].endswith("g-part-00000.csv.gz")
+        total = sum(pcsv.read_csv(p["path"]).num_rows for p in parts)
+        assert total == 5000
+
+    def test_header_only_yields_one_part(self, tmp_path):
+        parts = extract_stream_rolling(io.BytesIO(b"id\n"), str(tmp_path / "e.csv"), max_file_rows=5)
+        assert len(parts) == 1 and parts[0]["rows"] == 0
@@ -0,0 +1,183 @@
+"""Unit tests for the warm worker daemon and thin client."""
+
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pyarrow.parquet as pq
+import pytest
+
+from csvconv import cli, logging_config
+from csvconv.cli import main, parse_args, parse_serve_args
+from csvconv.daemon import DaemonServer, execute_request, request
+from csvconv.errors import CsvconvError
+
+
+@pytest.fixture
+def socket_dir():
+    # AF_UNIX paths are limited to ~108 bytes, so avoid pytest's long tmp paths
+    path = tempfile.mkdtemp(prefix="csvd")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _run_daemon(sock_path):
+    server = DaemonServer(sock_path, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield sock_path
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def daemon(socket_dir):
+    yield from _run_daemon(os.path.join(socket_dir, "d.sock"))
+
+
+@pytest.fixture
+def s3_daemon(s3_server, socket_dir):
+    """Daemon started after the S3 stand-in, so its workers inherit the environment."""
+    yield from _run_daemon(os.path.join(socket_dir, "s3.sock"))
+
+
+class TestDaemon:
+    def test_ping(self, daemon):
+        assert request(daemon, {"op": "ping"}, timeout=10) == {"ok": True}
+
+    def test_client_matches_one_shot_report(self, daemon, sample_targz, tmp_path, capsys):
+        local = main(["--input", sample_targz, "--output", str(tmp_path / "local")])
+        local_out = capsys.readouterr().out
+
+        remote = main(["--connect", daemon, "--input", sample_targz, "--output", str(tmp_path / "remote")])
+        remote_out = capsys.readouterr().out
+
+        assert remote == local == 0
+        assert remote_out.replace("remote", "local") == local_out
+        assert sorted(os.listdir(str(tmp_path / "remote"))) == sorted(os.listdir(str(tmp_path / "local")))
+
+    def test_client_csv_to_parquet(self, daemon, sample_csv, tmp_path):
+        output = str(tmp_path / "out.parquet")
+        assert main(["--connect", daemon, "--input", sample_csv, "--output", output]) == 0
+        assert pq.read_table(output).num_rows == 100
+
+    def test_client_failure_exit_code_and_stderr(self, daemon, tmp_path, capsys):
+        missing = str(tmp_path / "missing.csv")
+        result = main(["--connect", daemon, "--input", missing, "--output", str(tmp_path / "o.parquet")])
+        assert result == 1
+        assert "Conversion failed" in capsys.readouterr().err
+
+    def test_failure_report_matches_one_shot(self, daemon, tmp_path, capsys):
+        missing = str(tmp_path / "missing.csv")
+        reports, outputs = [], []
+        for connect in ([], ["--connect", daemon]):
+            path = tmp_path / "report{}.json".format(len(reports))
+            result = main(
+                connect + ["--input", missing, "--output", str(tmp_path / "o.parquet"), "--summary-json", str(path)]
+            )
+            assert result == 1
+            outputs.append(capsys.readouterr().out)
+            report = json.loads(path.read_text())
+            # Timings and RSS are measured, not reported by the conversion
+            for key in ("started_at", "finished_at", "duration_s", "peak_rss_bytes"):
+                del report[key]
+            for entry in [report["totals"]] + report["files"]:
+                for key in ("files_per_s", "duration_s", "rss_peak_bytes"):
+                    entry.pop(key, None)
+            reports.append(report)
+
+        local, remote = reports
+        assert local["error"]
+        assert local["files"][0]["status"] == "failure"
+        assert remote == local
+        assert outputs[1] == outputs[0]
+
+    def test_relative_paths_resolve_against_client_cwd(self, daemon, sample_csv, tmp_path, monkeypatch):
+        shutil.copy(sample_csv, str(tmp_path / "rel.csv"))
+        monkeypatch.chdir(tmp_path)
+        assert main(["--connect", daemon, "--input", "rel.csv", "--output", "rel.parquet"]) == 0
+        assert os.path.exists(str(tmp_path / "rel.parquet"))
+
+    def test_s3_output_uri_passed_through(self, s3_daemon, s3_server, sample_csv):
+        assert main(["--connect", s3_daemon, "--input", sample_csv, "--output", "s3://b/out.parquet"]) == 0
+        table = pq.read_table(io.BytesIO(s3_server.objects["b/out.parquet"]))
+        assert table.num_rows == 100
+
+    def test_s3_input_uri_passed_through(self, s3_daemon, s3_server, sample_csv, tmp_path):
+        with open(sample_csv, "rb") as f:
+            s3_server.objects["b/in/sample.csv"] = f.read()
+        output = str(tmp_path / "out.parquet")
+        assert main(["--connect", s3_daemon, "--input", "s3://b/in/sample.csv", "--output", output]) == 0
+        assert pq.read_table(output).num_rows == 100
+
+    def test_argument_errors_stay_local(self, daemon):
+        with pytest.raises(SystemExit):
+            main(["--connect", daemon, "--input", "a.csv", "--output", "o", "--block-size-mb", "0"])
+
+    def test_refuses_socket_in_use(self, daemon):
+        with pytest.raises(CsvconvError):
+            DaemonServer(daemon, workers=1)
+
+
+class TestExecuteRequest:
+    @pytest.fixture
+    def planned(self, monkeypatch):
+        """Arrow threads each request would be converted with."""
+        threads = []
+
+        def run_conversion(args, summary=None):
+            threads.append(cli.convert_kwargs(args)["threads"])
+            return 0, summary
+
+        monkeypatch.setattr(cli, "run_conversion", run_conversion)
+        return threads
+
+    def _args(self, *extra):
+        return vars(parse_args(["--input", "a.csv", "--output", "a.parquet"] + list(extra)))
+
+    def test_workers_share_cpu_budget(self, planned):
+        execute_request(self._args(), server_workers=4, cpu_budget=8)
+        execute_request(self._args("--threads", "6"), server_workers=4, cpu_budget=8)
+        execute_request(self._args("--threads", "1"), server_workers=4, cpu_budget=8)
+        assert planned == [2, 2, 1]
+
+    def test_serve_cpu_budget_option(self):
+        args = parse_serve_args(["--socket", "d.sock", "--workers", "2", "--cpu-budget", "6"])
+        assert (args.workers, args.cpu_budget) == (2, 6)
+
+
+class TestClient:
+    def test_connect_error_returns_one(self, socket_dir, sample_csv, tmp_path, capsys):
+        result = main(
+            [
+                "--connect",
+                os.path.join(socket_dir, "none.sock"),
+                "--input",
+                sample_csv,
+                "--output",
+                str(tmp_path / "o.parquet"),
+            ]
+        )
+        assert result == 1
+        assert "Cannot connect" in capsys.readouterr().err
+
+    def test_stale_socket_is_replaced(self, socket_dir):
+        sock_path = os.path.join(socket_dir, "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(sock_path)
+        stale.close()
+
+        server = DaemonServer(sock_path, workers=1)
+        server.server_close()
+        assert not os.path.exists(sock_path)
+
+
+@pytest.fixture(autouse=True)
+def _reset_logging():
+    yield
+    logging_config.setup_logging("INFO")
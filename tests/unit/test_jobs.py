@@ -0,0 +1,163 @@
+"""Unit tests for batch job files."""
+
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from csvconv.cli import main
+from csvconv.errors import InputValidationError
+from csvconv.jobs import format_job_report, load_job_file, run_jobs
+from csvconv.summary import ConversionSummary
+
+
+def _write_jobs(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+class TestLoadJobFile:
+    def test_bare_list_is_accepted(self, tmp_path):
+        path = _write_jobs(tmp_path / "jobs.json", [{"input": "a.csv", "output": "a.parquet"}])
+        assert load_job_file(path)["jobs"][0]["input"] == "a.csv"
+
+    def test_yaml(self, tmp_path):
+        pytest.importorskip("yaml")
+        path = tmp_path / "jobs.yaml"
+        path.write_text("workers: 2\njobs:\n  - input: a.csv\n    output: a.parquet\n")
+        data = load_job_file(str(path))
+        assert data["workers"] == 2
+        assert data["jobs"][0]["output"] == "a.parquet"
+
+    def test_toml(self, tmp_path):
+        try:
+            import tomllib  # noqa: F401
+        except ImportError:
+            pytest.importorskip("tomli")
+        path = tmp_path / "jobs.toml"
+        path.write_text('[[jobs]]\ninput = "a.csv"\noutput = "a.parquet"\n')
+        assert load_job_file(str(path))["jobs"][0]["input"] == "a.csv"
+
+    def test_unsupported_extension(self, tmp_path):
+        path = tmp_path / "jobs.txt"
+        path.write_text("[]")
+        with pytest.raises(InputValidationError):
+            load_job_file(str(path))
+
+    def test_malformed_json(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        path.write_text("{not json")
+        with pytest.raises(InputValidationError):
+            load_job_file(str(path))
+
+
+class TestRunJobs:
+    def test_runs_all_jobs_with_options(self, sample_csv, sample_targz, tmp_path):
+        out_csv = str(tmp_path / "one.parquet")
+        out_tar = str(tmp_path / "tar_out")
+        path = _write_jobs(
+            tmp_path / "jobs.json",
+            {
+                "defaults": {"codec": "zstd"},
+                "jobs": [
+                    {"name": "csv", "input": sample_csv, "output": out_csv, "types": {"id": "int32"}},
+                    {"name": "tar", "input": sample_targz, "output": out_tar, "filters": ["data_0.csv", "data_2.csv"]},
+                ],
+            },
+        )
+        summary, job_summaries = run_jobs(path, workers=2)
+
+        assert summary.total_success == 3
+        assert summary.total_failure == 0
+        assert job_summaries["tar"].total_success == 2
+        assert pq.read_schema(out_csv).field("id").type == pa.int32()
+        meta = pq.ParquetFile(out_csv).metadata
+        assert meta.row_group(0).column(0).compression == "ZSTD"
+        assert sorted(os.listdir(out_tar)) == ["data_0.parquet", "data_2.parquet"]
+
+    def test_failures_are_isolated_per_job(self, sample_csv, tmp_path):
+        path = _write_jobs(
+            tmp_path / "jobs.json",
+            [
+                {"name": "bad-option", "input": sample_csv, "output": "x", "bogus": 1},
+                {"name": "missing", "input": str(tmp_path / "nope.csv"), "output": str(tmp_path / "n.parquet")},
+                {"name": "good", "input": sample_csv, "output": str(tmp_path / "good.parquet")},
+            ],
+        )
+        summary, job_summaries = run_jobs(path)
+
+        assert job_summaries["good"].total_success == 1
+        assert job_summaries["bad-option"].total_failure == 1
+        assert job_summaries["missing"].total_failure == 1
+        assert summary.total_failure == 2
+        report = format_job_report(job_summaries)
+        assert "good: OK" in report
+        assert "missing: FAILED" in report
+
+    def test_glob_job_expands_to_tasks(self, tmp_path):
+        for name in ("a.csv", "b.csv"):
+            (tmp_path / name).write_text("x,y\n1,2\n")
+        path = _write_jobs(
+            tmp_path / "jobs.json",
+            [
+                {"name": "glob", "input": str(tmp_path / "*.csv"), "output": str(tmp_path / "out")},
+            ],
+        )
+        summary, job_summaries = run_jobs(path)
+        assert job_summaries["glob"].total_success == 2
+        assert sorted(os.listdir(str(tmp_path / "out"))) == ["a.parquet", "b.parquet"]
+
+    def test_cpu_budget_plans_threads(self, sample_csv, tmp_path, mocker):
+        spy = mocker.patch("csvconv.parallel.run_tasks", return_value=ConversionSummary())
+        path = _write_jobs(
+            tmp_path / "jobs.json",
+            {
+                "workers": 2,
+                "cpu_budget": 6,
+                "jobs": [
+                    {"name": "auto", "input": sample_csv, "output": str(tmp_path / "a.parquet")},
+                    {"name": "pinned", "input": sample_csv, "output": str(tmp_path / "b.parquet"), "threads": 1},
+                ],
+            },
+        )
+        run_jobs(path)
+        tasks = spy.call_args[0][0]
+        assert [t.kwargs["threads"] for t in tasks] == [3, 1]
+
+    def test_max_concurrency_limits_job_group(self, sample_csv, tmp_path, mocker):
+        spy = mocker.patch("csvconv.parallel.run_tasks", return_value=ConversionSummary())
+        path = _write_jobs(
+            tmp_path / "jobs.json",
+            [
+                {"name": "limited", "input": sample_csv, "output": str(tmp_path / "a.parquet"), "max_concurrency": 1},
+                {"name": "free", "input": sample_csv, "output": str(tmp_path / "b.parquet")},
+                {"name": "zero", "input": sample_csv, "output": "x", "max_concurrency": 0},
+            ],
+        )
+        summary, job_summaries = run_jobs(path, workers=4)
+        assert spy.call_args[1]["group_limits"] == {"limited": 1}
+        assert all("max_concurrency" not in t.kwargs for t in spy.call_args[0][0])
+        assert job_summaries["zero"].total_failure == 1
+
+
+class TestRunCommand:
+    def test_run_command_exit_codes(self, sample_csv, tmp_path, capsys):
+        good = _write_jobs(
+            tmp_path / "good.json",
+            [
+                {"input": sample_csv, "output": str(tmp_path / "out.parquet")},
+            ],
+        )
+        assert main(["run", good]) == 0
+        out = capsys.readouterr().out
+        assert "Job Summary" in out
+        assert "Success: 1" in out
+
+        bad = _write_jobs(tmp_path / "bad.json", [{"input": sample_csv}])
+        assert main(["run", bad]) == 1
+
+    def test_run_command_missing_file(self, tmp_path):
+        assert main(["run", str(tmp_path / "missing.json")]) == 1
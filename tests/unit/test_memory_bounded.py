@@ -2,11 +2,27 @@
 
 import csv
 import os
+import tarfile
 
 import pyarrow.parquet as pq
 import pytest
 
 from csvconv.converter import convert
+from csvconv.errors import MemoryLimitError
+from csvconv.metrics import current_rss_bytes
+
+MB = 1024 * 1024
+
+# Ceilings for 1 MB blocks. The synthetic inputs below are larger than these,
+# so materializing a whole file or member would break them.
+ARROW_POOL_CEILING = 64 * MB
+RSS_GROWTH_CEILING = 256 * MB
+
+
+def _write_wide_csv(path, rows, width=400):
+    with open(path, "w") as f:
+        f.write("id,value,description\n")
+        f.writelines("{},{},{}\n".format(i, i * 0.1, "x" * width) for i in range(rows))
 
 
 class TestMemoryBounded:
@@ -64,3 +80,68 @@ class TestMemoryBounded:
 
         pf = pq.ParquetFile(pq_path)
         assert pf.metadata.num_rows == 1000
+
+
+class TestMemoryCeilings:
+    """Assert per-file memory ceilings on large synthetic inputs."""
+
+    def test_large_csv_stays_under_ceilings(self, tmp_path):
+        csv_path = str(tmp_path / "wide.csv")
+        _write_wide_csv(csv_path, 200000)  # ~84 MB
+        assert os.path.getsize(csv_path) > ARROW_POOL_CEILING
+
+        baseline = current_rss_bytes()
+        summary = convert(csv_path, str(tmp_path / "wide.parquet"), block_size_mb=1)
+
+        metrics = summary.files[0]
+        assert metrics["rows"] == 200000
+        assert 0 < metrics["arrow_pool_peak_bytes"] < ARROW_POOL_CEILING
+        assert metrics["rss_peak_bytes"] - baseline < RSS_GROWTH_CEILING
+
+    def test_large_targz_members_stay_under_ceilings(self, tmp_path):
+        csv_path = str(tmp_path / "member.csv")
+        _write_wide_csv(csv_path, 100000)  # ~42 MB per member
+        tar_path = str(tmp_path / "wide.tar.gz")
+        with tarfile.open(tar_path, "w:gz", compresslevel=1) as tar:
+            tar.add(csv_path, arcname="a.csv")
+            tar.add(csv_path, arcname="b.csv")
+
+        baseline = current_rss_bytes()
+        summary = convert(tar_path, str(tmp_path / "out"), input_type="tar.gz", block_size_mb=1)
+
+        assert summary.total_success == 2
+        for metrics in summary.files:
+            assert metrics["arrow_pool_peak_bytes"] < ARROW_POOL_CEILING
+            assert metrics["rss_peak_bytes"] - baseline < RSS_GROWTH_CEILING
+
+    def test_ceiling_fails_csv_cleanly(self, sample_csv, tmp_path):
+        with pytest.raises(MemoryLimitError):
+            convert(sample_csv, str(tmp_path / "out.parquet"), max_memory_mb=1)
+        assert os.listdir(str(tmp_path)) == ["sample.csv"]
+
+    def test_ceiling_fails_members_cleanly(self, sample_targz, tmp_path):
+        out_dir = tmp_path / "out"
+        summary = convert(sample_targz, str(out_dir), input_type="tar.gz", max_memory_mb=1)
+        assert summary.total_failure == 3
+        assert all("memory ceiling" in f["reason"] for f in summary.failures)
+        assert os.listdir(str(out_dir)) == []
+
+    def test_generous_ceiling_passes(self, sample_targz, tmp_path):
+        summary = convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz", max_memory_mb=64 * 1024)
+        assert summary.total_success == 3
+        assert all(f["rss_peak_bytes"] > 0 for f in summary.files)
+
+    def test_rss_flat_across_many_members(self, tmp_path):
+        """Released pool memory keeps RSS from creeping up member after member."""
+        tar_path = str(tmp_path / "many.tar.gz")
+        with tarfile.open(tar_path, "w:gz", compresslevel=1) as tar:
+            for m in range(40):
+                csv_path = str(tmp_path / "member.csv")
+                _write_wide_csv(csv_path, 2000, width=64)
+                tar.add(csv_path, arcname="part-{:03d}.csv".format(m))
+
+        summary = convert(tar_path, str(tmp_path / "out"), input_type="tar.gz")
+
+        assert summary.total_success == 40
+        peaks = [f["rss_peak_bytes"] for f in summary.files]
+        assert max(peaks[10:]) - peaks[10] < 16 * MB
@@ -0,0 +1,83 @@
+"""Tests for Arrow memory pool selection and release between members."""
+
+import pyarrow as pa
+import pytest
+
+from csvconv import memory
+from csvconv.converter import convert
+from csvconv.errors import CsvconvError
+
+
+@pytest.fixture(autouse=True)
+def _restore_pool():
+    pool = pa.default_memory_pool()
+    yield
+    pa.set_memory_pool(pool)
+
+
+class TestMemoryPool:
+    @pytest.mark.parametrize("name", memory.MEMORY_POOLS)
+    def test_use_memory_pool(self, name):
+        try:
+            memory.use_memory_pool(name)
+        except CsvconvError:
+            pytest.skip("{} not built into this PyArrow".format(name))
+        assert pa.default_memory_pool().backend_name == name
+
+    def test_unknown_pool(self):
+        with pytest.raises(CsvconvError):
+            memory.use_memory_pool("tcmalloc")
+
+    def test_convert_selects_pool(self, sample_csv, tmp_path, mocker):
+        used = []
+        mocker.patch.object(
+            memory, "release_unused", lambda context=None: used.append(pa.default_memory_pool().backend_name)
+        )
+        summary = convert(sample_csv, str(tmp_path / "out.parquet"), memory_pool="system")
+        assert summary.total_success == 1
+        assert used and set(used) == {"system"}
+
+    def test_pool_restored_after_conversion(self, sample_csv, tmp_path):
+        pools = [name for name in memory.MEMORY_POOLS if name != pa.default_memory_pool().backend_name]
+        before = pa.default_memory_pool().backend_name
+        for name in pools:
+            try:
+                convert(sample_csv, str(tmp_path / "out.parquet"), memory_pool=name)
+            except CsvconvError:
+                continue
+            assert pa.default_memory_pool().backend_name == before
+
+    def test_pool_restored_after_failure(self, tmp_path):
+        before = pa.default_memory_pool().backend_name
+        other = "system" if before != "system" else "jemalloc"
+        with pytest.raises(Exception):
+            convert(str(tmp_path / "missing.csv"), str(tmp_path / "out.parquet"), memory_pool=other)
+        assert pa.default_memory_pool().backend_name == before
+
+    def test_release_between_members(self, sample_targz, tmp_path, mocker):
+        spy = mocker.spy(memory, "release_unused")
+        convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz", small_member_bytes=0)
+        released = [c.args[0] for c in spy.call_args_list]
+        assert released == ["data_0.csv", "data_1.csv", "data_2.csv", "sample.tar.gz"]
+
+    def test_small_members_release_per_group(self, sample_targz, tmp_path, mocker):
+        spy = mocker.spy(memory, "release_unused")
+        convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz")
+        assert [c.args[0] for c in spy.call_args_list] == ["sample.tar.gz"]
+
+    def test_release_logs_pool_statistics(self, caplog):
+        with caplog.at_level("DEBUG", logger="csvconv"):
+            memory.release_unused("member.csv")
+        assert "after member.csv" in caplog.text
+        assert "bytes allocated" in caplog.text
+
+    def test_writer_releases_after_large_flush(self, tmp_path, mocker):
+        from csvconv.writer.parquet_writer import IncrementalParquetWriter
+
+        mocker.patch("csvconv.writer.parquet_writer.RELEASE_INTERVAL_BYTES", 1)
+        spy = mocker.patch("csvconv.writer.parquet_writer.release_unused")
+        batch = pa.record_batch([pa.array([1, 2, 3])], names=["id"])
+        with IncrementalParquetWriter(str(tmp_path / "out.parquet"), batch.schema) as writer:
+            writer.write_batch(batch)
+            writer.write_batch(batch)
+        assert spy.call_count == 2
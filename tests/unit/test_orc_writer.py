@@ -0,0 +1,48 @@
+"""Unit tests for csvconv incremental ORC writer."""
+
+import os
+
+import pyarrow as pa
+import pyarrow.orc as orc
+import pytest
+
+from csvconv.errors import InputValidationError, SchemaMismatchError
+from csvconv.writer.orc_writer import IncrementalOrcWriter
+
+
+@pytest.fixture
+def test_schema():
+    return pa.schema([("id", pa.int64()), ("tag", pa.dictionary(pa.int32(), pa.string()))])
+
+
+class TestIncrementalOrcWriter:
+    """Tests for IncrementalOrcWriter."""
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "zstd", "none"])
+    def test_dictionary_columns_written_as_values(self, tmp_path, test_schema, compression):
+        output = str(tmp_path / "out.orc")
+        with IncrementalOrcWriter(output, test_schema, compression=compression) as writer:
+            for ids, tags in (([1, 2], ["a", "b"]), ([3], ["c"])):
+                writer.write_batch(
+                    pa.record_batch([pa.array(ids), pa.array(tags).dictionary_encode()], schema=test_schema)
+                )
+        table = orc.read_table(output)
+        assert table.schema.field("tag").type == pa.string()
+        assert table.to_pydict() == {"id": [1, 2, 3], "tag": ["a", "b", "c"]}
+        assert os.listdir(str(tmp_path)) == ["out.orc"]
+
+    def test_empty_file_keeps_schema(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.orc")
+        with IncrementalOrcWriter(output, test_schema):
+            pass
+        assert orc.read_table(output).schema.names == ["id", "tag"]
+
+    def test_unsupported_compression_rejected(self, tmp_path, test_schema):
+        with pytest.raises(InputValidationError, match="brotli"):
+            IncrementalOrcWriter(str(tmp_path / "out.orc"), test_schema, compression="brotli")
+
+    def test_incompatible_batch_leaves_no_file(self, tmp_path, test_schema):
+        with pytest.raises(SchemaMismatchError):
+            with IncrementalOrcWriter(str(tmp_path / "out.orc"), test_schema) as writer:
+                writer.write_batch(pa.record_batch({"id": ["1"], "tag": ["x"]}))
+        assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,220 @@
+"""Unit tests for multi-input expansion and pool scheduling."""
+
+import os
+import shutil
+import time
+
+import pyarrow.parquet as pq
+import pytest
+
+from csvconv import parallel
+from csvconv.cli import main, parse_args
+from csvconv.errors import InputValidationError
+from csvconv.parallel import (
+    ConversionTask,
+    build_tasks,
+    detect_input_type,
+    expand_inputs,
+    is_multi_input,
+    output_path_for,
+    run_task,
+    run_tasks,
+)
+from csvconv.summary import ConversionSummary
+
+
+def _run_task_or_die(task):
+    """parallel.run_task that kills its worker for inputs named *_die.csv."""
+    if task.name.endswith("_die.csv"):
+        os._exit(1)
+    return run_task(task)
+
+
+def _run_task_alone_in_group(task):
+    """parallel.run_task stand-in that fails if its marker file is held by another task."""
+    summary = ConversionSummary()
+    try:
+        os.close(os.open(task.kwargs["marker"], os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        summary.record_failure(task.name, "ran concurrently with its group")
+        return summary
+    time.sleep(0.2)
+    os.unlink(task.kwargs["marker"])
+    summary.record_success(task.name)
+    return summary
+
+
+def _write_csv(path, rows):
+    with open(path, "w") as f:
+        f.write("id,value\n")
+        for i in range(rows):
+            f.write("{},{}\n".format(i, i * 2))
+
+
+@pytest.fixture
+def input_dir(tmp_path, sample_targz):
+    """Directory mixing CSVs of different sizes, a tar.gz and a non-input file."""
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    _write_csv(str(root / "small.csv"), 5)
+    _write_csv(str(root / "big.csv"), 500)
+    _write_csv(str(root / "sub" / "small.csv"), 10)
+    shutil.copy(sample_targz, str(root / "archive.tar.gz"))
+    (root / "notes.txt").write_text("ignored")
+    return str(root)
+
+
+class TestExpandInputs:
+    def test_directory_is_walked_recursively(self, input_dir):
+        files = expand_inputs(input_dir)
+        names = [os.path.relpath(f, input_dir) for f in files]
+        assert names == sorted(["archive.tar.gz", "big.csv", "small.csv", os.path.join("sub", "small.csv")])
+
+    def test_glob_pattern(self, input_dir):
+        files = expand_inputs(os.path.join(input_dir, "*.csv"))
+        assert [os.path.basename(f) for f in files] == ["big.csv", "small.csv"]
+
+    def test_no_match_raises(self, tmp_path):
+        with pytest.raises(InputValidationError):
+            expand_inputs(str(tmp_path / "*.csv"))
+
+    def test_is_multi_input(self, input_dir, sample_csv):
+        assert is_multi_input(input_dir)
+        assert is_multi_input(os.path.join(input_dir, "*.csv"))
+        assert not is_multi_input(sample_csv)
+
+    def test_detect_input_type(self):
+        assert detect_input_type("a.TAR.GZ") == "tar.gz"
+        assert detect_input_type("a.tgz") == "tar.gz"
+        assert detect_input_type("a.csv") == "csv"
+
+
+class TestBuildTasks:
+    def test_output_paths_mirror_input_tree(self, input_dir, tmp_path):
+        out = str(tmp_path / "out")
+        tasks = build_tasks(input_dir, out)
+        outputs = sorted(os.path.relpath(t.kwargs["output_path"], out) for t in tasks)
+        assert outputs == sorted(
+            [
+                "archive",
+                "big.parquet",
+                "small.parquet",
+                os.path.join("sub", "small.parquet"),
+            ]
+        )
+
+    def test_input_type_detected_per_file(self, input_dir, tmp_path):
+        tasks = build_tasks(input_dir, str(tmp_path / "out"))
+        types = {t.name: t.kwargs["input_type"] for t in tasks}
+        assert types["archive.tar.gz"] == "tar.gz"
+        assert types["big.csv"] == "csv"
+
+    def test_output_path_for_archive_is_directory(self):
+        assert output_path_for("/in/a.tar.gz", "/out", "tar.gz", "parquet") == os.path.join("/out", "a")
+
+    def test_output_path_for_merged_archive_is_file(self):
+        assert output_path_for("/in/a.tar.gz", "/out", "tar.gz", "parquet", merge=True) == os.path.join(
+            "/out", "a.parquet"
+        )
+        assert output_path_for("/in/a.tar.gz", "/out", "tar.gz", "csv", merge=True) == os.path.join("/out", "a")
+
+
+class TestRunTasks:
+    def test_largest_first_order(self, input_dir, tmp_path):
+        tasks = build_tasks(os.path.join(input_dir, "*.csv"), str(tmp_path / "out"))
+        summary = run_tasks(tasks, workers=1)
+        assert summary.successes == ["big.csv", "small.csv"]
+
+    def test_pool_aggregates_summary(self, input_dir, tmp_path):
+        out = str(tmp_path / "out")
+        summary = run_tasks(build_tasks(input_dir, out), workers=2, memory_budget_mb=1024)
+        # 3 CSVs + 3 archive members
+        assert summary.total_success == 6
+        assert summary.total_failure == 0
+        assert pq.read_table(os.path.join(out, "big.parquet")).num_rows == 500
+        assert len(os.listdir(os.path.join(out, "archive"))) == 3
+
+    def test_tight_budget_still_completes(self, input_dir, tmp_path):
+        tasks = build_tasks(input_dir, str(tmp_path / "out"))
+        summary = run_tasks(tasks, workers=4, memory_budget_mb=1)
+        assert summary.total_success == 6
+
+    def test_failed_task_is_isolated(self, sample_csv, tmp_path):
+        bad = ConversionTask(
+            name="missing.csv",
+            kwargs={"input_path": str(tmp_path / "missing.csv"), "output_path": str(tmp_path / "missing.parquet")},
+            size_bytes=10,
+        )
+        good = ConversionTask(
+            name="sample.csv",
+            kwargs={"input_path": sample_csv, "output_path": str(tmp_path / "ok.parquet")},
+            size_bytes=1,
+        )
+        summary = run_tasks([bad, good], workers=2)
+        assert summary.total_success == 1
+        assert summary.failures[0]["file"] == "missing.csv"
+
+    def test_dead_worker_does_not_abort_run(self, sample_csv, tmp_path, monkeypatch):
+        monkeypatch.setattr(parallel, "run_task", _run_task_or_die)
+        tasks = [
+            ConversionTask(
+                name=name,
+                size_bytes=size,
+                memory_mb=1,
+                kwargs={
+                    "input_path": sample_csv,
+                    "output_path": str(tmp_path / (name + ".parquet")),
+                },
+            )
+            for name, size in (("a_die.csv", 3), ("b.csv", 2), ("c.csv", 1))
+        ]
+        # The budget admits one task at a time, so only the dying one is in flight
+        results = []
+        summary = run_tasks(
+            tasks, workers=2, memory_budget_mb=1, on_result=lambda task, result: results.append(task.name)
+        )
+        assert sorted(results) == ["a_die.csv", "b.csv", "c.csv"]
+        assert [f["file"] for f in summary.failures] == ["a_die.csv"]
+        assert summary.total_success == 2
+
+    def test_group_limit_caps_concurrent_tasks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(parallel, "run_task", _run_task_alone_in_group)
+        # The "a" tasks share one marker, so any two of them running at once fail
+        tasks = [
+            ConversionTask(
+                name="{}{}.csv".format(group, i),
+                size_bytes=size,
+                group=group,
+                kwargs={"marker": str(tmp_path / (group if group == "a" else str(i)))},
+            )
+            for i, (group, size) in enumerate([("a", 5), ("a", 4), ("a", 3), ("b", 2), ("b", 1)])
+        ]
+        finished = []
+        summary = run_tasks(
+            tasks, workers=3, group_limits={"a": 1}, on_result=lambda task, result: finished.append(task.name)
+        )
+        assert summary.total_success == 5
+        # The "b" tasks run alongside the "a" ones instead of waiting behind them
+        assert finished[-1] == "a2.csv"
+
+
+class TestCliMultiInput:
+    def test_parse_args_leaves_type_unset_for_directory(self, input_dir):
+        args = parse_args(["--input", input_dir, "--output", "out"])
+        assert args.multi_input is True
+        assert args.input_type is None
+        assert args.workers == 1
+
+    def test_main_converts_directory(self, input_dir, tmp_path, capsys):
+        out = str(tmp_path / "out")
+        result = main(["--input", input_dir, "--output", out, "--workers", "2"])
+        assert result == 0
+        assert "Success: 6" in capsys.readouterr().out
+
+    def test_main_returns_one_when_any_file_fails(self, tmp_path):
+        root = tmp_path / "in"
+        root.mkdir()
+        _write_csv(str(root / "good.csv"), 3)
+        (root / "bad.csv").write_text("a,b\n1,2\n3\n")
+        result = main(["--input", str(root), "--output", str(tmp_path / "out")])
+        assert result == 1
@@ -0,0 +1,101 @@
+"""Unit tests for Parquet codec autotuning."""
+
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from csvconv.converter import convert
+from csvconv.writer import parquet_codec
+from csvconv.writer.parquet_codec import CodecChoice, choose_codec, pick, schema_fingerprint
+
+
+def _results():
+    return [
+        CodecChoice("snappy", None, 300.0, 2.0),
+        CodecChoice("zstd", 3, 200.0, 3.0),
+        CodecChoice("brotli", 5, 40.0, 3.5),
+    ]
+
+
+@pytest.fixture
+def sample():
+    return pa.table(
+        {
+            "id": pa.array(range(20000), pa.int64()),
+            "name": pa.array(["name_{}".format(i % 500) for i in range(20000)]),
+        }
+    )
+
+
+class TestPick:
+    """Tests for objective-based selection."""
+
+    def test_speed(self):
+        assert pick(_results(), "speed").compression == "snappy"
+
+    def test_size(self):
+        assert pick(_results(), "size").compression == "brotli"
+
+    def test_balanced_skips_slow_codecs(self):
+        assert pick(_results(), "balanced").compression == "zstd"
+
+    def test_min_throughput(self):
+        assert pick(_results(), "size", min_throughput_mbps=100).compression == "zstd"
+
+    def test_min_throughput_unreachable_uses_fastest(self):
+        assert pick(_results(), "size", min_throughput_mbps=1000).compression == "snappy"
+
+
+class TestChooseCodec:
+    """Tests for trial compression and the choice cache."""
+
+    def test_choice_is_cached_per_schema(self, sample, tmp_path):
+        cache = str(tmp_path / "codecs.json")
+        first = choose_codec(sample, "size", cache_path=cache)
+        assert not first.cached
+        with open(cache) as f:
+            entries = json.load(f)
+        assert len(entries) == 1
+        assert next(iter(entries)).startswith(schema_fingerprint(sample.schema))
+
+        second = choose_codec(sample, "size", cache_path=cache)
+        assert second.cached
+        assert (second.compression, second.level) == (first.compression, first.level)
+
+        other = choose_codec(sample.select(["id"]), "size", cache_path=cache)
+        assert not other.cached
+
+    def test_entries_of_parallel_workers_are_kept(self, sample, tmp_path, monkeypatch):
+        cache = str(tmp_path / "codecs.json")
+        real_trial = parquet_codec.trial
+
+        def trial(sample, compression, level):
+            # Another worker stores its choice while this one is trialling
+            with open(cache, "w") as f:
+                json.dump({"other:size:0": {"compression": "zstd", "level": 1}}, f)
+            return real_trial(sample, compression, level)
+
+        monkeypatch.setattr(parquet_codec, "trial", trial)
+        choose_codec(sample, "size", cache_path=cache)
+        with open(cache) as f:
+            entries = json.load(f)
+        assert len(entries) == 2
+        assert "other:size:0" in entries
+
+    def test_convert_with_auto_compression(self, sample_csv, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        output = str(tmp_path / "out.parquet")
+        summary = convert(sample_csv, output, compression="auto", optimize="speed")
+        codec = summary.files[0]["codec"]
+        column = pq.ParquetFile(output).metadata.row_group(0).column(0)
+        assert column.compression.lower().startswith(codec.split("(")[0])
+        assert "autotune" in summary.files[0]["stages"]
+        assert (tmp_path / "cache" / "csvconv" / "codecs.json").exists()
+
+    def test_targz_members_share_choice(self, sample_targz, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        summary = convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz", compression="auto", optimize="size")
+        assert summary.total_failure == 0
+        assert len({f["codec"] for f in summary.files}) == 1
@@ -0,0 +1,79 @@
+"""Unit tests for per-column Parquet encoding selection."""
+
+import datetime
+import random
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from csvconv.writer.parquet_encoding import DEFAULT, DICTIONARY, choose_encodings
+from csvconv.writer.parquet_writer import IncrementalParquetWriter
+
+
+def _sample(rows=5000):
+    start = datetime.datetime(2024, 1, 1)
+    return pa.table(
+        {
+            "id": pa.array(range(rows), pa.int64()),
+            "ts": pa.array([start + datetime.timedelta(seconds=i) for i in range(rows)], pa.timestamp("ms")),
+            "reading": pa.array([20.0 + (i % 997) * 0.013 for i in range(rows)]),
+            "status": pa.array([("ok", "failed")[i % 2] for i in range(rows)]),
+            "flag": pa.array([i % 3 == 0 for i in range(rows)]),
+        }
+    )
+
+
+class TestChooseEncodings:
+    """Tests for choose_encodings."""
+
+    def test_picks_encoding_per_column(self):
+        choice = choose_encodings(_sample())
+        assert choice.encodings["id"] == "DELTA_BINARY_PACKED"
+        assert choice.encodings["ts"] == "DELTA_BINARY_PACKED"
+        assert choice.encodings["status"] == DICTIONARY
+        assert choice.encodings["flag"] == DEFAULT
+        assert choice.sample_saved_bytes > 0
+
+    def test_unhelpful_candidate_keeps_default(self):
+        # Random wide integers: neither sorted nor narrow
+        rng = random.Random(0)
+        table = pa.table({"n": pa.array([rng.randrange(-(2**62), 2**62) for _ in range(2000)])})
+        assert choose_encodings(table).encodings["n"] in (DEFAULT, "PLAIN")
+
+    def test_writer_kwargs(self):
+        choice = choose_encodings(_sample())
+        kwargs = choice.writer_kwargs()
+        assert kwargs["column_encoding"]["id"] == "DELTA_BINARY_PACKED"
+        assert "status" in kwargs["use_dictionary"]
+        assert "id" not in kwargs["use_dictionary"]
+
+    def test_estimated_saved_bytes_scales_with_rows(self):
+        choice = choose_encodings(_sample(1000))
+        assert choice.estimated_saved_bytes(2000) == 2 * choice.sample_saved_bytes
+
+
+class TestAutoEncodingWriter:
+    """Tests for IncrementalParquetWriter(encoding="auto")."""
+
+    def test_auto_encoding_smaller_than_default(self, tmp_path):
+        table = _sample(20000)
+        sizes = {}
+        for mode in (None, "auto"):
+            path = str(tmp_path / "{}.parquet".format(mode))
+            with IncrementalParquetWriter(path, table.schema, encoding=mode) as writer:
+                for batch in table.to_batches(max_chunksize=5000):
+                    writer.write_batch(batch)
+            sizes[mode] = (tmp_path / "{}.parquet".format(mode)).stat().st_size
+            assert pq.read_table(path).equals(table)
+        assert sizes["auto"] < sizes[None]
+        assert writer.encoding_saved_bytes > 0
+        column = pq.ParquetFile(path).metadata.row_group(3).column(0)
+        assert "DELTA_BINARY_PACKED" in column.encodings
+
+    def test_auto_encoding_empty_file(self, tmp_path):
+        path = str(tmp_path / "empty.parquet")
+        schema = pa.schema([("id", pa.int64())])
+        with IncrementalParquetWriter(path, schema, encoding="auto") as writer:
+            pass
+        assert pq.read_table(path).num_rows == 0
+        assert writer.encodings is None
@@ -6,7 +6,12 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
 
-from csvconv.writer.parquet_writer import IncrementalParquetWriter
+from csvconv.writer.parquet_writer import (
+    IncrementalParquetWriter,
+    RollingParquetWriter,
+    publish_all,
+)
+from csvconv.writer.parts import part_path
 
 
 def _make_batch(schema, num_rows=100):
@@ -84,3 +89,74 @@ class TestIncrementalParquetWriter:
         """Writing to a non-existent directory should raise an error."""
         with pytest.raises((OSError, FileNotFoundError)):
             IncrementalParquetWriter("/nonexistent/dir/out.parquet", test_schema)
+
+    def test_plain_batches_cast_to_dictionary_schema(self, tmp_path, test_schema):
+        output = str(tmp_path / "dict.parquet")
+        dict_schema = test_schema.set(2, pa.field("name", pa.dictionary(pa.int32(), pa.string())))
+        with IncrementalParquetWriter(output, dict_schema) as writer:
+            writer.write_batch(_make_batch(test_schema, 10))
+        table = pq.read_table(output)
+        assert pa.types.is_dictionary(table.schema.field("name").type)
+        assert table.column("name").to_pylist()[0] == "name_0"
+
+    def test_incompatible_batch_raises(self, tmp_path, test_schema):
+        from csvconv.errors import SchemaMismatchError
+
+        other = pa.schema([("id", pa.string()), ("value", pa.float64()), ("name", pa.string())])
+        batch = pa.RecordBatch.from_pydict({"id": ["1"], "value": [1.0], "name": ["a"]}, schema=other)
+        with pytest.raises(SchemaMismatchError):
+            with IncrementalParquetWriter(str(tmp_path / "x.parquet"), test_schema) as writer:
+                writer.write_batch(batch)
+
+    def test_deferred_publish(self, tmp_path, test_schema):
+        writers = []
+        for name in ("a", "b"):
+            with IncrementalParquetWriter(str(tmp_path / (name + ".parquet")), test_schema,
+                                          defer_publish=True) as writer:
+                writer.write_batch(_make_batch(test_schema, 10))
+            writers.append(writer)
+        # Closed but not yet visible under the final names
+        assert sorted(os.listdir(str(tmp_path))) == sorted(
+            os.path.basename(w._tmp_path) for w in writers
+        )
+        publish_all(writers)
+        assert sorted(os.listdir(str(tmp_path))) == ["a.parquet", "b.parquet"]
+        assert pq.read_table(str(tmp_path / "b.parquet")).num_rows == 10
+
+
+class TestRollingParquetWriter:
+    """Tests for RollingParquetWriter."""
+
+    def test_part_path(self):
+        assert part_path("/o/out.parquet", 3) == "/o/out-part-00003.parquet"
+        assert part_path("/o/m.csv.gz", 0) == "/o/m-part-00000.csv.gz"
+
+    def test_rolls_by_rows(self, tmp_path, test_schema):
+        output = str(tmp_path / "out.parquet")
+        with RollingParquetWriter(output, test_schema, max_file_rows=120) as writer:
+            for _ in range(3):
+                writer.write_batch(_make_batch(test_schema, 100))
+        assert [p["rows"] for p in writer.parts] == [120, 120, 60]
+        assert [os.path.basename(p["path"]) for p in writer.parts] == [
+            "out-part-00000.parquet", "out-part-00001.parquet", "out-part-00002.parquet",
+        ]
+        assert not os.path.exists(output)
+        ids = []
+        for part in writer.parts:
+            ids.extend(pq.read_table(part["path"]).column("id").to_pylist())
+        assert ids == list(range(100)) * 3
+
+    def test_rolls_by_bytes(self, tmp_path, test_schema):
+        with RollingParquetWriter(str(tmp_path / "out.parquet"), test_schema,
+                                  max_file_bytes=1) as writer:
+            for _ in range(3):
+                writer.write_batch(_make_batch(test_schema, 10))
+        assert len(writer.parts) == 3
+
+    def test_error_removes_parts(self, tmp_path, test_schema):
+        with pytest.raises(RuntimeError):
+            with RollingParquetWriter(str(tmp_path / "out.parquet"), test_schema,
+                                      max_file_rows=10) as writer:
+                writer.write_batch(_make_batch(test_schema, 25))
+                raise RuntimeError("boom")
+        assert os.listdir(str(tmp_path)) == []
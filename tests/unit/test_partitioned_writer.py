@@ -0,0 +1,142 @@
+"""Unit tests for the hive-partitioned Parquet dataset writer."""
+
+import os
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from csvconv.converter import convert
+from csvconv.errors import InputValidationError
+from csvconv.parallel import build_tasks
+from csvconv.writer.partitioned_writer import PartitionedParquetWriter, split_by_keys
+
+
+@pytest.fixture
+def schema():
+    return pa.schema([("day", pa.string()), ("region", pa.string()), ("value", pa.int64())])
+
+
+def _batch(schema, rows):
+    return pa.RecordBatch.from_pylist([{"day": d, "region": r, "value": v} for d, r, v in rows], schema=schema)
+
+
+def _read(root):
+    table = ds.dataset(root, format="parquet", partitioning="hive").to_table()
+    return sorted(zip(*(table.column(n).to_pylist() for n in ("day", "region", "value"))), key=lambda row: row[2])
+
+
+class TestSplitByKeys:
+    """Tests for split_by_keys."""
+
+    def test_groups_rows(self, schema):
+        table = pa.Table.from_batches(
+            [
+                _batch(
+                    schema,
+                    [
+                        ("d1", "eu", 1),
+                        ("d2", "us", 2),
+                        ("d1", "eu", 3),
+                        ("d1", "us", 4),
+                    ],
+                )
+            ]
+        )
+        groups = {
+            key: rows.column("value").to_pylist() for key, rows in split_by_keys(table, ["day", "region"], ["value"])
+        }
+        assert groups == {("d1", "eu"): [1, 3], ("d1", "us"): [4], ("d2", "us"): [2]}
+
+
+class TestPartitionedParquetWriter:
+    """Tests for PartitionedParquetWriter."""
+
+    def test_writes_hive_layout(self, tmp_path, schema):
+        root = str(tmp_path / "ds")
+        rows = [("2024-01-01", "eu", 1), ("2024-01-02", "us", 2), ("2024-01-01", None, 3)]
+        with PartitionedParquetWriter(root, schema, ["day", "region"], prefix="in") as writer:
+            writer.write_batch(_batch(schema, rows))
+        assert writer.partitions == 3
+        assert os.path.isfile(os.path.join(root, "day=2024-01-01", "region=eu", "in-part-00000.parquet"))
+        assert os.path.isdir(os.path.join(root, "day=2024-01-01", "region=__HIVE_DEFAULT_PARTITION__"))
+        eu = ds.dataset(os.path.join(root, "day=2024-01-01", "region=eu"), format="parquet")
+        assert eu.schema.names == ["value"]
+        assert _read(root) == rows
+
+    def test_lru_bounds_open_writers(self, tmp_path, schema, monkeypatch):
+        import csvconv.writer.partitioned_writer as pw
+
+        # Flush every slice so each batch reaches the writers
+        monkeypatch.setattr(pw, "BUFFER_BYTES", 1)
+        root = str(tmp_path / "ds")
+        expected = []
+        with PartitionedParquetWriter(root, schema, ["region"], max_open_writers=2) as writer:
+            for i in range(4):
+                batch_rows = [("d", "r{}".format(r), i * 10 + r) for r in range(5)]
+                expected.extend(batch_rows)
+                writer.write_batch(_batch(schema, batch_rows))
+                assert len(writer._open) <= 2
+        # Partitions evicted and reopened continue in new part files
+        assert len(writer.files) > 5
+        assert [row[2] for row in _read(root)] == sorted(v for _, _, v in expected)
+
+    def test_max_file_rows_rolls_partition_parts(self, tmp_path, schema, monkeypatch):
+        import csvconv.writer.partitioned_writer as pw
+
+        monkeypatch.setattr(pw, "BUFFER_BYTES", 1)
+        root = str(tmp_path / "ds")
+        with PartitionedParquetWriter(root, schema, ["region"], max_file_rows=2) as writer:
+            for i in range(3):
+                writer.write_batch(_batch(schema, [("d", "eu", 2 * i), ("d", "eu", 2 * i + 1)]))
+        assert sorted(os.listdir(os.path.join(root, "region=eu"))) == [
+            "data-part-00000.parquet",
+            "data-part-00001.parquet",
+            "data-part-00002.parquet",
+        ]
+
+    def test_error_removes_all_parts(self, tmp_path, schema, monkeypatch):
+        import csvconv.writer.partitioned_writer as pw
+
+        monkeypatch.setattr(pw, "BUFFER_BYTES", 1)
+        root = str(tmp_path / "ds")
+        with pytest.raises(RuntimeError):
+            with PartitionedParquetWriter(root, schema, ["region"], max_open_writers=1) as writer:
+                writer.write_batch(_batch(schema, [("d", "a", 1), ("d", "b", 2)]))
+                raise RuntimeError("boom")
+        files = [f for _, _, names in os.walk(root) for f in names]
+        assert files == []
+
+    def test_unknown_partition_column(self, tmp_path, schema):
+        with pytest.raises(InputValidationError):
+            PartitionedParquetWriter(str(tmp_path), schema, ["country"])
+
+
+class TestPartitionedConvert:
+    """Tests for convert(partition_by=...)."""
+
+    def test_csv_to_partitioned_dataset(self, tmp_path):
+        source = tmp_path / "sales.csv"
+        source.write_text("day,region,value\n2024-01-01,eu,1\n2024-01-01,us,2\n2024-01-02,eu,3\n")
+        root = str(tmp_path / "out")
+        summary = convert(str(source), root, partition_by=["day"])
+        record = summary.files[0]
+        assert record["partitions"] == 2
+        assert record["output_files"] == 2
+        assert record["output_bytes"] > 0
+        assert os.path.isfile(os.path.join(root, "day=2024-01-02", "sales-part-00000.parquet"))
+
+    def test_targz_members_share_dataset(self, sample_targz, tmp_path):
+        root = str(tmp_path / "out")
+        summary = convert(sample_targz, root, input_type="tar.gz", partition_by=["name"])
+        assert summary.total_failure == 0
+        table = ds.dataset(root, format="parquet", partitioning="hive").to_table()
+        assert table.num_rows == sum(f["rows"] for f in summary.files)
+
+    def test_multi_input_tasks_share_root(self, tmp_path):
+        (tmp_path / "in" / "a").mkdir(parents=True)
+        (tmp_path / "in" / "a" / "x.csv").write_text("k,v\n1,2\n")
+        (tmp_path / "in" / "y.csv").write_text("k,v\n1,2\n")
+        tasks = build_tasks(str(tmp_path / "in"), str(tmp_path / "out"), partition_by=["k"])
+        assert {t.kwargs["output_path"] for t in tasks} == {str(tmp_path / "out")}
+        assert sorted(t.kwargs["part_prefix"] for t in tasks) == ["a_x", "y"]
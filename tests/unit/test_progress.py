@@ -0,0 +1,88 @@
+"""Unit tests for progress reporting."""
+
+import io
+import os
+
+from csvconv.cli import main
+from csvconv.converter import convert
+from csvconv.progress import ProgressReporter, format_eta
+
+
+class TestFormatEta:
+    def test_format(self):
+        assert format_eta(0) == "0:00:00"
+        assert format_eta(3725) == "1:02:05"
+
+    def test_unknown(self):
+        assert format_eta(None) == "--:--:--"
+
+
+class TestProgressReporter:
+    def test_tracks_read_position(self, sample_csv):
+        stream = io.StringIO()
+        total = os.path.getsize(sample_csv)
+        with ProgressReporter(total, stream=stream, interval=60) as progress:
+            with open(sample_csv, "rb", buffering=0) as f, progress.tracking(f):
+                f.read(100)
+            assert progress.bytes_done == 100
+            with open(sample_csv, "rb", buffering=0) as f, progress.tracking(f):
+                f.read(10)
+            # Re-reading from the start never moves progress backwards
+            assert progress.bytes_done == 100
+
+    def test_finish_input(self):
+        stream = io.StringIO()
+        with ProgressReporter(300, stream=stream, interval=60) as progress:
+            progress.finish_input(100, rows=5)
+            progress.finish_input(200, rows=7)
+        assert progress.bytes_done == 300
+        assert progress.rows == 12
+        assert stream.getvalue().startswith("Progress: 100.0% ")
+
+    def test_periodic_lines(self):
+        stream = io.StringIO()
+        with ProgressReporter(100, stream=stream, interval=0.01) as progress:
+            while stream.getvalue().count("\n") < 2:
+                pass
+            progress.finish_input(100)
+        lines = stream.getvalue().splitlines()
+        assert all(line.startswith("Progress:") for line in lines)
+        assert "ETA" in lines[-1]
+
+    def test_convert_targz_reaches_end(self, sample_targz, tmp_path):
+        stream = io.StringIO()
+        total = os.path.getsize(sample_targz)
+        with ProgressReporter(total, stream=stream, interval=60) as progress:
+            convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz", progress=progress)
+        assert progress.rows == 150
+        assert 0 < progress.bytes_done <= total
+
+
+class TestProgressOption:
+    def test_progress_goes_to_stderr(self, sample_csv, tmp_path, capsys):
+        result = main(
+            [
+                "--input",
+                sample_csv,
+                "--output",
+                str(tmp_path / "out.parquet"),
+                "--progress",
+            ]
+        )
+        captured = capsys.readouterr()
+        assert result == 0
+        assert "Progress: 100.0%" in captured.err
+        assert "Progress" not in captured.out
+
+    def test_progress_for_directory_input(self, sample_csv, tmp_path, capsys):
+        result = main(
+            [
+                "--input",
+                os.path.dirname(sample_csv),
+                "--output",
+                str(tmp_path / "out"),
+                "--progress",
+            ]
+        )
+        assert result == 0
+        assert "Progress: 100.0%" in capsys.readouterr().err
@@ -0,0 +1,98 @@
+"""Unit tests for csvconv read-ahead input files."""
+
+import io
+import os
+
+import pytest
+
+import csvconv.reader.readahead as readahead
+from csvconv.converter import convert
+from csvconv.errors import InputValidationError
+from csvconv.reader.csv_reader import read_streaming
+from csvconv.reader.readahead import ReadAheadFile, configure_read_ahead, open_input
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    data = os.urandom(100000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    return str(path), data
+
+
+class TestReadAheadFile:
+    """Tests for ReadAheadFile."""
+
+    def test_reads_full_chunks_across_buffers(self, data_file):
+        path, data = data_file
+        with ReadAheadFile(path, chunk_size=4096, depth=3) as f:
+            assert f.read(10000) == data[:10000]
+            assert f.tell() == 10000
+            assert f.read() == data[10000:]
+            assert f.read(10) == b""
+
+    def test_seek_inside_and_outside_buffer(self, data_file):
+        path, data = data_file
+        with ReadAheadFile(path, chunk_size=4096, depth=2) as f:
+            f.read(100)
+            f.seek(10)
+            assert f.read(20) == data[10:30]
+            f.seek(-500, io.SEEK_END)
+            assert f.read() == data[-500:]
+            f.seek(0)
+            assert f.read(5000) == data[:5000]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_bytes(b"")
+        with ReadAheadFile(str(path)) as f:
+            assert f.read(10) == b""
+
+    def test_consumed_ranges_dropped_from_page_cache(self, data_file, monkeypatch):
+        if not hasattr(os, "posix_fadvise"):
+            pytest.skip("posix_fadvise not available")
+        path, data = data_file
+        calls = []
+        real = os.posix_fadvise
+        monkeypatch.setattr(
+            os,
+            "posix_fadvise",
+            lambda fd, offset, length, advice: (
+                calls.append((offset, length, advice)),
+                real(fd, offset, length, advice),
+            )[1],
+        )
+        with ReadAheadFile(path, chunk_size=40000, depth=2) as f:
+            f.read()
+        assert calls[0] == (0, 0, os.POSIX_FADV_SEQUENTIAL)
+        dropped = [(offset, length) for offset, length, advice in calls if advice == os.POSIX_FADV_DONTNEED]
+        assert dropped[:2] == [(0, 40000), (40000, 40000)]
+
+    def test_read_streaming_from_path(self, sample_csv):
+        assert sum(batch.num_rows for batch in read_streaming(sample_csv)) == 100
+
+
+class TestOpenInput:
+    """Tests for open_input and configure_read_ahead."""
+
+    def test_read_ahead_by_default(self, data_file):
+        with open_input(data_file[0]) as f:
+            assert isinstance(f, ReadAheadFile)
+
+    def test_depth_zero_reads_directly(self, data_file, monkeypatch):
+        monkeypatch.setitem(readahead.config, "depth", readahead.config["depth"])
+        configure_read_ahead(0)
+        with open_input(data_file[0]) as f:
+            assert not isinstance(f, ReadAheadFile)
+            assert f.read() == data_file[1]
+
+    def test_depth_reset_by_next_conversion(self, sample_csv, tmp_path, monkeypatch):
+        monkeypatch.setitem(readahead.config, "depth", readahead.config["depth"])
+        convert(sample_csv, str(tmp_path / "a.parquet"), read_ahead_depth=0)
+        assert readahead.config["depth"] == 0
+        convert(sample_csv, str(tmp_path / "b.parquet"))
+        assert readahead.config["depth"] == readahead.DEFAULT_READ_AHEAD_DEPTH
+
+    def test_negative_depth_rejected(self):
+        with pytest.raises(InputValidationError):
+            configure_read_ahead(-1)
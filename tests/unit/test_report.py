@@ -0,0 +1,121 @@
+"""Unit tests for the machine-readable run reports."""
+
+import json
+import os
+
+from csvconv.cli import main
+from csvconv.converter import convert
+from csvconv.report import build_report, format_metrics_textfile, write_summary_json
+from csvconv.summary import ConversionSummary
+
+
+class TestBuildReport:
+    def test_totals_and_stages(self, sample_csv, tmp_path):
+        summary = convert(sample_csv, str(tmp_path / "out.parquet"))
+        report = build_report(summary, 0, started_at=100.0, finished_at=101.5)
+
+        assert report["duration_s"] == 1.5
+        assert report["totals"]["success"] == 1
+        assert report["totals"]["rows"] == 100
+        assert report["totals"]["input_bytes"] == os.path.getsize(sample_csv)
+        assert report["totals"]["output_bytes"] == os.path.getsize(str(tmp_path / "out.parquet"))
+        assert set(report["totals"]["stages"]) >= {"read", "write"}
+        assert report["peak_rss_bytes"] > 0
+        assert report["totals"]["rss_peak_bytes"] > 0
+        assert report["totals"]["arrow_pool_peak_bytes"] > 0
+
+        entry = report["files"][0]
+        assert entry["status"] == "success"
+        assert entry["rows"] == 100
+        assert entry["duration_s"] >= 0
+
+    def test_targz_members_are_reported(self, sample_targz, tmp_path):
+        summary = convert(sample_targz, str(tmp_path / "out"), input_type="tar.gz")
+        report = build_report(summary, 0, started_at=0.0)
+        assert [f["rows"] for f in report["files"]] == [50, 50, 50]
+        assert "decompress" in report["totals"]["stages"]
+        assert build_report(summary, 0, 0.0, finished_at=1.5)["totals"]["files_per_s"] == 2.0
+
+    def test_write_is_atomic(self, tmp_path):
+        path = tmp_path / "report.json"
+        write_summary_json(str(path), build_report(ConversionSummary(), 0, 0.0))
+        assert json.loads(path.read_text())["exit_code"] == 0
+        assert os.listdir(str(tmp_path)) == ["report.json"]
+
+    def test_file_mode_follows_umask(self, tmp_path):
+        path = tmp_path / "report.json"
+        old = os.umask(0o022)
+        try:
+            write_summary_json(str(path), build_report(ConversionSummary(), 0, 0.0))
+        finally:
+            os.umask(old)
+        assert path.stat().st_mode & 0o777 == 0o644
+
+
+class TestMetricsTextfile:
+    def test_format(self):
+        summary = ConversionSummary()
+        summary.record_success("a.csv", rows=5, stages={"read": 0.25})
+        summary.record_failure("b.csv", "Error")
+        text = format_metrics_textfile(build_report(summary, 1, 10.0, 12.0))
+
+        assert "# TYPE csvconv_last_run_files gauge" in text
+        assert 'csvconv_last_run_files{status="success"} 1' in text
+        assert 'csvconv_last_run_files{status="failure"} 1' in text
+        assert "csvconv_last_run_rows 5" in text
+        assert 'csvconv_last_run_stage_seconds{stage="read"} 0.25' in text
+        assert "csvconv_last_run_exit_code 1" in text
+        assert text.endswith("\n")
+
+
+class TestReportOptions:
+    def test_summary_json_and_metrics_textfile(self, sample_csv, tmp_path):
+        report_path = tmp_path / "report.json"
+        prom_path = tmp_path / "csvconv.prom"
+        result = main(
+            [
+                "--input",
+                sample_csv,
+                "--output",
+                str(tmp_path / "out.parquet"),
+                "--summary-json",
+                str(report_path),
+                "--metrics-textfile",
+                str(prom_path),
+            ]
+        )
+        assert result == 0
+        report = json.loads(report_path.read_text())
+        assert report["exit_code"] == 0
+        assert report["files"][0]["rows"] == 100
+        assert "csvconv_last_run_rows 100" in prom_path.read_text()
+
+    def test_report_written_on_failure(self, tmp_path):
+        report_path = tmp_path / "report.json"
+        result = main(
+            [
+                "--input",
+                str(tmp_path / "missing.csv"),
+                "--output",
+                str(tmp_path / "out.parquet"),
+                "--summary-json",
+                str(report_path),
+            ]
+        )
+        assert result == 1
+        report = json.loads(report_path.read_text())
+        assert report["exit_code"] == 1
+        assert report["error"]
+
+    def test_unwritable_report_fails_run(self, sample_csv, tmp_path):
+        result = main(
+            [
+                "--input",
+                sample_csv,
+                "--output",
+                str(tmp_path / "out.parquet"),
+                "--summary-json",
+                str(tmp_path / "no" / "such" / "dir" / "report.json"),
+            ]
+        )
+        assert result == 1
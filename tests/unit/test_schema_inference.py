@@ -1,9 +1,13 @@
 """Unit tests for schema inference."""
 
 import pyarrow as pa
-import pytest
 
-from csvconv.schema.inference import infer_schema
+from csvconv.schema.inference import (
+    DICTIONARY_TYPE,
+    infer_schema,
+    parse_column_types,
+    select_dictionary_types,
+)
 
 
 class TestInferSchema:
@@ -42,3 +46,26 @@ class TestInferSchema:
         schema = infer_schema(tar_path, "strings.csv")
         for field in schema:
             assert field.type in (pa.string(), pa.large_string())
+
+
+class TestDictionaryTypes:
+    """Tests for dictionary type selection."""
+
+    def test_select_low_cardinality_string_columns(self):
+        batch = pa.RecordBatch.from_pydict(
+            {
+                "id": [1, 2, 3, 4],
+                "status": ["ok", "ok", "failed", "ok"],
+                "label": ["a", "b", "c", "d"],
+            }
+        )
+        assert select_dictionary_types([batch], max_cardinality=2) == {"status": DICTIONARY_TYPE}
+        assert select_dictionary_types([batch], max_cardinality=2, exclude=("status",)) == {}
+
+    def test_infer_schema_dictionary(self, sample_targz):
+        schema = infer_schema(sample_targz, "data_0.csv", dict_max_cardinality=1000, column_types={"id": pa.int32()})
+        assert schema.field("name").type == DICTIONARY_TYPE
+        assert schema.field("id").type == pa.int32()
+
+    def test_parse_dictionary_alias(self):
+        assert parse_column_types({"region": "dictionary"}) == {"region": DICTIONARY_TYPE}
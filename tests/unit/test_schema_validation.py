@@ -59,3 +59,16 @@ class TestValidateBatchSchema:
         )
         with pytest.raises(SchemaMismatchError, match="type mismatch"):
             validate_batch_schema(batch, expected_schema)
+
+    def test_dictionary_and_plain_are_compatible(self, expected_schema):
+        batch = pa.RecordBatch.from_pydict(
+            {"id": [1], "value": [1.0], "name": pa.array(["a"]).dictionary_encode()},
+        )
+        validate_batch_schema(batch, expected_schema)
+
+    def test_dictionary_of_other_value_type_mismatches(self, expected_schema):
+        batch = pa.RecordBatch.from_pydict(
+            {"id": [1], "value": [1.0], "name": pa.array([1]).dictionary_encode()},
+        )
+        with pytest.raises(SchemaMismatchError, match="type mismatch"):
+            validate_batch_schema(batch, expected_schema)
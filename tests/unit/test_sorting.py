@@ -0,0 +1,130 @@
+"""Unit tests for sorted (clustered) Parquet output."""
+
+import os
+import random
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import csvconv.writer.sorting as sorting
+from csvconv.converter import convert
+from csvconv.errors import InputValidationError, SchemaMismatchError
+from csvconv.writer.parquet_writer import IncrementalParquetWriter
+from csvconv.writer.sorting import ExternalSorter, sort_table
+
+
+@pytest.fixture
+def table():
+    rng = random.Random(7)
+    n = 5000
+    return pa.table(
+        {
+            "key": [rng.randint(0, 300) if rng.random() > 0.02 else None for _ in range(n)],
+            "tag": pa.array([rng.choice("abcd") for _ in range(n)]).dictionary_encode(),
+            "seq": list(range(n)),
+        }
+    )
+
+
+class TestSortTable:
+    """Tests for sort_table."""
+
+    def test_nulls_last_and_stable(self):
+        table = pa.table({"key": [2, None, 1, 2, 1], "seq": [0, 1, 2, 3, 4]})
+        result = sort_table(table, ["key"])
+        assert result.column("key").to_pylist() == [1, 1, 2, 2, None]
+        assert result.column("seq").to_pylist() == [2, 4, 0, 3, 1]
+
+    def test_dictionary_key_sorts_by_value(self):
+        table = pa.table({"tag": pa.array(["b", "c", "a"]).dictionary_encode()})
+        assert sort_table(table, ["tag"]).column("tag").to_pylist() == ["a", "b", "c"]
+
+
+class TestExternalSorter:
+    """Tests for the spilling external merge sort."""
+
+    def _sort(self, table, memory_bytes, batch_rows=300):
+        with ExternalSorter(table.schema, ["key", "tag"], memory_bytes) as sorter:
+            for batch in table.to_batches(max_chunksize=batch_rows):
+                sorter.add(batch)
+            result = pa.Table.from_batches(list(sorter.merged()), schema=table.schema)
+            spill_dir = sorter._spill_dir
+            runs = sorter.runs
+        return result, runs, spill_dir
+
+    def test_in_memory_without_spilling(self, table):
+        result, runs, spill_dir = self._sort(table, 64 * 1024 * 1024)
+        assert runs == 0 and spill_dir is None
+        assert result.column("seq").to_pylist() == sort_table(table, ["key", "tag"]).column("seq").to_pylist()
+
+    def test_spilled_runs_merge_to_stable_sort(self, table, monkeypatch):
+        monkeypatch.setattr(sorting, "RUN_BATCH_BYTES", 2048)
+        result, runs, spill_dir = self._sort(table, 20 * 1024)
+        assert runs > 3
+        assert result.column("seq").to_pylist() == sort_table(table, ["key", "tag"]).column("seq").to_pylist()
+        assert result.schema.equals(table.schema)
+        assert not os.path.exists(spill_dir)
+
+    def test_missing_column_rejected(self, table):
+        with pytest.raises(InputValidationError, match="nope"):
+            ExternalSorter(table.schema, ["nope"])
+
+    def test_schema_mismatch_rejected(self, table):
+        with ExternalSorter(table.schema, ["key"]) as sorter:
+            with pytest.raises(SchemaMismatchError):
+                sorter.add(pa.record_batch({"key": ["x"]}))
+
+
+class TestSortedWriter:
+    """Tests for IncrementalParquetWriter(sort_by=...)."""
+
+    def test_row_groups_sorted_with_footer_metadata(self, table, tmp_path):
+        path = str(tmp_path / "out.parquet")
+        with IncrementalParquetWriter(path, table.schema, sort_by=["key"]) as writer:
+            for batch in table.to_batches(max_chunksize=1000):
+                writer.write_batch(batch)
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_row_groups == 5
+        group = metadata.row_group(0)
+        assert [c.column_index for c in group.sorting_columns] == [0]
+        for i in range(metadata.num_row_groups):
+            keys = pq.ParquetFile(path).read_row_group(i).column("key").to_pylist()
+            present = [k for k in keys if k is not None]
+            assert present == sorted(present)
+
+    def test_missing_sort_column_leaves_no_temp_file(self, table, tmp_path):
+        with pytest.raises(InputValidationError):
+            IncrementalParquetWriter(str(tmp_path / "out.parquet"), table.schema, sort_by=["x"])
+        assert os.listdir(str(tmp_path)) == []
+
+
+class TestConvertSorted:
+    """Tests for convert(sort_by=..., global_sort=...)."""
+
+    def _csv(self, tmp_path, rows=3000):
+        rng = random.Random(3)
+        path = tmp_path / "in.csv"
+        path.write_text("id,ts\n" + "".join("{},{}\n".format(i, rng.randint(0, 10**6)) for i in range(rows)))
+        return str(path)
+
+    def test_global_sort_orders_whole_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sorting, "RUN_BATCH_BYTES", 4096)
+        output = str(tmp_path / "out.parquet")
+        convert(self._csv(tmp_path), output, block_size_mb=0.01, sort_by=["ts"], global_sort=True, sort_memory_mb=0.02)
+        parquet = pq.ParquetFile(output)
+        values = parquet.read().column("ts").to_pylist()
+        assert len(values) == 3000 and values == sorted(values)
+        # Row groups cover disjoint ranges, so statistics can skip them
+        stats = [parquet.metadata.row_group(i).column(1).statistics for i in range(parquet.metadata.num_row_groups)]
+        assert parquet.metadata.num_row_groups > 1
+        assert all(a.max <= b.min for a, b in zip(stats, stats[1:]))
+        assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
+
+    def test_sort_by_partition_column_is_dropped(self, tmp_path):
+        path = tmp_path / "in.csv"
+        path.write_text("day,v\nb,3\na,2\nb,1\na,4\n")
+        root = str(tmp_path / "ds")
+        convert(str(path), root, partition_by=["day"], sort_by=["day", "v"])
+        table = pq.read_table(os.path.join(root, "day=b", "in-part-00000.parquet"))
+        assert table.column("v").to_pylist() == [1, 3]
@@ -0,0 +1,46 @@
+"""Startup cost tests: heavy imports must be deferred until a conversion runs."""
+
+import subprocess
+import sys
+
+
+def _loaded_modules(code):
+    """Run code in a fresh interpreter and return the csvconv/pyarrow modules it loaded."""
+    script = code + (
+        "\nimport sys\nprint('\\n'.join(m for m in sys.modules if m.split('.')[0] in ('csvconv', 'pyarrow')))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+def test_cli_import_does_not_load_pyarrow():
+    modules = _loaded_modules("import csvconv.cli")
+    assert "csvconv.cli" in modules
+    assert "pyarrow" not in modules
+    assert "csvconv.converter" not in modules
+
+
+def test_version_does_not_load_pyarrow():
+    modules = _loaded_modules(
+        "import csvconv.cli\ntry:\n    csvconv.cli.parse_args(['--version'])\nexcept SystemExit:\n    pass"
+    )
+    assert "pyarrow" not in modules
+
+
+def test_csv_to_parquet_loads_only_parquet_writer(sample_csv, tmp_path):
+    output = str(tmp_path / "out.parquet")
+    modules = _loaded_modules("from csvconv.converter import convert\nconvert({!r}, {!r})".format(sample_csv, output))
+    assert "csvconv.writer.parquet_writer" in modules
+    assert "csvconv.writer.csv_writer" not in modules
+
+
+def test_targz_to_csv_does_not_load_pyarrow(sample_targz, tmp_path):
+    modules = _loaded_modules(
+        "from csvconv.converter import convert\nconvert({!r}, {!r}, input_type='tar.gz', output_type='csv')".format(
+            sample_targz, str(tmp_path / "out")
+        )
+    )
+    assert "csvconv.writer.csv_writer" in modules
+    assert "csvconv.writer.parquet_writer" not in modules
+    assert "pyarrow" not in modules
@@ -37,3 +37,23 @@ class TestConversionSummary:
         assert summary.total_failure == 0
         report = summary.get_report()
         assert "Success: 0" in report
+
+    def test_merge(self):
+        first = ConversionSummary()
+        first.record_success("a.csv")
+        second = ConversionSummary()
+        second.record_success("b.csv")
+        second.record_failure("c.csv", "Error")
+        first.merge(second)
+        assert first.successes == ["a.csv", "b.csv"]
+        assert first.total_failure == 1
+
+    def test_file_metrics_round_trip(self):
+        summary = ConversionSummary()
+        summary.record_success("a.csv", rows=10, output_bytes=128)
+        summary.record_failure("b.csv", "Error", rows=0)
+        restored = ConversionSummary.from_dict(summary.to_dict())
+        assert restored.files == [
+            {"file": "a.csv", "status": "success", "rows": 10, "output_bytes": 128},
+            {"file": "b.csv", "status": "failure", "reason": "Error", "rows": 0},
+        ]
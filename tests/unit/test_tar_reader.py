@@ -2,7 +2,7 @@
 
 import pytest
 
-from csvconv.reader.tar_reader import list_csv_members, open_member_stream
+from csvconv.reader.tar_reader import iter_member_streams, list_csv_members, open_member_stream
 from csvconv.errors import MemberNotFoundError
 
 
@@ -50,3 +50,21 @@ class TestOpenMemberStream:
             lines = content.strip().split("\n")
             assert lines[0] == "id,value,name"
             assert len(lines) == 51  # header + 50 rows
+
+
+class TestIterMemberStreams:
+    """Tests for single-pass member reading."""
+
+    def test_reads_requested_members_in_one_pass(self, sample_targz, mocker):
+        import tarfile
+
+        spy = mocker.spy(tarfile, "open")
+        streams = dict(iter_member_streams(sample_targz, ["data_2.csv", "data_0.csv"]))
+        assert spy.call_count == 1
+        assert sorted(streams) == ["data_0.csv", "data_2.csv"]
+        assert streams["data_0.csv"].read().startswith(b"id,value,name\n0,")
+
+    def test_missing_member_yielded_last_as_none(self, sample_targz):
+        result = list(iter_member_streams(sample_targz, ["missing.csv", "data_1.csv"]))
+        assert [name for name, _ in result] == ["data_1.csv", "missing.csv"]
+        assert result[-1][1] is None
@@ -0,0 +1,83 @@
+"""Tests for coordinated Arrow thread pool sizing."""
+
+import logging
+
+import pyarrow as pa
+import pytest
+
+from csvconv.cli import convert_kwargs, parse_args
+from csvconv.converter import convert
+from csvconv.threads import apply_thread_limits, available_cores, plan_threads
+
+
+@pytest.fixture(autouse=True)
+def _restore_threads():
+    cpu, io = pa.cpu_count(), pa.io_thread_count()
+    yield
+    pa.set_cpu_count(cpu)
+    pa.set_io_thread_count(io)
+
+
+class TestPlanThreads:
+    def test_single_process_default_is_untouched(self):
+        assert plan_threads(1) is None
+
+    def test_budget_split_across_workers(self):
+        assert plan_threads(4, cpu_budget=16) == 4
+        assert plan_threads(3, cpu_budget=8) == 2
+
+    def test_default_budget_is_available_cores(self):
+        assert plan_threads(1, cpu_budget=None, threads=1) == 1
+        assert plan_threads(2) == max(1, available_cores() // 2)
+
+    def test_explicit_threads_within_budget(self):
+        assert plan_threads(2, threads=3, cpu_budget=8) == 3
+
+    def test_explicit_threads_clamped(self, caplog):
+        with caplog.at_level(logging.WARNING, logger="csvconv"):
+            assert plan_threads(4, threads=8, cpu_budget=8) == 2
+        assert "exceeds the core budget" in caplog.text
+
+    def test_more_workers_than_cores(self, caplog):
+        with caplog.at_level(logging.WARNING, logger="csvconv"):
+            assert plan_threads(8, cpu_budget=4) == 1
+        assert "exceed the core budget" in caplog.text
+
+
+class TestApplyThreadLimits:
+    def test_sets_arrow_pools(self):
+        apply_thread_limits(threads=2, io_threads=3)
+        assert pa.cpu_count() == 2
+        assert pa.io_thread_count() == 3
+
+    def test_convert_applies_limits(self, sample_csv, tmp_path, mocker):
+        seen = []
+        mocker.patch(
+            "csvconv.memory.release_unused", lambda context=None: seen.append((pa.cpu_count(), pa.io_thread_count()))
+        )
+        convert(sample_csv, str(tmp_path / "out.parquet"), threads=1, io_threads=2)
+        assert seen and set(seen) == {(1, 2)}
+
+    def test_limits_restored_after_conversion(self, sample_csv, tmp_path):
+        apply_thread_limits(threads=3, io_threads=5)
+        convert(sample_csv, str(tmp_path / "out.parquet"), threads=1, io_threads=2)
+        assert (pa.cpu_count(), pa.io_thread_count()) == (3, 5)
+
+    def test_cli_plans_threads_per_worker(self):
+        args = parse_args(
+            [
+                "--input",
+                "in/",
+                "--output",
+                "out/",
+                "--workers",
+                "4",
+                "--cpu-budget",
+                "8",
+                "--io-threads",
+                "2",
+            ]
+        )
+        kwargs = convert_kwargs(args)
+        assert kwargs["threads"] == 2
+        assert kwargs["io_threads"] == 2
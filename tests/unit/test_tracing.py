@@ -0,0 +1,113 @@
+"""Unit tests for --profile and --trace."""
+
+import json
+import os
+import pstats
+
+import pytest
+
+from csvconv import tracing
+from csvconv.cli import main
+from csvconv.metrics import StageTimer
+
+
+@pytest.fixture(autouse=True)
+def _stop_tracing():
+    yield
+    tracing.stop()
+
+
+class TestTracing:
+    def test_disabled_records_nothing(self):
+        timer = StageTimer("a.csv")
+        timer.lap("read")
+        with tracing.span("fsync"):
+            pass
+        assert tracing.stop() == []
+
+    def test_spans_are_complete_events(self):
+        tracing.start()
+        timer = StageTimer("a.csv")
+        timer.lap("read")
+        with tracing.span("fsync", path="x"):
+            pass
+        events = tracing.stop()
+        assert [e["name"] for e in events] == ["read", "fsync"]
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+        assert events[1]["args"] == {"path": "x"}
+
+
+class TestTraceOption:
+    def test_trace_targz(self, sample_targz, tmp_path):
+        trace_path = tmp_path / "trace.json"
+        result = main(
+            [
+                "--input",
+                sample_targz,
+                "--output",
+                str(tmp_path / "out"),
+                "--trace",
+                str(trace_path),
+            ]
+        )
+        assert result == 0
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        names = {e["name"] for e in events}
+        assert {"decompress", "read", "validate", "write", "fsync", "rename"} <= names
+        files = [e for e in events if e["cat"] == "file"]
+        assert sorted(e["args"]["rows"] for e in files) == [50, 50, 50]
+
+    def test_trace_collects_worker_events(self, tmp_path):
+        in_dir = tmp_path / "in"
+        in_dir.mkdir()
+        for name in ("a.csv", "b.csv"):
+            (in_dir / name).write_text("id,value\n1,2\n3,4\n")
+        trace_path = tmp_path / "trace.json"
+        result = main(
+            [
+                "--input",
+                str(in_dir),
+                "--output",
+                str(tmp_path / "out"),
+                "--workers",
+                "2",
+                "--trace",
+                str(trace_path),
+            ]
+        )
+        assert result == 0
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        files = sorted(e["name"] for e in events if e["cat"] == "file")
+        assert files == ["a.csv", "b.csv"]
+        assert all(e["pid"] != os.getpid() for e in events)
+
+    def test_profile(self, sample_csv, tmp_path):
+        profile_path = tmp_path / "run.prof"
+        result = main(
+            [
+                "--input",
+                sample_csv,
+                "--output",
+                str(tmp_path / "out.parquet"),
+                "--profile",
+                str(profile_path),
+            ]
+        )
+        assert result == 0
+        stats = pstats.Stats(str(profile_path))
+        assert any(func[2] == "convert" for func in stats.stats)
+
+    def test_not_supported_with_connect(self, sample_csv, tmp_path):
+        with pytest.raises(SystemExit):
+            main(
+                [
+                    "--input",
+                    sample_csv,
+                    "--output",
+                    str(tmp_path / "out.parquet"),
+                    "--connect",
+                    str(tmp_path / "sock"),
+                    "--trace",
+                    str(tmp_path / "t.json"),
+                ]
+            )
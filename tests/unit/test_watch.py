@@ -0,0 +1,197 @@
+"""Unit tests for the drop-zone watcher."""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import pyarrow.parquet as pq
+import pytest
+
+from csvconv.cli import main
+from csvconv.parallel import run_task as _run_task
+from csvconv.watch import DropZoneWatcher
+
+
+def _drop_csv(directory, name, rows=3):
+    path = os.path.join(str(directory), name)
+    with open(path, "w") as f:
+        f.write("id,value\n")
+        for i in range(rows):
+            f.write("{},{}\n".format(i, i))
+    return path
+
+
+def _run_task_or_die(task):
+    """parallel.run_task that kills its worker for inputs named *_die.csv."""
+    if task.name.endswith("_die.csv"):
+        os._exit(1)
+    return _run_task(task)
+
+
+@pytest.fixture
+def zone(tmp_path):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    return landing
+
+
+def _watcher(zone, tmp_path, **kwargs):
+    options = dict(workers=2, poll_interval=0.05, settle_seconds=0)
+    options.update(kwargs)
+    return DropZoneWatcher(str(zone), str(tmp_path / "out"), **options)
+
+
+class TestDropZoneWatcher:
+    def test_once_converts_everything(self, zone, tmp_path, sample_targz):
+        _drop_csv(zone, "a.csv")
+        _drop_csv(zone, "b.csv", rows=5)
+        shutil.copy(sample_targz, str(zone / "batch.tar.gz"))
+        (zone / "upload.csv.part").write_text("partial")
+
+        summary = _watcher(zone, tmp_path).run(once=True)
+
+        out = tmp_path / "out"
+        assert summary.total_success == 5
+        assert pq.read_table(str(out / "b.parquet")).num_rows == 5
+        assert len(os.listdir(str(out / "batch"))) == 3
+        assert not (out / "upload.csv.parquet").exists()
+
+    def test_ledger_prevents_reconversion(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        assert _watcher(zone, tmp_path).run(once=True).total_success == 1
+
+        assert _watcher(zone, tmp_path).run(once=True).total_success == 0
+
+        ledger = tmp_path / "out" / ".csvconv-watch.jsonl"
+        entries = [json.loads(line) for line in ledger.read_text().splitlines()]
+        assert [(e["file"], e["status"]) for e in entries] == [("a.csv", "success")]
+
+    def test_replaced_file_is_converted_again(self, zone, tmp_path):
+        path = _drop_csv(zone, "a.csv")
+        _watcher(zone, tmp_path).run(once=True)
+
+        _drop_csv(zone, "a.csv", rows=7)
+        os.utime(path, (time.time() + 5, time.time() + 5))
+        assert _watcher(zone, tmp_path).run(once=True).total_success == 1
+        assert pq.read_table(str(tmp_path / "out" / "a.parquet")).num_rows == 7
+
+    def test_done_dir_moves_inputs(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        done = tmp_path / "done"
+        _watcher(zone, tmp_path, done_dir=str(done)).run(once=True)
+        assert os.listdir(str(zone)) == []
+        assert os.listdir(str(done)) == ["a.csv"]
+
+    def test_failed_move_to_done_dir_is_logged(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        done = tmp_path / "done"
+        done.write_text("not a directory")
+        summary = _watcher(zone, tmp_path, done_dir=str(done)).run(once=True)
+        assert summary.total_success == 1
+        assert os.listdir(str(zone)) == ["a.csv"]
+
+    def test_dead_worker_does_not_stop_ingestion(self, zone, tmp_path, monkeypatch):
+        from csvconv import parallel
+
+        monkeypatch.setattr(parallel, "run_task", _run_task_or_die)
+        _drop_csv(zone, "a_die.csv")
+        _drop_csv(zone, "b.csv")
+        summary = _watcher(zone, tmp_path, workers=1).run(once=True)
+        assert summary.total_failure == 1 and summary.total_success == 1
+        assert os.path.exists(str(tmp_path / "out" / "b.parquet"))
+
+    def test_failures_are_recorded_not_retried(self, zone, tmp_path):
+        (zone / "bad.csv").write_text("a,b\n1,2\n3\n")
+        summary = _watcher(zone, tmp_path, done_dir=str(tmp_path / "done")).run(once=True)
+        assert summary.total_failure == 1
+        assert (zone / "bad.csv").exists()
+        assert _watcher(zone, tmp_path).run(once=True).total_failure == 0
+
+    def test_marker_suffix_gates_pickup(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        _drop_csv(zone, "b.csv")
+        (zone / "b.csv.done").write_text("")
+
+        summary = _watcher(zone, tmp_path, marker_suffix=".done").run(once=True)
+        assert summary.successes == ["b.csv"]
+
+    def test_unstable_file_waits_for_settle(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        watcher = _watcher(zone, tmp_path, settle_seconds=3600)
+        ready, settling = watcher.scan()
+        assert ready == []
+        assert settling == 1
+
+    def test_continuous_mode_picks_up_new_files_until_stopped(self, zone, tmp_path):
+        watcher = _watcher(zone, tmp_path)
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        try:
+            _drop_csv(zone, "late.csv")
+            deadline = time.time() + 30
+            while watcher.summary.total_success < 1 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+            thread.join(timeout=30)
+        assert not thread.is_alive()
+        assert (tmp_path / "out" / "late.parquet").exists()
+
+    def test_polling_only(self, zone, tmp_path):
+        _drop_csv(zone, "a.csv")
+        summary = _watcher(zone, tmp_path, use_inotify=False).run(once=True)
+        assert summary.total_success == 1
+
+
+class TestWatchCommand:
+    def test_watch_once(self, zone, tmp_path, capsys):
+        _drop_csv(zone, "a.csv")
+        result = main(
+            [
+                "watch",
+                "--input",
+                str(zone),
+                "--output",
+                str(tmp_path / "out"),
+                "--once",
+                "--settle-seconds",
+                "0",
+                "--poll-interval",
+                "0.05",
+            ]
+        )
+        assert result == 0
+        assert "Success: 1" in capsys.readouterr().out
+
+    def test_watch_requires_directory(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["watch", "--input", str(tmp_path / "missing"), "--output", str(tmp_path)])
+
+    def test_watch_passes_conversion_options(self, zone, tmp_path, monkeypatch):
+        import csvconv.watch
+
+        captured = {}
+
+        class _Watcher(DropZoneWatcher):
+            def __init__(self, *args, **kwargs):
+                captured.update(kwargs["convert_options"])
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(csvconv.watch, "DropZoneWatcher", _Watcher)
+        main(
+            [
+                "watch",
+                "--input",
+                str(zone),
+                "--output",
+                str(tmp_path / "out"),
+                "--once",
+                "--compression",
+                "zstd",
+                "--write-behind",
+            ]
+        )
+        assert captured["compression"] == "zstd" and captured["write_behind"] is True
+        assert "input_path" not in captured and "input_type" not in captured
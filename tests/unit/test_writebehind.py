@@ -0,0 +1,119 @@
+"""Unit tests for csvconv write-behind output flushing."""
+
+import io
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import csvconv.writer.writebehind as writebehind
+from csvconv.converter import convert
+from csvconv.writer.csv_writer import extract_stream
+from csvconv.writer.parquet_writer import IncrementalParquetWriter
+from csvconv.writer.writebehind import WriteBehind, open_write_behind
+
+CHUNK = 64 * 1024
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Write-behind in 64 KB chunks."""
+    monkeypatch.setitem(writebehind.config, "chunk_size", CHUNK)
+
+
+@pytest.fixture
+def dropped(monkeypatch):
+    """Offsets passed to posix_fadvise(DONTNEED), in call order."""
+    if not hasattr(os, "posix_fadvise"):
+        pytest.skip("posix_fadvise not available")
+    offsets = []
+    real = os.posix_fadvise
+
+    def fadvise(fd, offset, length, advice):
+        if advice == os.POSIX_FADV_DONTNEED:
+            offsets.append(offset)
+        real(fd, offset, length, advice)
+
+    monkeypatch.setattr(os, "posix_fadvise", fadvise)
+    return offsets
+
+
+class TestWriteBehind:
+    """Tests for WriteBehind."""
+
+    def test_completed_chunks_flushed_behind_the_writer(self, tmp_path, dropped):
+        path = str(tmp_path / "out.bin")
+        with open(path, "wb") as f:
+            tracker = WriteBehind(path, chunk_size=CHUNK)
+            for _ in range(10):
+                f.write(os.urandom(CHUNK // 2))
+                f.flush()
+                tracker.update()
+            tracker.close()
+        if writebehind._libc_sync_file_range():
+            # Each chunk is evicted once writeback of the next one started
+            assert dropped == [i * CHUNK for i in range(4)]
+        else:
+            assert dropped == [i * CHUNK for i in range(5)]
+
+    def test_fdatasync_fallback(self, tmp_path, dropped, monkeypatch):
+        monkeypatch.setattr(writebehind, "_sync_file_range", False)
+        syncs = []
+        monkeypatch.setattr(os, "fdatasync", lambda fd: syncs.append(fd))
+        path = str(tmp_path / "out.bin")
+        with open(path, "wb") as f:
+            tracker = WriteBehind(path, chunk_size=CHUNK)
+            f.write(os.urandom(2 * CHUNK + 10))
+            f.flush()
+            tracker.update()
+            tracker.close()
+        assert len(syncs) == 2
+        assert dropped == [0, CHUNK]
+
+    def test_only_when_enabled(self, tmp_path):
+        path = tmp_path / "out.bin"
+        path.write_bytes(b"")
+        assert open_write_behind(str(path), False) is None
+        tracker = open_write_behind(str(path), True)
+        assert isinstance(tracker, WriteBehind)
+        tracker.close()
+
+    def test_not_carried_over_to_next_conversion(self, sample_csv, tmp_path, monkeypatch):
+        opened = []
+        real = writebehind.WriteBehind
+
+        def tracked(path, chunk_size=None):
+            opened.append(path)
+            return real(path, chunk_size)
+
+        monkeypatch.setattr(writebehind, "WriteBehind", tracked)
+        convert(sample_csv, str(tmp_path / "a.parquet"), write_behind=True)
+        assert len(opened) == 1
+        convert(sample_csv, str(tmp_path / "b.parquet"))
+        assert len(opened) == 1
+
+
+class TestWriters:
+    """Tests for writers with write-behind enabled."""
+
+    def test_parquet_writer(self, tmp_path, small_chunks, dropped):
+        path = str(tmp_path / "out.parquet")
+        schema = pa.schema([("s", pa.string())])
+        with IncrementalParquetWriter(
+            path, schema, compression="none", row_group_size=2000, write_behind=True
+        ) as writer:
+            for _ in range(20):
+                writer.write_batch(pa.record_batch({"s": [os.urandom(16).hex() for _ in range(2000)]}, schema=schema))
+            assert writer._write_behind is not None
+        assert writer._write_behind is None
+        assert pq.read_table(path).num_rows == 40000
+        assert dropped and dropped[0] == 0
+
+    def test_extract_stream(self, tmp_path, small_chunks, dropped):
+        data = os.urandom(5 * CHUNK)
+        path = str(tmp_path / "out.csv")
+        extract_stream(io.BytesIO(data), path, write_behind=True)
+        with open(path, "rb") as f:
+            assert f.read() == data
+        assert dropped